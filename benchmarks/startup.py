@@ -0,0 +1,74 @@
+"""Benchmarks the import time of the package and the initialization time of a :class:`~.Client`
+
+Network access is blocked while the client is initialized, so the benchmark fails
+if ``fast_start=True`` makes any requests. It also fails if ``import magento`` loads any of the
+:data:`LAZY_IMPORTS`, or takes longer than ``--max-import-ms``
+
+**Usage**::
+
+    python benchmarks/startup.py [--runs 20] [--max-import-ms 150]
+"""
+import os
+import sys
+import time
+import socket
+import argparse
+import statistics
+import subprocess
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)  # Benchmark the working tree, not an installed version
+
+#: Modules that should only be imported once they're used, not by ``import magento``
+LAZY_IMPORTS = (
+    'asyncio', 'sqlite3', 'concurrent.futures',
+    'magento.cache', 'magento.sync', 'magento.export', 'magento.loaders'
+)
+
+
+def time_import(runs: int) -> list:
+    code = 'import time; start = time.perf_counter(); import magento; print(time.perf_counter() - start)'
+    return [
+        float(subprocess.check_output([sys.executable, '-c', code], cwd=ROOT, text=True))
+        for _ in range(runs)
+    ]
+
+
+def check_lazy_imports() -> list:
+    code = f'import sys, magento; print(" ".join(m for m in {LAZY_IMPORTS!r} if m in sys.modules))'
+    return subprocess.check_output([sys.executable, '-c', code], cwd=ROOT, text=True).split()
+
+
+def time_init(runs: int) -> list:
+    from magento import Client
+
+    timings = []
+    with mock.patch.object(socket.socket, 'connect', side_effect=RuntimeError('Client made a network request')):
+        for _ in range(runs):
+            start = time.perf_counter()
+            Client('domain.com', 'username', 'password', fast_start=True)
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(name: str, timings: list) -> None:
+    print('{:<12} median {:8.2f} ms   max {:8.2f} ms'.format(
+        name, statistics.median(timings) * 1000, max(timings) * 1000)
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--max-import-ms', type=float, default=None, help='fail if the median import time is slower')
+    args = parser.parse_args()
+
+    import_timings = time_import(args.runs)
+    report('import', import_timings)
+    report('Client()', time_init(args.runs))
+
+    if loaded := check_lazy_imports():
+        sys.exit(f'import magento loaded modules that should be lazy: {", ".join(loaded)}')
+    if args.max_import_ms is not None and statistics.median(import_timings) * 1000 > args.max_import_ms:
+        sys.exit(f'import magento took longer than {args.max_import_ms} ms')
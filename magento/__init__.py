@@ -3,11 +3,13 @@ from . import search
 from . import models
 from . import utils
 from . import exceptions
+import importlib
 import os
 
 __version__ = "2.2.0"
 
 Client = clients.Client
+AsyncClient = clients.AsyncClient
 logger = utils.MagentoLogger(
     name=utils.MagentoLogger.PACKAGE_LOG_NAME,
     log_file=utils.MagentoLogger.PACKAGE_LOG_NAME + '.log',
@@ -15,6 +17,16 @@ logger = utils.MagentoLogger(
 )
 
 
+#: Submodules that are only imported when first accessed, to keep ``import magento`` fast
+LAZY_MODULES = ('cache', 'sync', 'export', 'loaders')
+
+
+def __getattr__(name: str):
+    if name in LAZY_MODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
 def get_api(**kwargs) -> Client:
     """Initialize a :class:`~.Client` using credentials stored in environment variables
 
@@ -0,0 +1,557 @@
+from __future__ import annotations
+import os
+import json
+import time
+import sqlite3
+import requests
+import weakref
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from contextlib import contextmanager
+from requests.structures import CaseInsensitiveDict
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from typing import Optional, Dict, List, Union, Tuple, TYPE_CHECKING
+from .utils import parse_domain
+
+if TYPE_CHECKING:
+    from .models import Model
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def lock_file(path: Union[str, Path]):
+    """Context manager that holds an exclusive lock on a file, across processes
+
+    The lock is held on a separate ``.lock`` file, so the file itself can be atomically replaced while locked
+
+    :param path: the path of the file to lock
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path.with_name(path.name + '.lock'), 'a+') as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def write_atomic(path: Union[str, Path], data: Union[Dict, List]) -> None:
+    """Atomically replaces the contents of a JSON file, which is only readable by the current user
+
+    :param path: the path of the file
+    :param data: the JSON data to write
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class TokenCache:
+
+    """Persistent cache of admin access tokens, keyed by domain and username
+
+    Allows a :class:`~.Client` to reuse a token that's still valid instead of logging in again,
+    which saves a request (or two) every time a short-lived process starts up
+
+    * Tokens are saved to a JSON file, along with the time that they expire
+    * The file is locked whenever it's read or written to, so it can be safely shared between processes
+
+    .. admonition:: Example
+       :class: example
+
+       ::
+
+        # Only the first client will log in; the second reuses its token
+        >> api = Client("domain.com", "username", "password", token_cache=TokenCache())
+        >> api = Client("domain.com", "username", "password", token_cache=TokenCache())
+
+    :cvar DEFAULT_PATH: the default location of the cache file
+    :cvar DEFAULT_LIFETIME: the default token lifetime, in seconds, which matches the default Magento configuration
+    """
+
+    DEFAULT_PATH = Path.home().joinpath('.my-magento', 'tokens.json')
+    DEFAULT_LIFETIME = 4 * 60 * 60
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, lifetime: int = DEFAULT_LIFETIME, margin: int = 300):
+        """Initialize a TokenCache
+
+        :param path: the path of the cache file; uses the :attr:`~.DEFAULT_PATH` if not provided
+        :param lifetime: the number of seconds that a token is valid for after it's issued
+        :param margin: the number of seconds before a token expires to stop using it
+        """
+        self.path = Path(path) if path else self.DEFAULT_PATH
+        self.lifetime = lifetime
+        self.margin = margin
+
+    def __repr__(self):
+        return f'<TokenCache: {self.path}>'
+
+    @staticmethod
+    def key(domain: str, username: str) -> str:
+        """Returns the cache key for a domain and username
+
+        :param domain: domain name of the Magento store
+        :param username: username of the Magento Admin account
+        """
+        return f'{username}@{parse_domain(domain)}'
+
+    def get(self, domain: str, username: str) -> Optional[str]:
+        """Returns the cached token for a domain and username, if it hasn't expired
+
+        :param domain: domain name of the Magento store
+        :param username: username of the Magento Admin account
+        """
+        with self.lock():
+            entry = self.read().get(self.key(domain, username))
+
+        if entry and entry['expires_at'] - self.margin > time.time():
+            return entry['token']
+        return None
+
+    def set(self, domain: str, username: str, token: str) -> None:
+        """Caches a newly issued token for a domain and username
+
+        :param domain: domain name of the Magento store
+        :param username: username of the Magento Admin account
+        :param token: the access token
+        """
+        with self.lock():
+            tokens = self.read()
+            tokens[self.key(domain, username)] = {
+                'token': token,
+                'expires_at': time.time() + self.lifetime
+            }
+            self.write(tokens)
+
+    def delete(self, domain: str, username: str, token: Optional[str] = None) -> None:
+        """Removes the cached token for a domain and username
+
+        :param domain: domain name of the Magento store
+        :param username: username of the Magento Admin account
+        :param token: if provided, the cached token will only be removed if it matches
+        """
+        with self.lock():
+            tokens = self.read()
+            entry = tokens.get(key := self.key(domain, username))
+
+            if entry and token in (None, entry['token']):
+                del tokens[key]
+                self.write(tokens)
+
+    def read(self) -> Dict[str, Dict]:
+        """Reads all entries from the cache file
+
+        .. note:: The cache file should be :meth:`~.lock`\ed while reading it
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def write(self, tokens: Dict[str, Dict]) -> None:
+        """Atomically replaces the contents of the cache file
+
+        .. note:: The cache file should be :meth:`~.lock`\ed while writing to it
+
+        :param tokens: all entries of the cache
+        """
+        write_atomic(self.path, tokens)  # Tokens are credentials, so only the user can read them
+
+    def lock(self):
+        """Context manager that holds an exclusive lock on the cache file, across processes"""
+        return lock_file(self.path)
+
+
+#: A cached response, stored as ``(status_code, headers, content, url, encoding)``
+CacheEntry = Tuple[int, Dict[str, str], bytes, str, Optional[str]]
+
+
+class ResponseCache:
+
+    """Caches the responses of ``GET`` requests for a limited time
+
+    Allows a :class:`~.Client` to reuse the response of a ``GET`` request instead of sending it again
+
+    * Responses are keyed by their normalized URL, which includes the scope of the request
+    * Only the ``max_entries`` most recently used responses are kept, for at most ``ttl`` seconds each
+    * Any ``POST``, ``PUT`` or ``DELETE`` request invalidates the cached responses of the same resource,
+      along with those of its parent and child resources (in every scope)
+
+    .. admonition:: Example
+       :class: example
+
+       ::
+
+        # Cache responses in memory for 5 minutes
+        >> api = Client("domain.com", "username", "password", cache=ResponseCache(ttl=300))
+
+        # Cache responses on disk for an hour, so they can be shared between processes
+        >> api = Client("domain.com", "username", "password", cache=ResponseCache(ttl=3600, path="responses.db"))
+
+        >> api.cache.stats
+        {'hits': 12, 'misses': 3, 'invalidations': 1, 'hit_rate': 0.8}
+    """
+
+    def __init__(self, ttl: float = 300, max_entries: int = 1024, path: Optional[Union[str, Path]] = None):
+        """Initialize a ResponseCache
+
+        :param ttl: the number of seconds to cache each response for
+        :param max_entries: the maximum number of responses to cache
+        :param path: the path of a SQLite database to cache responses in; responses are cached in memory if not provided
+        """
+        self.ttl = ttl
+        #: The :class:`MemoryBackend` or :class:`SQLiteBackend` used to store responses
+        self.backend: Union[MemoryBackend, SQLiteBackend] = SQLiteBackend(path, max_entries) if path else MemoryBackend(max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f'<ResponseCache: {self.backend}>'
+
+    def __len__(self):
+        return len(self.backend)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.pop('_lock', None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[requests.Response]:
+        """Returns the cached response for a URL, if it hasn't expired
+
+        :param url: the URL of a ``GET`` request
+        """
+        entry = self.backend.get(self.key(url))
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        status_code, headers, content, response_url, encoding = entry
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = content
+        response._content_consumed = True
+        response.url = response_url
+        response.encoding = encoding
+        response.from_cache = True
+        return response
+
+    def set(self, url: str, response: requests.Response) -> None:
+        """Caches the response of a ``GET`` request
+
+        :param url: the URL of the request
+        :param response: the response to cache
+        """
+        entry = (response.status_code, dict(response.headers), response.content, response.url, response.encoding)
+        self.backend.set(self.key(url), self.resource(url), entry, time.time() + self.ttl)
+
+    def invalidate(self, url: str) -> None:
+        """Removes the cached responses of the resource at a URL, and of its parent and child resources
+
+        :param url: the URL of a ``POST``, ``PUT`` or ``DELETE`` request
+        """
+        self.backend.invalidate(self.resource(url))
+        with self._lock:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """Removes all cached responses and resets the :attr:`~.stats`"""
+        self.backend.clear()
+        with self._lock:
+            self.hits = self.misses = self.invalidations = 0
+
+    @property
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Hit and miss statistics of the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Normalizes a URL for use as a cache key
+
+        The scheme and domain are lowercased, and the query parameters are sorted
+
+        :param url: the URL of a ``GET`` request
+        """
+        parts = urlsplit(url)
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), query, ''))
+
+    @staticmethod
+    def resource(url: str) -> str:
+        """Returns the path of the API resource at a URL, without the scope
+
+        **Example**::
+
+            >>> ResponseCache.resource('https://domain.com/rest/default/V1/products/sku?fields=sku')
+            'products/sku'
+
+        :param url: a URL generated by :meth:`~.Client.url_for`
+        """
+        return urlsplit(url).path.split('/V1/', 1)[-1].strip('/')
+
+    @staticmethod
+    def is_related(resource: str, other: str) -> bool:
+        """Checks if two resource paths are the same, or if one is the parent of the other
+
+        :param resource: the path of an API resource
+        :param other: the path of another API resource
+        """
+        return resource == other or resource.startswith(other + '/') or other.startswith(resource + '/')
+
+
+class MemoryBackend:
+
+    """Stores the responses of a :class:`ResponseCache` in memory, using an LRU eviction policy"""
+
+    def __init__(self, max_entries: int = 1024):
+        """Initialize a MemoryBackend
+
+        :param max_entries: the maximum number of responses to store
+        """
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, Tuple[str, CacheEntry, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f'<MemoryBackend: {len(self)} of {self.max_entries} entries>'
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.pop('_lock', None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            if (item := self.entries.get(key)) is None:
+                return None
+
+            resource, entry, expires_at = item
+            if expires_at <= time.time():
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, resource: str, entry: CacheEntry, expires_at: float) -> None:
+        with self._lock:
+            self.entries[key] = (resource, entry, expires_at)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, resource: str) -> None:
+        with self._lock:
+            for key in [key for key, item in self.entries.items() if ResponseCache.is_related(resource, item[0])]:
+                del self.entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.entries.clear()
+
+
+class SQLiteBackend:
+
+    """Stores the responses of a :class:`ResponseCache` in a SQLite database, using an LRU eviction policy
+
+    The database can be shared between threads and processes
+    """
+
+    def __init__(self, path: Union[str, Path], max_entries: int = 1024):
+        """Initialize a SQLiteBackend
+
+        :param path: the path of the database file
+        :param max_entries: the maximum number of responses to store
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+
+        with self.connect() as db:
+            db.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, resource TEXT, status_code INTEGER, headers TEXT, '
+                'content BLOB, url TEXT, encoding TEXT, expires_at REAL, accessed_at REAL)'
+            )
+
+    def __repr__(self):
+        return f'<SQLiteBackend: {self.path}>'
+
+    def __len__(self):
+        with self.connect() as db:
+            return db.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    @contextmanager
+    def connect(self):
+        """Context manager that opens a connection to the database, and commits any changes made with it"""
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self.connect() as db:
+            row = db.execute(
+                'SELECT status_code, headers, content, url, encoding, expires_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            if row[-1] <= time.time():
+                db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                return None
+
+            db.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (time.time(), key))
+
+        status_code, headers, content, url, encoding, _ = row
+        return status_code, json.loads(headers), content, url, encoding
+
+    def set(self, key: str, resource: str, entry: CacheEntry, expires_at: float) -> None:
+        status_code, headers, content, url, encoding = entry
+
+        with self.connect() as db:
+            db.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, resource, status_code, json.dumps(headers), content, url, encoding, expires_at, time.time())
+            )
+            db.execute(  # Evict the least recently used responses
+                'DELETE FROM responses WHERE key IN '
+                '(SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)', (self.max_entries,)
+            )
+
+    def invalidate(self, resource: str) -> None:
+        with self.connect() as db:
+            db.execute(  # Same resource, a parent resource, or a child resource
+                'DELETE FROM responses WHERE resource = :r '
+                'OR substr(:r, 1, length(resource) + 1) = resource || \'/\' '
+                'OR substr(resource, 1, length(:r) + 1) = :r || \'/\'', {'r': resource}
+            )
+
+    def clear(self) -> None:
+        with self.connect() as db:
+            db.execute('DELETE FROM responses')
+
+
+class IdentityMap:
+
+    """Maps each item to a single :class:`~.Model` instance, so that the same item is never parsed twice
+
+    When a :class:`~.Client` has an IdentityMap, every :class:`~.Model` parsed by a :class:`~.SearchQuery`
+    is keyed by the :attr:`~.Client.scope` it was retrieved from, along with its ``(endpoint, uid)``,
+    since the same item can have different data in each store view
+
+    * If an instance for the same item already exists, it's returned instead of the newly parsed one
+    * Any new data is merged into the existing instance with :meth:`~.Model.set_attrs`, and its cached
+      properties are cleared if the data changed
+    * Instances are held by weak reference, so they're removed once nothing else refers to them
+
+    .. admonition:: Example
+       :class: example
+
+       ::
+
+        >> api = Client("domain.com", "username", "password", identity_map=True)
+        >> order_item.product is api.products.by_sku(order_item.sku)
+        True
+    """
+
+    def __init__(self):
+        """Initialize an IdentityMap"""
+        self.models: weakref.WeakValueDictionary[Tuple[str, str, Union[int, str]], Model] = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f'<IdentityMap: {len(self)} items>'
+
+    def __len__(self):
+        return len(self.models)
+
+    def __getstate__(self) -> dict:
+        return {}  # Instances are specific to each process
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__()
+
+    def get(self, endpoint: str, uid: Union[int, str], scope: Optional[str] = '') -> Optional[Model]:
+        """Returns the instance for an item, if there is one
+
+        :param endpoint: the endpoint of the :class:`~.Model`
+        :param uid: the :attr:`~.Model.uid` of the item
+        :param scope: the :attr:`~.Client.scope` the item was retrieved from
+        """
+        return self.models.get((scope or '', endpoint, uid))
+
+    def merge(self, model: Model) -> Model:
+        """Returns the instance for the item that a newly parsed :class:`~.Model` represents
+
+        If there isn't one yet, the ``model`` becomes the instance for the item
+
+        :param model: the newly parsed :class:`~.Model`, which was retrieved using the current scope of its client
+        """
+        if model.uid is None:
+            return model
+
+        key = (model.client.scope or '', model.endpoint, model.uid)
+        with self._lock:  # Held while merging, so threads parsing the same item can't interleave
+            existing = self.models.get(key)
+            if existing is None or type(existing) is not type(model):
+                self.models[key] = model
+                return model
+
+            data = {**existing.data, **model.data}  # Keep any fields the new data doesn't include
+            if data != existing.data:
+                existing.clear(*existing.cached)
+                existing.set_attrs(data)
+            return existing
+
+    def clear(self) -> None:
+        """Removes every instance from the map"""
+        with self._lock:
+            self.models.clear()
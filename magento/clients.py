@@ -1,13 +1,25 @@
 from __future__ import annotations
 import json
+import time
 import pickle
 import requests
-from functools import cached_property
-from typing import Optional, Dict, List
-from .utils import MagentoLogger, get_agent, parse_domain
-from .models import APIResponse, ProductAttribute
+import contextvars
+import threading
+from requests.adapters import HTTPAdapter
+from contextlib import contextmanager
+from functools import cached_property, wraps
+from typing import Optional, Dict, List, Tuple, Union, Callable, Iterator, Any, TYPE_CHECKING
+from .utils import MagentoLogger, RetryPolicy, RateLimiter, DEFAULT_USER_AGENT, get_agent, parse_domain
+from .models import APIResponse, ProductAttribute, CategoryTree
 from .search import SearchQuery, OrderSearch, ProductSearch, InvoiceSearch, CategorySearch, ProductAttributeSearch, OrderItemSearch, CustomerSearch
-from .exceptions import AuthenticationError, MagentoError
+from .search import AsyncSearchQuery, AsyncOrderSearch, AsyncProductSearch, AsyncInvoiceSearch, AsyncCategorySearch, AsyncProductAttributeSearch, AsyncOrderItemSearch, AsyncCustomerSearch
+from .exceptions import AuthenticationError, MagentoError, DeadlineExceeded
+
+if TYPE_CHECKING:
+    import httpx
+    from concurrent.futures import Future
+    from .cache import TokenCache, ResponseCache, IdentityMap
+    from .loaders import BatchLoader, AsyncBatchLoader
 
 
 class Client:
@@ -50,7 +62,8 @@ class Client:
         :param user_agent: the user agent to use in requests
         :param token: an existing access token
         :param log_level: the logging level for logging to stdout
-        :param login: if ``True``, calls :meth:`~.authenticate` upon initialization
+        :param login: if ``True``, calls :meth:`~.authenticate` upon initialization, unless
+            a valid token was loaded from the ``token_cache`` or ``fast_start=True``
         :param kwargs: see below
 
         ...
@@ -59,8 +72,34 @@ class Client:
             * **log_file** (``str``) – log file to use for the client's :attr:`logger`
             * **log_requests** (``bool``) - if ``True``, the logs from :mod:`requests`
               will be added to the client's ``log_file``
+            * **pool_size** (``int``) – the maximum number of keep-alive connections
+              to pool per host in the client's :attr:`session`; default is ``10``
+            * **retry** (:class:`~.RetryPolicy`) – the policy to use when retrying failed requests;
+              uses the default :class:`~.RetryPolicy` if not provided, or disables retries if ``None``
+            * **rate_limit** (``float``) – the maximum number of requests to send per second
+            * **burst** (``int``) – the number of requests that can be sent at once before
+              the ``rate_limit`` applies; default is ``1``
+            * **max_concurrency** (``int``) – the maximum number of requests to have in flight at once
+            * **rate_limiter** (:class:`~.RateLimiter`) – a limiter to use instead of the
+              ``rate_limit``, ``burst`` and ``max_concurrency``; can be shared between clients
+            * **token_cache** (:class:`~.TokenCache`) – a persistent cache to load access tokens from,
+              and save new access tokens to; can be shared between processes
+            * **validate_token** (``bool``) – if ``False``, new access tokens won't be validated
+              by :meth:`~.authenticate`; default is ``True``, unless ``fast_start=True``
+            * **cache** (:class:`~.ResponseCache`) – a cache for the responses of :meth:`~.get` requests
+            * **identity_map** (``bool``) – if ``True``, each item is parsed into a single :class:`~.Model`
+              instance, which is reused by every search and relationship that returns the item; default is ``False``
+            * **coalesce** (``bool``) – if ``True``, threads that send the same :meth:`~.get` request at the same time
+              will share a single request and response; default is ``True``
+            * **timeout** (``float`` or ``Tuple[float, float]``) – the ``(connect, read)`` timeout for requests,
+              in seconds; can be a single value for both, or ``None`` to wait forever; default is ``(10, 120)``
+            * **fast_start** (``bool``) – if ``True``, no network requests are made until the first API request,
+              which will :meth:`~.authenticate` if needed; uses the :data:`~.DEFAULT_USER_AGENT`
+              unless a ``user_agent`` is provided
 
         """
+        fast_start = kwargs.get('fast_start', False)
+
         #: The base API URL
         self.BASE_URL: str = ("http" if local else "https") + f"://{parse_domain(domain)}/rest/V1/"
         #: The user credentials
@@ -75,19 +114,73 @@ class Client:
         #: The store view code to request/update data on
         self.scope: str = scope
         #: The user agent to use in requests
-        self.user_agent: str = user_agent if user_agent else get_agent()
+        self.user_agent: str = user_agent or (DEFAULT_USER_AGENT if fast_start else get_agent())
         #: The :class:`~.MagentoLogger` for the domain/username combination
         self.logger: MagentoLogger = self.get_logger(
             stdout_level=log_level,
             log_file=kwargs.get('log_file', None),
             log_requests=kwargs.get('log_requests', True)
         )
+        #: The :class:`~requests.Session` used to send all requests, which pools keep-alive connections
+        self.session: requests.Session = self.get_session(
+            pool_size=kwargs.get('pool_size', 10)
+        )
+        #: The :class:`~.ResponseCache` for ``GET`` requests, if there is one
+        self.cache: Optional[ResponseCache] = kwargs.get('cache')
+        #: The :class:`~.IdentityMap` that keeps a single :class:`~.Model` instance per item, if there is one
+        self.identity_map: Optional[IdentityMap] = None
+        if kwargs.get('identity_map'):
+            from .cache import IdentityMap
+            self.identity_map = IdentityMap()
+        #: Whether concurrent :meth:`~.get` requests for the same URL share a single request
+        self.coalesce: bool = kwargs.get('coalesce', True)
+        #: The ``(connect, read)`` timeout for requests; see :meth:`~.deadline` to limit the total time of an operation
+        self.timeout: Optional[Union[float, Tuple[float, float]]] = kwargs.get('timeout', (10, 120))
+        #: The :class:`~.RetryPolicy` for requests that fail due to connection errors or server overload
+        self.retry: RetryPolicy = kwargs.get('retry', RetryPolicy()) or RetryPolicy(max_attempts=1)
+        #: The :class:`~.RateLimiter` for requests, which is shared by all threads using the client
+        self.limiter: RateLimiter = kwargs.get('rate_limiter') or RateLimiter(
+            rate=kwargs.get('rate_limit'),
+            burst=kwargs.get('burst', 1),
+            max_concurrency=kwargs.get('max_concurrency')
+        )
+        #: The :class:`~.TokenCache` to reuse unexpired access tokens from
+        self.token_cache: Optional[TokenCache] = kwargs.get('token_cache')
+        #: Whether to :meth:`~.validate` new access tokens in :meth:`~.authenticate`
+        self.validate_token: bool = kwargs.get('validate_token', not fast_start)
         #: An initialized :class:`Store` object
         self.store: Store = Store(self)
+        self._auth_lock = threading.Lock()
+        self._local = threading.local()
+        self._in_flight: Dict[str, Future] = {}
+        self._in_flight_lock = threading.Lock()
+
+        cached = not token and self.load_token()
 
-        if login:
+        if login and not (cached or fast_start):
             self.authenticate()
 
+    def __enter__(self) -> Client:
+        return self
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.pop('_auth_lock', None)
+        state.pop('_local', None)
+        state.pop('_in_flight', None)
+        state.pop('_in_flight_lock', None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._auth_lock = threading.Lock()
+        self._local = threading.local()
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
     @classmethod
     def new(cls) -> Client:
         """Prompts for input to log in to the Magento API"""
@@ -139,6 +232,22 @@ class Client:
                 return self.BASE_URL + endpoint
         return self.BASE_URL.replace('/V1', f'/{scope}/V1') + endpoint
 
+    def batch(self) -> BatchLoader:
+        """Initializes a :class:`~.BatchLoader`, to load the relationships of many objects with as few requests as possible
+
+        .. admonition:: Example
+           :class: example
+
+           ::
+
+            # Retrieve the products of every order with one request per batch of products
+            >> orders = api.orders.since('2023-01-01').execute()
+            >> api.batch().load(orders, 'products')
+        """
+        from .loaders import BatchLoader
+
+        return BatchLoader(self)
+
     def search(self, endpoint: str) -> SearchQuery:
         """Initializes and returns a :class:`~.SearchQuery` corresponding to the specified endpoint
 
@@ -204,9 +313,84 @@ class Client:
     def get(self, url: str) -> requests.Response:
         """Sends an authorized ``GET`` request
 
+        If the client has a :attr:`~.cache`, successful responses are cached and reused until they expire
+
+        If :attr:`~.coalesce` is ``True``, threads requesting a URL that's already being requested
+        will wait for that request to finish, then return the same response instead of sending another
+
+        .. note:: The JSON of a coalesced response is only parsed once, and is shared by all threads that requested it
+
+        .. note:: Threads with a :meth:`~.deadline` can wait on another thread's request, but never send a shared
+           request themselves, since its timeout would be reduced to their deadline and any
+           :class:`~.DeadlineExceeded` error would be raised in every waiting thread
+
         :param url: the URL to make the request on
         """
-        return self.request('GET', url)
+        from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+        from .cache import ResponseCache
+
+        if self.cache is not None and (response := self.cache.get(url)) is not None:
+            return response
+
+        if not self.coalesce:
+            return self.fetch(url)
+
+        key = ResponseCache.key(url)
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            if is_leader := future is None and self.get_deadline() is None:
+                future = self._in_flight[key] = Future()
+
+        if future is None:  # Sends its own request without sharing it
+            return self.fetch(url)
+
+        if not is_leader:
+            try:
+                return future.result(timeout=self.time_remaining())
+            except FutureTimeoutError:
+                raise DeadlineExceeded(self, msg=f'Deadline exceeded while waiting for GET request to {url}') from None
+
+        try:
+            response = self.fetch(url)
+            try:
+                data = response.json()  # Parse once for all threads
+            except ValueError:
+                pass
+            else:
+                response.json = lambda **kwargs: data
+        except BaseException as e:
+            self.finish_in_flight(key, future, exception=e)
+            raise
+        self.finish_in_flight(key, future, response=response)
+        return response
+
+    def fetch(self, url: str) -> requests.Response:
+        """Sends a ``GET`` request, and adds the response to the :attr:`~.cache` if it was successful
+
+        .. tip:: Use :meth:`get` instead
+
+        :param url: the URL to make the request on
+        """
+        response = self.request('GET', url)
+        if self.cache is not None and response.status_code == 200:
+            self.cache.set(url, response)
+        return response
+
+    def finish_in_flight(self, key: str, future: Future, response: requests.Response = None, exception: BaseException = None) -> None:
+        """Shares the result of a coalesced :meth:`~.get` request with the threads that are waiting on it
+
+        :param key: the normalized URL of the request
+        :param future: the :class:`~concurrent.futures.Future` that waiting threads hold
+        :param response: the response, if the request was successful
+        :param exception: the exception raised by the request, if it failed
+        """
+        with self._in_flight_lock:
+            self._in_flight.pop(key, None)  # Later requests won't reuse the response
+
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(response)
 
     def post(self, url: str, payload: dict) -> requests.Response:
         """Sends an authorized ``POST`` request
@@ -233,6 +417,8 @@ class Client:
 
     def authenticate(self) -> bool:
         """Authenticates the :attr:`~.USER_CREDENTIALS` and retrieves an access token
+
+        The new token is saved to the :attr:`~.token_cache`, if there is one
         """
         endpoint = self.url_for('integration/admin/token')
         payload = self.USER_CREDENTIALS
@@ -241,21 +427,21 @@ class Client:
             'User-Agent': self.user_agent
         }
         self.logger.info(f'Authenticating {payload["username"]} on {self.domain}...')
-        response = requests.post(
-            url=endpoint,
-            json=payload,
-            headers=headers
-        )
+        response = self.send('POST', endpoint, payload, headers)
         if response.ok:
             self.ACCESS_TOKEN = response.json()
         else:
             raise AuthenticationError(self, response=response)
 
-        self.logger.debug('Validating token...')
-        try:
-            self.validate()
-        except AuthenticationError as e:
-            raise AuthenticationError(self, msg='Token validation failed') from e
+        if self.validate_token:
+            self.logger.debug('Validating token...')
+            try:
+                self.validate()
+            except AuthenticationError as e:
+                raise AuthenticationError(self, msg='Token validation failed') from e
+
+        if self.token_cache:
+            self.token_cache.set(self.domain, payload['username'], self.ACCESS_TOKEN)
 
         self.logger.info('Logged in to {}'.format(payload["username"]))
         return True
@@ -265,7 +451,7 @@ class Client:
 
         :raises: :class:`~.AuthenticationError` if the token is invalid
         """
-        response = self.get(self.url_for('store/websites'))
+        response = self.send('GET', self.url_for('store/websites'), headers=self.headers)
         if response.status_code == 200:
             self.logger.debug("Token validated for {} on {}".format(
                 self.USER_CREDENTIALS['username'], self.domain))
@@ -285,20 +471,21 @@ class Client:
         :param payload: the JSON payload for the request (if the method is ``POST`` or ``PUT``)
         """
         method = method.upper()
-        if method in ('GET', 'DELETE'):
-            response = requests.request(method, url, headers=self.headers)
-        elif method in ('POST', 'PUT'):
-            if payload:
-                response = requests.request(method, url, json=payload, headers=self.headers)
-            else:
+        if method in ('POST', 'PUT'):
+            if not payload:
                 raise ValueError('Must provide a non-empty payload')
-        else:
+        elif method not in ('GET', 'DELETE'):
             raise ValueError('Invalid request method provided')
 
-        if response.status_code == 401:
-            self.logger.debug("Attempting to re-authenticate...")
-            self.authenticate()  # Will raise AuthenticationError if unsuccessful (won't recurse infinitely)
-            return self.request(method, url, payload)
+        token = self.token
+        response = self.send(method, url, payload, self.get_headers(token))
+
+        if response.status_code == 401:  # Retry once with a new token
+            self.reauthenticate(token)  # Will raise AuthenticationError if unsuccessful
+            response = self.send(method, url, payload, self.get_headers(self.ACCESS_TOKEN))
+
+        if self.cache is not None and method != 'GET':
+            self.cache.invalidate(url)  # Even failed requests may have changed the resource
 
         if response.status_code != 200:  # All non 401 responses are returned; errors are logged then handled by methods
             self.logger.error("Request to {} failed with status code {}.\n{message}".format(
@@ -307,6 +494,157 @@ class Client:
 
         return response
 
+    def send(self, method: str, url: str, payload: dict = None, headers: dict = None) -> requests.Response:
+        """Sends a request with the :attr:`session`, retrying it as allowed by the :attr:`retry` policy
+
+        Each attempt waits for the :attr:`limiter` before being sent, for no longer than the current :meth:`~.deadline` allows
+
+        .. tip:: Use :meth:`get`, :meth:`post`, :meth:`put` or :meth:`delete` instead
+
+        :param method: the request method
+        :param url: the url to send the request to
+        :param payload: the JSON payload for the request (if the method is ``POST`` or ``PUT``)
+        :param headers: the request headers
+        :raises: :class:`requests.ConnectionError` or :class:`requests.Timeout` if the final attempt fails to connect
+        :raises: :class:`~.DeadlineExceeded` if the current :meth:`~.deadline` passes before a response is received
+        """
+        attempt = 1
+        while True:
+            remaining = self.time_remaining()
+            if remaining is not None and remaining <= 0:
+                raise DeadlineExceeded(self, msg=f'Deadline exceeded before sending {method} request to {url}')
+            if not self.limiter.acquire(timeout=remaining):
+                raise DeadlineExceeded(self, msg=f'Deadline exceeded while waiting to send {method} request to {url}')
+            try:
+                if (remaining := self.time_remaining()) is not None and remaining <= 0:
+                    raise DeadlineExceeded(self, msg=f'Deadline exceeded while waiting to send {method} request to {url}')
+                response = self.session.request(
+                    method, url, json=payload, headers=headers, timeout=self.get_timeout(remaining)
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if (remaining := self.time_remaining()) is not None and remaining <= 0:
+                    raise DeadlineExceeded(self, msg=f'Deadline exceeded while sending {method} request to {url}') from e
+                if not self.retry.should_retry(method, attempt):
+                    raise
+                error, reason, retry_after = e, type(e).__name__, None
+            else:
+                if not self.retry.should_retry(method, attempt, response.status_code):
+                    return response
+                error, reason, retry_after = None, f'status code {response.status_code}', response.headers.get('Retry-After')
+            finally:
+                self.limiter.release()
+
+            delay = self.retry.get_delay(attempt, retry_after)
+            if (remaining := self.time_remaining()) is not None and delay >= remaining:
+                if error:  # Not enough time left to retry
+                    raise error
+                return response
+            if not error:
+                response.close()
+
+            attempt += 1
+            self.logger.warning(
+                f'{method} request to {url} failed with {reason}. Retrying in {delay:.2f} seconds '
+                f'(attempt {attempt} of {self.retry.max_attempts})'
+            )
+            time.sleep(delay)
+
+    @contextmanager
+    def deadline(self, seconds: Optional[float]) -> Iterator[None]:
+        """Context manager that limits the total time spent on requests made within it by the current thread
+
+        Once the deadline passes, the next request (or retry) raises a :class:`~.DeadlineExceeded` error,
+        and the :attr:`~.timeout` of each request is reduced to fit within the time that's left
+
+        .. admonition:: Example
+           :class: example
+
+           ::
+
+            # Fail if retrieving the orders takes more than 10 seconds in total
+            >> with api.deadline(10):
+            ...     orders = api.orders.by_product(product)
+
+        .. note:: Deadlines can be nested; the earliest one applies
+
+        :param seconds: the time limit, in seconds, or ``None`` to only apply any enclosing deadline
+        """
+        with self.deadline_at(None if seconds is None else time.monotonic() + seconds):
+            yield
+
+    @contextmanager
+    def deadline_at(self, when: Optional[float]) -> Iterator[None]:
+        """Context manager that sets a :meth:`~.deadline` using a :func:`time.monotonic` timestamp
+
+        :param when: the time of the deadline, or ``None`` to only apply any enclosing deadline
+        """
+        previous = getattr(self._local, 'deadline', None)
+        if previous is not None and (when is None or previous < when):
+            when = previous
+        self._local.deadline = when
+        try:
+            yield
+        finally:
+            self._local.deadline = previous
+
+    def get_deadline(self) -> Optional[float]:
+        """Returns the :func:`time.monotonic` timestamp of the current thread's :meth:`~.deadline`, if it has one"""
+        return getattr(self._local, 'deadline', None)
+
+    def time_remaining(self) -> Optional[float]:
+        """Returns the number of seconds until the current thread's :meth:`~.deadline`, if it has one"""
+        if (deadline := self.get_deadline()) is not None:
+            return deadline - time.monotonic()
+        return None
+
+    def bind_deadline(self, func: Callable) -> Callable:
+        """Wraps a function so that it uses the current thread's :meth:`~.deadline` when called from another thread
+
+        :param func: a function that makes requests, which will be submitted to a thread pool
+        """
+        deadline = self.get_deadline()
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.deadline_at(deadline):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def get_timeout(self, remaining: Optional[float] = None) -> Optional[Union[float, Tuple[float, float]]]:
+        """Returns the :attr:`~.timeout` to use for a request, reduced to fit within the remaining time if needed
+
+        :param remaining: the number of seconds left until the current :meth:`~.deadline`
+        """
+        if remaining is None:
+            return self.timeout
+        timeouts = self.timeout if isinstance(self.timeout, tuple) else (self.timeout, self.timeout)
+        return tuple(remaining if t is None else min(t, remaining) for t in timeouts)
+
+    @staticmethod
+    def get_session(pool_size: int = 10) -> requests.Session:
+        """Returns a :class:`~requests.Session` that reuses pooled keep-alive connections across requests
+
+        :param pool_size: the maximum number of connections to keep open per host
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def close(self) -> None:
+        """Closes the :attr:`session` and all of its pooled connections
+
+        .. tip:: The :class:`Client` can also be used as a context manager to close the session automatically
+
+           ::
+
+            with Client("domain.com", "username", "password") as api:
+                api.orders.by_number("000000001")
+        """
+        self.session.close()
+
     def get_logger(self, log_file: str = None, stdout_level: str = 'INFO', log_requests: bool = True) -> MagentoLogger:
         """Retrieve a MagentoLogger for the current username/domain combination. Log files are DEBUG.
 
@@ -325,22 +663,67 @@ class Client:
             log_requests=log_requests
         )
 
+    def reauthenticate(self, expired_token: str) -> bool:
+        """Replaces an expired access token by calling :meth:`~.authenticate`
+
+        Only one thread re-authenticates at a time. Threads that were waiting on it
+        will use the new token instead of requesting another one
+
+        :param expired_token: the token that was rejected by the API
+        :raises: :class:`~.AuthenticationError` if re-authentication fails
+        """
+        with self._auth_lock:
+            if self.ACCESS_TOKEN and self.ACCESS_TOKEN != expired_token:
+                self.logger.debug('Using the token that was refreshed by another thread')
+                return True
+            if self.token_cache:
+                self.token_cache.delete(self.domain, self.USER_CREDENTIALS['username'], expired_token)
+                if self.load_token():
+                    self.logger.debug('Using the token that was refreshed by another process')
+                    return True
+            self.logger.debug("Attempting to re-authenticate...")
+            return self.authenticate()
+
+    def load_token(self) -> bool:
+        """Loads an unexpired access token from the :attr:`~.token_cache`, if there is one
+
+        :returns: ``True`` if a cached token was loaded
+        """
+        if self.token_cache:
+            if token := self.token_cache.get(self.domain, self.USER_CREDENTIALS['username']):
+                self.logger.debug(f'Loaded a cached token for {self.USER_CREDENTIALS["username"]} on {self.domain}')
+                self.ACCESS_TOKEN = token
+                return True
+        return False
+
     @property
     def headers(self) -> dict:
         """Authorization headers for API requests
 
         Automatically generates a :attr:`token` if needed
         """
+        return self.get_headers(self.token)
+
+    def get_headers(self, token: str) -> dict:
+        """Authorization headers for API requests that use the provided access token
+
+        :param token: the access token to use
+        """
         return {
-            'Authorization': f'Bearer {self.token}',
+            'Authorization': f'Bearer {token}',
             'User-Agent': self.user_agent
         }
 
     @property
     def token(self) -> str:
-        """Returns or generates an :attr:`~ACCES_TOKEN`"""
+        """Returns or generates an :attr:`~ACCES_TOKEN`
+
+        Tries to load a token from the :attr:`~.token_cache` before calling :meth:`~.authenticate`
+        """
         if not self.ACCESS_TOKEN:
-            self.authenticate()
+            with self._auth_lock:
+                if not self.ACCESS_TOKEN and not self.load_token():  # Another thread may have authenticated already
+                    self.authenticate()
         return self.ACCESS_TOKEN
 
     def to_pickle(self, validate: bool = False) -> bytes:
@@ -372,6 +755,7 @@ class Client:
             'username': self.USER_CREDENTIALS['username'],
             'password': self.USER_CREDENTIALS['password'],
             'scope': self.scope,
+            'local': self.BASE_URL.startswith('http://'),
             'user_agent': self.user_agent,
             'token': self.token,
             'log_level': self.logger.logger.level,
@@ -385,6 +769,490 @@ class Client:
             print(f'{k} : {v}')
 
 
+class AsyncClient:
+
+    """Asynchronous version of the :class:`Client`, for sending requests from within an :mod:`asyncio` event loop
+
+    Requests are sent with a pooled :class:`httpx.AsyncClient`, which requires the ``async`` extra::
+
+        pip install my-magento[async]
+
+    .. admonition:: Example
+       :class: example
+
+       ::
+
+        async with AsyncClient("domain.com", "username", "password") as api:
+            order = await api.orders.by_number("000000001")
+            products = await api.products.by_skulist(["sku1", "sku2"])
+
+    .. note:: Search results are the same :class:`~.Model` objects that a :class:`Client` returns
+
+       They're initialized with the synchronous :attr:`client`, so any of their
+       methods and properties that send requests will still do so synchronously
+    """
+
+    def __init__(
+            self,
+            domain: str,
+            username: str,
+            password: str,
+            scope: Optional[str] = '',
+            local: bool = False,
+            user_agent: Optional[str] = None,
+            token: Optional[str] = None,
+            log_level: str = 'INFO',
+            **kwargs
+    ):
+        """Initialize an AsyncClient
+
+        Accepts the same arguments as a :class:`Client`, except for ``login``
+
+        * An access token is retrieved upon the first request, or by awaiting :meth:`authenticate`
+
+        :param domain: domain name of the Magento store (ex. ``domain.com`` or ``127.0.0.1/magento24``)
+        :param username: username of the Magento Admin account
+        :param password: password of the Magento Admin account
+        :param scope: the store view scope to :meth:`~search` and make requests on
+        :param local: whether the Magento store is hosted locally
+        :param user_agent: the user agent to use in requests; uses the :data:`~.DEFAULT_USER_AGENT` if not provided
+        :param token: an existing access token
+        :param log_level: the logging level for logging to stdout
+        :param kwargs: any of the extra keyword arguments accepted by a :class:`Client`
+        """
+        import asyncio
+
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError(
+                'The AsyncClient requires httpx. Install it with "pip install my-magento[async]"'
+            ) from e
+
+        #: The synchronous :class:`Client`, which shares its settings and access token with the AsyncClient
+        self.client: Client = Client(
+            domain=domain,
+            username=username,
+            password=password,
+            scope=scope,
+            local=local,
+            user_agent=user_agent or DEFAULT_USER_AGENT,  # Scraping one would block the event loop
+            token=token,
+            log_level=log_level,
+            login=False,
+            **kwargs
+        )
+        #: The :class:`httpx.AsyncClient` used to send all requests, which pools keep-alive connections
+        connect, read = self.client.timeout if isinstance(self.client.timeout, tuple) else (self.client.timeout,) * 2
+        self.session: httpx.AsyncClient = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=None,
+                max_keepalive_connections=kwargs.get('pool_size', 10)
+            ),
+            timeout=httpx.Timeout(read, connect=connect)
+        )
+        self._auth_lock = asyncio.Lock()
+        self._deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar('deadline', default=None)
+
+    async def __aenter__(self) -> AsyncClient:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    @property
+    def BASE_URL(self) -> str:
+        """The base API URL"""
+        return self.client.BASE_URL
+
+    @property
+    def USER_CREDENTIALS(self) -> Dict[str, str]:
+        """The user credentials"""
+        return self.client.USER_CREDENTIALS
+
+    @property
+    def ACCESS_TOKEN(self) -> str:
+        """The API access token, which is shared with the :attr:`client`"""
+        return self.client.ACCESS_TOKEN
+
+    @ACCESS_TOKEN.setter
+    def ACCESS_TOKEN(self, token: str) -> None:
+        self.client.ACCESS_TOKEN = token
+
+    @property
+    def domain(self) -> str:
+        """The Magento store domain"""
+        return self.client.domain
+
+    @property
+    def scope(self) -> str:
+        """The store view code to request/update data on"""
+        return self.client.scope
+
+    @scope.setter
+    def scope(self, scope: str) -> None:
+        self.client.scope = scope
+
+    @property
+    def user_agent(self) -> str:
+        """The user agent to use in requests"""
+        return self.client.user_agent
+
+    @property
+    def logger(self) -> MagentoLogger:
+        """The :class:`~.MagentoLogger` of the :attr:`client`"""
+        return self.client.logger
+
+    @property
+    def store(self) -> Store:
+        """The :class:`Store` of the :attr:`client`"""
+        return self.client.store
+
+    def url_for(self, endpoint: str, scope: str = None) -> str:
+        """Returns the appropriate request url for the given API endpoint and store scope
+
+        See :meth:`.Client.url_for` for details
+
+        :param endpoint: the API endpoint
+        :param scope: the scope to generate the url for; uses the :attr:`~.scope` if not provided
+        """
+        return self.client.url_for(endpoint, scope)
+
+    def batch(self) -> AsyncBatchLoader:
+        """Initializes an :class:`~.AsyncBatchLoader`, to load the relationships of many objects with as few requests as possible
+
+        See :meth:`.Client.batch` for details
+        """
+        from .loaders import AsyncBatchLoader
+
+        return AsyncBatchLoader(self)
+
+    def search(self, endpoint: str) -> AsyncSearchQuery:
+        """Initializes and returns an :class:`~.AsyncSearchQuery` corresponding to the specified endpoint
+
+        See :meth:`.Client.search` for details
+
+        :param endpoint: a valid Magento API search endpoint
+        """
+        if endpoint.lower() == 'orders':
+            return self.orders
+        if endpoint.lower() == 'orders/items':
+            return self.order_items
+        if endpoint.lower() == 'invoices':
+            return self.invoices
+        if endpoint.lower() == 'categories':
+            return self.categories
+        if endpoint.lower() == 'products':
+            return self.products
+        if endpoint.lower() == 'products/attributes':
+            return self.product_attributes
+        if endpoint.lower() in ('customers', 'customers/search'):
+            return self.customers
+        return AsyncSearchQuery(endpoint=endpoint, client=self)
+
+    @property
+    def orders(self) -> AsyncOrderSearch:
+        """Initializes an :class:`~.AsyncOrderSearch`"""
+        return AsyncOrderSearch(self)
+
+    @property
+    def order_items(self) -> AsyncOrderItemSearch:
+        """Initializes an :class:`~.AsyncOrderItemSearch`"""
+        return AsyncOrderItemSearch(self)
+
+    @property
+    def invoices(self) -> AsyncInvoiceSearch:
+        """Initializes an :class:`~.AsyncInvoiceSearch`"""
+        return AsyncInvoiceSearch(self)
+
+    @property
+    def categories(self) -> AsyncCategorySearch:
+        """Initializes an :class:`~.AsyncCategorySearch`"""
+        return AsyncCategorySearch(self)
+
+    @property
+    def products(self) -> AsyncProductSearch:
+        """Initializes an :class:`~.AsyncProductSearch`"""
+        return AsyncProductSearch(self)
+
+    @property
+    def product_attributes(self) -> AsyncProductAttributeSearch:
+        """Initializes an :class:`~.AsyncProductAttributeSearch`"""
+        return AsyncProductAttributeSearch(self)
+
+    @property
+    def customers(self) -> AsyncCustomerSearch:
+        """Initializes an :class:`~.AsyncCustomerSearch`"""
+        return AsyncCustomerSearch(self)
+
+    async def get(self, url: str) -> httpx.Response:
+        """Sends an authorized ``GET`` request
+
+        :param url: the URL to make the request on
+        """
+        return await self.request('GET', url)
+
+    async def post(self, url: str, payload: dict) -> httpx.Response:
+        """Sends an authorized ``POST`` request
+
+        :param url: the URL to make the request on
+        :param payload: the JSON payload for the request
+        """
+        return await self.request('POST', url, payload)
+
+    async def put(self, url: str, payload: dict) -> httpx.Response:
+        """Sends an authorized ``PUT`` request
+
+        :param url: the URL to make the request on
+        :param payload: the JSON payload for the request
+        """
+        return await self.request('PUT', url, payload)
+
+    async def delete(self, url: str) -> httpx.Response:
+        """Sends an authorized ``DELETE`` request
+
+        :param url: the URL to make the request on
+        """
+        return await self.request('DELETE', url)
+
+    async def authenticate(self) -> bool:
+        """Authenticates the :attr:`~.USER_CREDENTIALS` and retrieves an access token"""
+        import asyncio
+
+        endpoint = self.url_for('integration/admin/token')
+        payload = self.USER_CREDENTIALS
+        headers = {
+            'Content-Type': 'application/json',
+            'User-Agent': self.user_agent
+        }
+        self.logger.info(f'Authenticating {payload["username"]} on {self.domain}...')
+        response = await self.send('POST', endpoint, payload, headers)
+        if response.status_code == 200:
+            self.ACCESS_TOKEN = response.json()
+        else:
+            raise AuthenticationError(self, response=response)
+
+        if self.client.validate_token:
+            self.logger.debug('Validating token...')
+            try:
+                await self.validate()
+            except AuthenticationError as e:
+                raise AuthenticationError(self, msg='Token validation failed') from e
+
+        if self.client.token_cache:  # File I/O runs in a thread, so the event loop isn't blocked
+            await asyncio.to_thread(self.client.token_cache.set, self.domain, payload['username'], self.ACCESS_TOKEN)
+
+        self.logger.info('Logged in to {}'.format(payload["username"]))
+        return True
+
+    async def validate(self) -> bool:
+        """Validates the :attr:`~.ACCESS_TOKEN` by sending an authorized request to a standard API endpoint
+
+        :raises: :class:`~.AuthenticationError` if the token is invalid
+        """
+        response = await self.send('GET', self.url_for('store/websites'), headers=self.get_headers(self.ACCESS_TOKEN))
+        if response.status_code == 200:
+            self.logger.debug("Token validated for {} on {}".format(
+                self.USER_CREDENTIALS['username'], self.domain))
+            return True
+        else:
+            msg = "Token validation failed for {} on {}".format(
+                self.USER_CREDENTIALS['username'], self.domain)
+            raise AuthenticationError(self, msg=msg, response=response)
+
+    async def get_token(self) -> str:
+        """Returns the :attr:`~.ACCESS_TOKEN`, or awaits :meth:`authenticate` to generate one if needed"""
+        if not self.ACCESS_TOKEN:
+            async with self._auth_lock:
+                if not self.ACCESS_TOKEN and not await self.load_token():  # Another task may have authenticated already
+                    await self.authenticate()
+        return self.ACCESS_TOKEN
+
+    async def load_token(self) -> bool:
+        """Loads an unexpired access token from the :attr:`.Client.token_cache` in a separate thread, if there is one
+
+        See :meth:`.Client.load_token` for details
+
+        :returns: ``True`` if a cached token was loaded
+        """
+        import asyncio
+
+        if not self.client.token_cache:
+            return False
+        return await asyncio.to_thread(self.client.load_token)
+
+    async def request(self, method: str, url: str, payload: dict = None) -> httpx.Response:
+        """Sends an authorized API request. Used for all internal requests
+
+        .. tip:: Use :meth:`get`, :meth:`post`, :meth:`put` or :meth:`delete` instead
+
+        :param method: the request method
+        :param url: the url to send the request to
+        :param payload: the JSON payload for the request (if the method is ``POST`` or ``PUT``)
+        """
+        import asyncio
+
+        method = method.upper()
+        if method in ('POST', 'PUT'):
+            if not payload:
+                raise ValueError('Must provide a non-empty payload')
+        elif method not in ('GET', 'DELETE'):
+            raise ValueError('Invalid request method provided')
+
+        token = await self.get_token()
+        response = await self.send(method, url, payload, self.get_headers(token))
+
+        if response.status_code == 401:
+            self.logger.debug("Attempting to re-authenticate...")
+            async with self._auth_lock:
+                if self.ACCESS_TOKEN == token:  # Otherwise another task already re-authenticated
+                    if self.client.token_cache:
+                        await asyncio.to_thread(
+                            self.client.token_cache.delete, self.domain, self.USER_CREDENTIALS['username'], token
+                        )
+                    if not await self.load_token():  # Or another process did
+                        await self.authenticate()
+            response = await self.send(method, url, payload, self.get_headers(self.ACCESS_TOKEN))
+
+        if response.status_code != 200:
+            self.logger.error("Request to {} failed with status code {}.\n{message}".format(
+                url, response.status_code, message=MagentoError.parse(response))
+            )
+        return response
+
+    async def send(self, method: str, url: str, payload: dict = None, headers: dict = None) -> httpx.Response:
+        """Sends a request with the :attr:`session`, retrying it as allowed by the :attr:`.Client.retry` policy
+
+        Each attempt waits for the :attr:`.Client.limiter` before being sent, which is shared with the :attr:`client`,
+        for no longer than the current :meth:`~.deadline` allows
+
+        :param method: the request method
+        :param url: the url to send the request to
+        :param payload: the JSON payload for the request (if the method is ``POST`` or ``PUT``)
+        :param headers: the request headers
+        :raises: :class:`httpx.TransportError` if the final attempt fails to connect
+        :raises: :class:`~.DeadlineExceeded` if the current :meth:`~.deadline` passes before a response is received
+        """
+        import asyncio
+        import httpx
+
+        retry = self.client.retry
+        attempt = 1
+        while True:
+            remaining = self.time_remaining()
+            if remaining is not None and remaining <= 0:
+                raise DeadlineExceeded(self, msg=f'Deadline exceeded before sending {method} request to {url}')
+            if not await self.client.limiter.acquire_async(timeout=remaining):
+                raise DeadlineExceeded(self, msg=f'Deadline exceeded while waiting to send {method} request to {url}')
+            try:
+                if (remaining := self.time_remaining()) is not None and remaining <= 0:
+                    raise DeadlineExceeded(self, msg=f'Deadline exceeded while waiting to send {method} request to {url}')
+                response = await self.session.request(
+                    method, url, json=payload, headers=headers, timeout=self.get_timeout(remaining)
+                )
+            except httpx.TransportError as e:
+                if (remaining := self.time_remaining()) is not None and remaining <= 0:
+                    raise DeadlineExceeded(self, msg=f'Deadline exceeded while sending {method} request to {url}') from e
+                if not retry.should_retry(method, attempt):
+                    raise
+                error, reason, retry_after = e, type(e).__name__, None
+            else:
+                if not retry.should_retry(method, attempt, response.status_code):
+                    return response
+                error, reason, retry_after = None, f'status code {response.status_code}', response.headers.get('Retry-After')
+            finally:
+                self.client.limiter.release()
+
+            delay = retry.get_delay(attempt, retry_after)
+            if (remaining := self.time_remaining()) is not None and delay >= remaining:
+                if error:  # Not enough time left to retry
+                    raise error
+                return response
+            if not error:
+                await response.aclose()
+
+            attempt += 1
+            self.logger.warning(
+                f'{method} request to {url} failed with {reason}. Retrying in {delay:.2f} seconds '
+                f'(attempt {attempt} of {retry.max_attempts})'
+            )
+            await asyncio.sleep(delay)
+
+    @contextmanager
+    def deadline(self, seconds: Optional[float]) -> Iterator[None]:
+        """Context manager that limits the total time spent on requests awaited within it by the current task
+
+        See :meth:`.Client.deadline` for details
+
+        .. admonition:: Example
+           :class: example
+
+           ::
+
+            >> with api.deadline(10):
+            ...     orders = await api.orders.by_product(product)
+
+        .. note:: Tasks created within the context manager, like those of :meth:`~.AsyncSearchQuery.iter_pages`,
+           share its deadline
+
+        :param seconds: the time limit, in seconds, or ``None`` to only apply any enclosing deadline
+        """
+        with self.deadline_at(None if seconds is None else time.monotonic() + seconds):
+            yield
+
+    @contextmanager
+    def deadline_at(self, when: Optional[float]) -> Iterator[None]:
+        """Context manager that sets a :meth:`~.deadline` using a :func:`time.monotonic` timestamp
+
+        :param when: the time of the deadline, or ``None`` to only apply any enclosing deadline
+        """
+        previous = self._deadline.get()
+        if previous is not None and (when is None or previous < when):
+            when = previous
+        token = self._deadline.set(when)
+        try:
+            yield
+        finally:
+            self._deadline.reset(token)
+
+    def get_deadline(self) -> Optional[float]:
+        """Returns the :func:`time.monotonic` timestamp of the current task's :meth:`~.deadline`, if it has one"""
+        return self._deadline.get()
+
+    def time_remaining(self) -> Optional[float]:
+        """Returns the number of seconds until the current task's :meth:`~.deadline`, if it has one"""
+        if (deadline := self.get_deadline()) is not None:
+            return deadline - time.monotonic()
+        return None
+
+    def get_timeout(self, remaining: Optional[float] = None) -> Union[httpx.Timeout, Any]:
+        """Returns the timeout to use for a request, reduced to fit within the remaining time if needed
+
+        :param remaining: the number of seconds left until the current :meth:`~.deadline`
+        """
+        import httpx
+
+        if remaining is None:
+            return httpx.USE_CLIENT_DEFAULT
+        connect, read = self.client.get_timeout(remaining)
+        return httpx.Timeout(read, connect=connect)
+
+    def get_headers(self, token: str) -> dict:
+        """Authorization headers for API requests that use the provided access token
+
+        :param token: the access token to use
+        """
+        return {
+            'Authorization': f'Bearer {token}',
+            'User-Agent': self.user_agent
+        }
+
+    async def close(self) -> None:
+        """Closes the :attr:`session` and the session of the synchronous :attr:`client`"""
+        await self.session.aclose()
+        self.client.close()
+
+
 class Store:
 
     """Class containing store configurations and cached attribute lists"""
@@ -423,6 +1291,12 @@ class Store:
         """Returns a list of all store views"""
         return self.client.search('store/storeViews').execute()
 
+    @cached_property
+    def category_tree(self) -> CategoryTree:
+        """A cached :class:`~.CategoryTree` of every category, retrieved with a single request"""
+        root = self.client.categories.get_root()
+        return CategoryTree(root.data if root else {})
+
     @cached_property
     def all_product_attributes(self) -> List[ProductAttribute]:
         """A cached list of all product attributes"""
@@ -473,7 +1347,7 @@ class Store:
 
     def refresh(self) -> bool:
         """Clears all cached properties"""
-        cached = ('configs', 'views', 'all_product_attributes', 'store_view_product_attributes',
+        cached = ('configs', 'views', 'category_tree', 'all_product_attributes', 'store_view_product_attributes',
                   'website_product_attributes', 'global_product_attributes', 'website_attribute_codes')
         for key in cached:
             self.__dict__.pop(key, None)
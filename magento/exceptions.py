@@ -1,4 +1,5 @@
 from __future__ import annotations
+import sys
 from typing import Union, Optional, TYPE_CHECKING, Dict
 import requests
 
@@ -36,12 +37,13 @@ class MagentoError(Exception):
         """Parses the error message from the ``response``
 
         :param response: a bad response returned by the Magento API
-        :raises: TypeError if ``response`` is not a :class:`~requests.Response` or :class:`Dict`
+        :raises: TypeError if ``response`` is not a :class:`~requests.Response`, :class:`httpx.Response` or :class:`Dict`
         """
-        if isinstance(response, requests.Response):
+        httpx = sys.modules.get('httpx')  # An httpx.Response can only exist if httpx was already imported
+        if isinstance(response, requests.Response) or httpx is not None and isinstance(response, httpx.Response):
             response = response.json()
         elif not isinstance(response, Dict):
-            raise TypeError(f"`response` must be a `dict` or {requests.Response}")
+            raise TypeError(f"`response` must be a `dict`, {requests.Response} or httpx.Response")
 
         message = response.get('message', '')
         params = response.get('parameters')
@@ -81,3 +83,13 @@ class AuthenticationError(MagentoError):
 
     def __init__(self, client: Client, msg: Optional[str] = None, response: Optional[requests.Response] = None):
         super().__init__(client, msg, response)
+
+
+class DeadlineExceeded(MagentoError):
+
+    """Exception class for requests that can't be completed before the :meth:`~.Client.deadline` of an operation"""
+
+    DEFAULT_MSG = 'Deadline exceeded.'
+
+    def __init__(self, client: Client, msg: Optional[str] = None, response: Optional[requests.Response] = None):
+        super().__init__(client, msg, response)
@@ -0,0 +1,241 @@
+from __future__ import annotations
+import os
+import json
+from pathlib import Path
+from collections import deque
+from itertools import islice, count
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Dict, List, Tuple, Union, Callable, Iterable, Iterator, Any, TYPE_CHECKING
+from .search import SearchCriteria
+from .models import Model
+from . import clients
+
+if TYPE_CHECKING:
+    from .search import SearchQuery
+
+#: A range of items to export, as a ``(field, start, end)`` tuple that matches items for which ``start <= field < end``
+Shard = Tuple[str, Any, Any]
+
+
+class ExportPipeline:
+
+    """Exports the results of a :class:`~.SearchQuery` using multiple processes
+
+    The query is split into independent :data:`Shard`\s, like date windows or ranges of ids,
+    which are each retrieved and parsed in a separate worker process
+
+    * Each worker uses its own :class:`~.Client`, initialized with the settings from :meth:`~.client_config`
+    * Items are parsed into :class:`~.Model` objects in the worker, then passed to the ``transform``
+      function, so that any CPU-bound work is spread across every core instead of sharing the GIL
+    * The results of each shard are either sent back to the parent process by :meth:`~.run`,
+      or written to a separate file by :meth:`~.write`
+
+    .. admonition:: Example
+       :class: example
+
+       ::
+
+        # Export every completed order since 2015 to a JSON Lines file per shard
+        >> pipeline = ExportPipeline(api.orders.add_criteria('status', 'complete'), workers=8)
+        >> shards = pipeline.shard_by_date('2015-01-01', max_items=5000)
+        >> paths = pipeline.write(shards, 'exports/orders')
+
+        # Summarize each order in the worker processes
+        >> def summarize(order):
+        ...     return {'number': order.number, 'skus': [item.sku for item in order.items]}
+        >> pipeline = ExportPipeline(api.orders, transform=summarize)
+        >> for results in pipeline.run(pipeline.shard_by_id(1, 100000, size=5000)):
+        ...     print(len(results))
+
+    .. note:: The ``transform`` function must be defined at the top level of a module,
+       so that it can be sent to the worker processes
+    """
+
+    def __init__(
+            self,
+            query: SearchQuery,
+            workers: Optional[int] = None,
+            page_size: int = 100,
+            transform: Optional[Callable[[Model], Any]] = None,
+    ):
+        """Initialize an ExportPipeline
+
+        :param query: the :class:`~.SearchQuery` to export the results of, including any criteria
+        :param workers: the number of worker processes; uses the number of CPUs if not provided.
+            This is capped at the ``max_concurrency`` of the client's :attr:`~.Client.limiter`,
+            since each worker needs at least one request in flight
+        :param page_size: the number of items to request per page of each shard
+        :param transform: a function to call on each :class:`~.Model` in the worker processes;
+            the raw data of each item is used if not provided
+        """
+        if page_size < 1:
+            raise ValueError('`page_size` must be a positive integer')
+
+        workers = workers or os.cpu_count() or 1
+        if (max_concurrency := query.client.limiter.max_concurrency) and workers > max_concurrency:
+            query.client.logger.warning(
+                f'Using {max_concurrency} export workers instead of {workers}, '
+                f'since the client allows {max_concurrency} requests in flight at once'
+            )
+            workers = max_concurrency
+
+        self.query = query
+        self.workers = workers
+        self.page_size = page_size
+        self.transform = transform
+
+    def __repr__(self):
+        return f'<ExportPipeline: {self.query.endpoint} ({self.workers} workers)>'
+
+    def shard_by_date(self, start: str, end: Optional[str] = None, max_items: int = 10000,
+                      field: str = 'created_at') -> List[Shard]:
+        """Splits a date range into shards of at most ``max_items``, using :meth:`.SearchQuery.partition`
+
+        :param start: the date to start from (inclusive)
+        :param end: the date to end at (exclusive); uses the current time if not provided
+        :param max_items: the maximum number of items per shard
+        :param field: the date field to shard by
+        """
+        windows = self.query.partition(start, end, max_items, field)
+        return [(field, window_start, window_end) for window_start, window_end in windows]
+
+    def shard_by_id(self, start: int, end: int, size: int = 10000, field: Optional[str] = None) -> List[Shard]:
+        """Splits a range of ids into shards of ``size`` ids each
+
+        :param start: the id to start from (inclusive)
+        :param end: the id to end at (exclusive)
+        :param size: the number of ids per shard
+        :param field: the id field to shard by; uses the :attr:`~.SearchQuery.KEYSET_FIELD` if not provided
+        :raises: :class:`ValueError` if no ``field`` is provided and the endpoint has no :attr:`~.SearchQuery.KEYSET_FIELD`
+        """
+        if size < 1:
+            raise ValueError('`size` must be a positive integer')
+
+        field = self.query.get_keyset_field(field)
+        return [(field, i, min(i + size, end)) for i in range(start, end, size)]
+
+    def run(self, shards: Iterable[Shard]) -> Iterator[List[Any]]:
+        """Exports each shard in a worker process, yielding the results as they're received
+
+        Shards are yielded in order, and at most ``workers`` shards are processed
+        or waiting to be consumed at any time
+
+        :param shards: the shards to export
+        :returns: a generator that yields the transformed items of each shard
+        """
+        yield from self.map(shards)
+
+    def write(self, shards: Iterable[Shard], directory: Union[str, Path]) -> List[Path]:
+        """Exports each shard in a worker process, writing the results to a JSON Lines file per shard
+
+        Since results aren't sent back to the parent process, this is the fastest way to export large queries
+
+        :param shards: the shards to export
+        :param directory: the directory to write the files to, which are named by the ``endpoint`` and shard number
+        :returns: the paths of the files that were written, in the same order as the ``shards``
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        prefix = self.query.endpoint.replace('/', '_')
+
+        paths = (directory / f'{prefix}-{i:05d}.jsonl' for i in count())
+        return list(self.map(shards, paths))
+
+    def map(self, shards: Iterable[Shard], paths: Optional[Iterator[Path]] = None) -> Iterator:
+        """Submits each shard to the worker processes, yielding the return value of :func:`export_shard`
+
+        :param shards: the shards to export
+        :param paths: the path to write the results of each shard to, if they should be written to files
+        """
+        config = self.client_config()
+        shards = iter(shards)
+
+        def submit(shard):
+            path = next(paths) if paths else None
+            return executor.submit(
+                export_shard, config, self.query.endpoint, self.query.criteria,
+                shard, self.page_size, self.transform, path, self.query.relations
+            )
+
+        executor = ProcessPoolExecutor(max_workers=self.workers)
+        pending = deque(submit(shard) for shard in islice(shards, self.workers))
+        try:
+            while pending:
+                result = pending.popleft().result()
+                if (shard := next(shards, None)) is not None:
+                    pending.append(submit(shard))
+                yield result
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def client_config(self) -> Dict:
+        """Returns the settings to initialize the :class:`~.Client` of each worker process with
+
+        Workers use the same :attr:`~.Client.timeout`, :attr:`~.Client.retry` policy and :attr:`~.Client.token_cache`
+        as the query's client. Its :attr:`~.Client.limiter` is split evenly between the workers, so that
+        together they never exceed its ``rate`` or ``max_concurrency``
+
+        .. note:: Each worker can send a burst of at least one request, so if there are more workers
+           than the ``burst``, the first requests of the export can be sent together
+        """
+        client = self.query.client
+        limiter = client.limiter
+
+        config = client.to_dict()
+        config.update({
+            'login': False,  # The token is reused
+            'fast_start': True,
+            'timeout': client.timeout,
+            'retry': client.retry,
+            'token_cache': client.token_cache,
+            'coalesce': client.coalesce,
+            'identity_map': client.identity_map is not None,
+            'rate_limit': limiter.rate / self.workers if limiter.rate else None,
+            'burst': max(1, limiter.burst // self.workers),
+            'max_concurrency': max(1, limiter.max_concurrency // self.workers) if limiter.max_concurrency else None,
+        })
+        return config
+
+
+def export_shard(
+        config: Dict,
+        endpoint: str,
+        criteria: SearchCriteria,
+        shard: Shard,
+        page_size: int,
+        transform: Optional[Callable[[Model], Any]] = None,
+        path: Optional[Path] = None,
+        relations: Optional[List[str]] = None,
+) -> Union[List[Any], Path]:
+    """Retrieves and parses the items of a single shard; called in the worker processes of an :class:`ExportPipeline`
+
+    :param config: the settings to initialize a :class:`~.Client` with, from :meth:`.ExportPipeline.client_config`
+    :param endpoint: the search endpoint
+    :param criteria: the :class:`~.SearchCriteria` of the query being exported
+    :param shard: the ``(field, start, end)`` range of items to export
+    :param page_size: the number of items to request per page
+    :param transform: a function to call on each :class:`~.Model`; the raw data of each item is used if not provided
+    :param path: the path to write the results to as JSON Lines; the results are returned if not provided
+    :param relations: the relationships to :meth:`~.SearchQuery.prefetch` for each page of items
+    :returns: the transformed items, or the ``path`` if they were written to a file
+    """
+    transform = transform or (lambda item: item.data)
+    field, start, end = shard
+
+    with clients.Client.from_dict(config) as client:
+        query = client.search(endpoint).prefetch(*relations or [])
+        query.criteria = criteria.copy()
+        results = (
+            transform(item)
+            for page in query.window(start, end, field).iter_pages(page_size)
+            for item in page
+        )
+        if path is None:
+            return list(results)
+
+        tmp = Path(path).with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for result in results:
+                f.write(json.dumps(result, default=str) + '\n')
+        os.replace(tmp, path)  # Partial files are never left behind
+        return Path(path)
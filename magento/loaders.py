@@ -0,0 +1,363 @@
+from __future__ import annotations
+import asyncio
+from collections import defaultdict
+from typing import Optional, Dict, List, Tuple, Union, Callable, Iterable, Any, TYPE_CHECKING
+from .models import Model, Order, OrderItem, Invoice, InvoiceItem
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+    from . import Client, AsyncClient
+
+#: The ``(endpoint, field)`` that a batch of lookups is searched by
+LookupKind = Tuple[str, str]
+
+
+class BatchLoader:
+
+    """Loads the relationships of many :class:`~.Model` objects at once, instead of one request per object
+
+    Relationships like :attr:`.OrderItem.product` and :attr:`.Invoice.order` normally send a request
+    for each object they're accessed on. A BatchLoader collects the lookups of every object instead,
+    then sends a single :meth:`~.SearchQuery.by_list` search for each kind of lookup (products by id,
+    orders by id, customers by id, etc.), and fills the relationship's ``cached_property`` with the result
+
+    .. admonition:: Example
+       :class: example
+
+       ::
+
+        # Load the products of 5000 orders with a few requests, instead of one per item
+        >> orders = api.orders.since('2023-01-01').execute()
+        >> api.batch().load(orders, 'products')
+        >> orders[0].products  # No request is sent
+
+        # Lookups queued in the same scope share their requests
+        >> with api.batch() as loader:
+        ...     loader.queue(invoices, 'order')
+        ...     loader.queue(order_items, 'order')
+
+    **Supported Relationships**
+
+    * :class:`~.Order` - ``products``, ``customer`` and ``invoice``
+    * :class:`~.OrderItem` - ``product`` and ``order``
+    * :class:`~.Invoice` - ``order`` and ``customer``
+    * :class:`~.InvoiceItem` - ``product``
+
+    .. note:: Lookups that depend on another relationship, like the ``customer`` of an :class:`~.Invoice`,
+       are queued once that relationship has been loaded for every object, by the same :meth:`~.dispatch`
+    """
+
+    def __init__(self, client: Client):
+        """Initialize a BatchLoader
+
+        :param client: an initialized :class:`~.Client` object
+        """
+        #: The :class:`~.Client` to send the search requests with
+        self.client = client
+        #: The objects waiting on each lookup value, mapped by the kind of lookup
+        self.pending: Dict[LookupKind, Dict[str, List[Tuple[Model, str]]]] = defaultdict(lambda: defaultdict(list))
+        #: Functions to call once the pending lookups are loaded, which may queue further lookups
+        self.callbacks: List[Callable[[], Any]] = []
+
+    def __repr__(self):
+        return f'<BatchLoader: {sum(map(len, self.pending.values()))} pending lookups>'
+
+    def __enter__(self) -> BatchLoader:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.dispatch()
+
+    def load(self, models: Union[Model, Iterable[Model]], relation: str) -> List[Any]:
+        """Loads a relationship of every object, then returns the value of the relationship for each object
+
+        :param models: the objects to load the relationship of
+        :param relation: the name of the relationship, like ``"product"`` or ``"order"``
+        :returns: the value of the relationship for each object, in the same order as the ``models``
+        """
+        if not (models := self.as_list(models)):
+            return []
+
+        self.queue(models, relation)
+        self.dispatch()
+        return [getattr(model, relation) for model in models]
+
+    def load_path(self, models: Union[Model, Iterable[Model]], path: str) -> List[Any]:
+        """Loads a dotted path of relationships for every object, like ``"items.product"`` for a list of orders
+
+        Each relationship in the path is loaded for every object returned by the previous one, so that
+        each step sends one request per kind of lookup. Attributes that aren't supported relationships,
+        like :attr:`.Order.items`, are accessed normally
+
+        :param models: the objects to load the relationships of
+        :param path: the names of the relationships, separated by ``.``
+        :returns: every object at the end of the path
+        """
+        for relation in path.split('.'):
+            models = self.as_list(models)
+            if all((model.__class__, relation) in self.RELATIONS for model in models):
+                values = self.load(models, relation)
+            else:
+                values = [getattr(model, relation) for model in models]
+            models = [value for result in values for value in self.as_list(result)]
+        return models
+
+    def queue(self, models: Union[Model, Iterable[Model]], relation: str) -> Self:
+        """Queues a relationship of every object to be loaded by the next :meth:`~.dispatch`
+
+        Objects that already have the relationship loaded are skipped
+
+        :param models: the objects to load the relationship of
+        :param relation: the name of the relationship, like ``"product"`` or ``"order"``
+        :raises: :class:`ValueError` if the relationship isn't supported
+        """
+        by_class = defaultdict(list)
+        for model in self.as_list(models):
+            if relation not in model.__dict__:
+                by_class[model.__class__].append(model)
+
+        for cls, models in by_class.items():
+            if (cls, relation) not in self.RELATIONS:
+                raise ValueError(f'Unable to batch load "{relation}" for {cls.__name__} objects')
+            self.RELATIONS[(cls, relation)](self, models)
+        return self
+
+    def dispatch(self) -> None:
+        """Sends a single search request for each kind of pending lookup, then fills the relationships with the results
+
+        Any lookups queued by the :attr:`~.callbacks` are sent as well, until nothing is left to load
+        """
+        while self.pending or self.callbacks:
+            while self.pending:
+                kind, lookups = self.pending.popitem()
+                self.fill(lookups, self.search(kind, list(lookups)))
+            self.run_callbacks()
+
+    def fill(self, lookups: Dict[str, List[Tuple[Model, str]]], results: Dict[str, Model]) -> None:
+        """Fills the relationships of the objects waiting on each lookup value with the search results
+
+        :param lookups: the objects waiting on each lookup value
+        :param results: the retrieved items, mapped by their lookup value
+        """
+        for value, waiting in lookups.items():
+            for model, relation in waiting:
+                model.__dict__[relation] = results.get(value)
+
+    def run_callbacks(self) -> None:
+        """Calls the :attr:`~.callbacks` in order, stopping once one of them queues a lookup
+
+        Callbacks added by a callback are called before the remaining ones, since they continue its work
+        """
+        while self.callbacks and not self.pending:
+            callback, remaining = self.callbacks[0], self.callbacks[1:]
+            self.callbacks = []
+            callback()
+            self.callbacks.extend(remaining)
+
+    def search(self, kind: LookupKind, values: List[str]) -> Dict[str, Model]:
+        """Retrieves every item for a kind of lookup with a single :meth:`~.SearchQuery.by_list` search
+
+        :param kind: the ``(endpoint, field)`` to search by
+        :param values: the values of the ``field`` to search for
+        :returns: the retrieved items, mapped by their ``field`` value
+        """
+        endpoint, field = kind
+        query = self.client.search(endpoint)
+
+        if field == 'sku':
+            result = query.by_skulist(values)
+        else:
+            result = query.by_list(field, values)
+
+        attr = 'id' if field == 'entity_id' else field
+        return {str(getattr(item, attr)): item for item in self.as_list(result)}
+
+    def add(self, kind: LookupKind, value: Optional[Union[int, str]], model: Model, relation: str) -> None:
+        """Adds a pending lookup to fill a relationship of an object with
+
+        :param kind: the ``(endpoint, field)`` to search by
+        :param value: the value of the ``field`` to search for; the relationship is set to ``None`` if there isn't one
+        :param model: the object to fill the relationship of
+        :param relation: the name of the relationship
+        """
+        if value is None:
+            model.__dict__[relation] = None
+        else:
+            self.pending[kind][str(value)].append((model, relation))
+
+    @staticmethod
+    def as_list(models: Optional[Union[Model, Iterable[Model]]]) -> List[Model]:
+        """Returns a list of objects, given a result that could be a single object, an iterable, or ``None``"""
+        if models is None:
+            return []
+        if isinstance(models, Model):
+            return [models]
+        return list(models)
+
+    def queue_orders(self, models: List[Union[OrderItem, Invoice]]) -> None:
+        """Queues the lookups of the :class:`~.Order` of each :class:`~.OrderItem` or :class:`~.Invoice`"""
+        for model in models:
+            if isinstance(model, OrderItem) and model._order is not None:
+                model.__dict__['order'] = model._order
+            else:
+                self.add(('orders', 'entity_id'), model.order_id, model, 'order')
+
+    def queue_products(self, models: List[OrderItem]) -> None:
+        """Queues the lookups of the :class:`~.Product` of each :class:`~.OrderItem`"""
+        def add_products():
+            for model in models:
+                field, value = model.get_product_key() or ('entity_id', None)
+                self.add(('products', field), value, model, 'product')
+
+        # Configurable items with custom options need their order to find the product id
+        if waiting := [
+            model for model in models
+            if model.product_type == 'configurable' and model.extension_attributes.get('custom_options')
+        ]:
+            self.queue(waiting, 'order')
+            self.callbacks.append(add_products)
+        else:
+            add_products()
+
+    def queue_invoice_item_products(self, models: List[InvoiceItem]) -> None:
+        """Queues the lookups of the :class:`~.Product` of each :class:`~.InvoiceItem`, using its :class:`~.OrderItem`"""
+        self.queue([model.invoice for model in models], 'order')
+        self.callbacks.append(lambda: self.queue([item for model in models if (item := model.order_item)], 'product'))
+
+    def queue_order_products(self, orders: List[Order]) -> None:
+        """Queues the lookups of the :class:`~.Product` of every item of each :class:`~.Order`"""
+        self.queue([item for order in orders for item in order.items], 'product')
+
+        def fill():
+            for order in orders:
+                order.__dict__.setdefault('products', [item.product for item in order.items])
+
+        self.callbacks.append(fill)
+
+    def queue_customers(self, models: List[Union[Order, Invoice]]) -> None:
+        """Queues the lookups of the :class:`~.Customer` of each :class:`~.Order` or :class:`~.Invoice`"""
+        def add_customers():
+            for model in models:
+                order = model.order if isinstance(model, Invoice) else model
+                customer_id = order.data.get('customer_id') if order else None
+                self.add(('customers', 'entity_id'), customer_id, model, 'customer')
+
+        if models and isinstance(models[0], Invoice):
+            self.queue(models, 'order')
+            self.callbacks.append(add_customers)
+        else:
+            add_customers()
+
+    def queue_invoices(self, orders: List[Order]) -> None:
+        """Queues the lookups of the :class:`~.Invoice` of each :class:`~.Order`"""
+        for order in orders:
+            self.add(('invoices', 'order_id'), order.id, order, 'invoice')
+
+    #: The method that queues the lookups of each supported relationship, mapped by ``(Model, relation)``
+    RELATIONS: Dict[Tuple[type, str], Callable[[BatchLoader, List[Model]], None]] = {
+        (Order, 'products'): queue_order_products,
+        (Order, 'customer'): queue_customers,
+        (Order, 'invoice'): queue_invoices,
+        (OrderItem, 'product'): queue_products,
+        (OrderItem, 'order'): queue_orders,
+        (Invoice, 'order'): queue_orders,
+        (Invoice, 'customer'): queue_customers,
+        (InvoiceItem, 'product'): queue_invoice_item_products,
+    }
+
+
+class AsyncBatchLoader(BatchLoader):
+
+    """Awaitable version of the :class:`BatchLoader`, which sends its search requests with an :class:`~.AsyncClient`
+
+    Lookups are queued the same way, but :meth:`~.dispatch`, :meth:`~.load` and :meth:`~.load_path`
+    must be awaited, and the searches for each kind of lookup are sent concurrently
+
+    .. admonition:: Example
+       :class: example
+
+       ::
+
+        >> orders = await api.orders.since('2023-01-01').execute()
+        >> await api.batch().load(orders, 'products')
+
+        >> async with api.batch() as loader:
+        ...     loader.queue(invoices, 'order')
+        ...     loader.queue(order_items, 'order')
+    """
+
+    def __init__(self, client: AsyncClient):
+        """Initialize an AsyncBatchLoader
+
+        :param client: an initialized :class:`~.AsyncClient` object
+        """
+        super().__init__(client)
+        #: The :class:`~.AsyncClient` to send the search requests with
+        self.client = client
+
+    def __repr__(self):
+        return f'<AsyncBatchLoader: {sum(map(len, self.pending.values()))} pending lookups>'
+
+    async def __aenter__(self) -> AsyncBatchLoader:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            await self.dispatch()
+
+    async def load(self, models: Union[Model, Iterable[Model]], relation: str) -> List[Any]:
+        """Loads a relationship of every object, then returns the value of the relationship for each object
+
+        See :meth:`.BatchLoader.load` for details
+        """
+        if not (models := self.as_list(models)):
+            return []
+
+        self.queue(models, relation)
+        await self.dispatch()
+        return [getattr(model, relation) for model in models]
+
+    async def load_path(self, models: Union[Model, Iterable[Model]], path: str) -> List[Any]:
+        """Loads a dotted path of relationships for every object, like ``"items.product"`` for a list of orders
+
+        See :meth:`.BatchLoader.load_path` for details
+        """
+        for relation in path.split('.'):
+            models = self.as_list(models)
+            if all((model.__class__, relation) in self.RELATIONS for model in models):
+                values = await self.load(models, relation)
+            else:
+                values = [getattr(model, relation) for model in models]
+            models = [value for result in values for value in self.as_list(result)]
+        return models
+
+    async def dispatch(self) -> None:
+        """Sends the search requests for every kind of pending lookup concurrently, then fills the relationships with the results
+
+        See :meth:`.BatchLoader.dispatch` for details
+        """
+        while self.pending or self.callbacks:
+            pending = list(self.pending.items())
+            self.pending.clear()
+
+            results = await asyncio.gather(*(self.search(kind, list(lookups)) for kind, lookups in pending))
+            for (kind, lookups), result in zip(pending, results):
+                self.fill(lookups, result)
+            self.run_callbacks()
+
+    async def search(self, kind: LookupKind, values: List[str]) -> Dict[str, Model]:
+        """Retrieves every item for a kind of lookup with a single :meth:`~.SearchQuery.by_list` search
+
+        See :meth:`.BatchLoader.search` for details
+        """
+        endpoint, field = kind
+        query = self.client.search(endpoint)
+
+        if field == 'sku':
+            result = await query.by_skulist(values)
+        else:
+            result = await query.by_list(field, values)
+
+        attr = 'id' if field == 'entity_id' else field
+        return {str(getattr(item, attr)): item for item in self.as_list(result)}
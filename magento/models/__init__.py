@@ -1,6 +1,6 @@
 from .model import Model, APIResponse
 from .product import Product, MediaEntry, ProductAttribute
-from .category import Category
+from .category import Category, CategoryTree
 from .order import Order, OrderItem
 from .customer import Customer
 from .invoice import Invoice, InvoiceItem
@@ -1,5 +1,4 @@
 from __future__ import annotations
-import copy
 from . import Model, Product
 from functools import cached_property
 from magento.exceptions import MagentoError
@@ -70,10 +69,16 @@ class Category(Model):
 
     @cached_property
     def all_subcategories(self) -> Optional[List[Category]]:
-        """Recursively retrieves all descendants of the category"""
-        if not self.subcategories:
-            return []
-        children = copy.deepcopy(self.subcategories)
+        """All descendants of the category
+
+        .. tip:: Descendants are parsed from the :attr:`.Store.category_tree`, without any additional requests
+        """
+        tree = self.client.store.category_tree
+        if self.id in tree:
+            return [self.parse(tree.nodes[category_id]) for category_id in tree.descendant_ids(self.id)]
+
+        # Not in the tree of the current scope; retrieve each level of descendants instead
+        children = list(self.subcategories)
         for child in self.subcategories:
             children.extend(child.all_subcategories)
         return children
@@ -81,8 +86,21 @@ class Category(Model):
     @cached_property
     def all_subcategory_ids(self) -> List[int]:
         """The ``category_ids`` of :attr:`~.all_subcategories`"""
+        tree = self.client.store.category_tree
+        if self.id in tree:
+            return tree.descendant_ids(self.id)
         return [category.id for category in self.all_subcategories]
 
+    @cached_property
+    def parent_ids(self) -> List[int]:
+        """The ``category_ids`` of every ancestor of the category, starting from the root, from the :attr:`.Store.category_tree`"""
+        return self.client.store.category_tree.ancestor_ids(self.id)
+
+    @cached_property
+    def breadcrumbs(self) -> List[str]:
+        """The names of the categories from the root to the category, from the :attr:`.Store.category_tree`"""
+        return self.client.store.category_tree.path(self.id)
+
     @cached_property
     def products(self) -> List[Product]:
         """The :class:`~.Product` s in the category
@@ -197,3 +215,103 @@ class Category(Model):
                 f'Failed to remove {product} from {self}. Message: {MagentoError.parse(response)}'
             )
             return False
+
+
+class CategoryTree:
+
+    """An index of the category tree, built from the response of a single ``categories`` request
+
+    Looking up the descendants, ancestors, path or ids of a category takes constant time,
+    without sending any requests
+
+    .. admonition:: Example
+       :class: example
+
+       ::
+
+        # The tree is cached by the Store, and cleared by Store.refresh()
+        >> tree = api.store.category_tree
+        >> tree.descendant_ids(3)
+        [4, 5, 6]
+        >> tree.path(6)
+        ['Root Catalog', 'Default Category', 'Shoes', 'Sneakers']
+    """
+
+    def __init__(self, root: Dict):
+        """Initialize a CategoryTree
+
+        :param root: the API response from the ``categories`` endpoint, which contains every category as ``children_data``
+        """
+        #: The API response data of each category, mapped by id
+        self.nodes: Dict[int, Dict] = {}
+        #: The id of each category's parent, mapped by id
+        self.parents: Dict[int, Optional[int]] = {}
+        self._children: Dict[int, List[int]] = {}
+        self._descendants: Dict[int, List[int]] = {}
+        self._ancestors: Dict[int, List[int]] = {}
+
+        stack = [(root, None)] if root else []
+        order = []
+        while stack:  # Depth-first, so descendants are listed in tree order
+            node, parent_id = stack.pop()
+            category_id = node['id']
+            self.nodes[category_id] = node
+            self.parents[category_id] = parent_id
+            self._children[category_id] = [child['id'] for child in node.get('children_data') or []]
+            self._ancestors[category_id] = self._ancestors[parent_id] + [parent_id] if parent_id is not None else []
+            order.append(category_id)
+            stack.extend((child, category_id) for child in reversed(node.get('children_data') or []))
+
+        for category_id in reversed(order):  # Children before parents
+            self._descendants[category_id] = [
+                descendant for child in self._children[category_id]
+                for descendant in [child] + self._descendants[child]
+            ]
+
+    def __repr__(self):
+        return f'<CategoryTree: {len(self)} categories>'
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, category_id: int):
+        return category_id in self.nodes
+
+    def children(self, category_id: int) -> List[int]:
+        """Returns the ids of a category's direct children
+
+        :param category_id: the id of the category
+        """
+        return self._children.get(category_id, [])
+
+    def descendant_ids(self, category_id: int) -> List[int]:
+        """Returns the ids of every descendant of a category, in tree order
+
+        :param category_id: the id of the category
+        """
+        return self._descendants.get(category_id, [])
+
+    def ancestor_ids(self, category_id: int) -> List[int]:
+        """Returns the ids of every ancestor of a category, starting from the root
+
+        :param category_id: the id of the category
+        """
+        return self._ancestors.get(category_id, [])
+
+    def path(self, category_id: int) -> List[str]:
+        """Returns the names of the categories from the root to a category
+
+        :param category_id: the id of the category
+        """
+        if category_id not in self:
+            return []
+        return [self.nodes[ancestor]['name'] for ancestor in self.ancestor_ids(category_id) + [category_id]]
+
+    def id_set(self, category_id: int) -> Set[int]:
+        """Returns the ids of a category and all of its descendants
+
+        :param category_id: the id of the category
+        """
+        if category_id not in self:
+            return set()
+        return {category_id, *self.descendant_ids(category_id)}
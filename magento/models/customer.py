@@ -109,6 +109,7 @@ class Customer(Model):
         if not isinstance(orders, list):
             orders = [orders]
 
+        self.client.batch().load(orders, 'products')  # Retrieve the products of every order together
         for order in orders:
             if exclude_cancelled:
                 products.extend(
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING, Optional, List, Union
+from typing import TYPE_CHECKING, Optional, List, Union, Tuple
 from functools import cached_property
 from . import Model
 import copy
@@ -60,7 +60,15 @@ class Order(Model):
 
            If both entries are needed, the unparsed response is in the :attr:`~.data` dict
         """
-        return [OrderItem(item, order=self) for item in self.__items if item.get('parent_item') is None]
+        items = [OrderItem(item, order=self) for item in self.__items if item.get('parent_item') is None]
+        if (identity_map := self.client.identity_map) is None:
+            return items
+
+        items = [identity_map.merge(item) for item in items]
+        for item in items:
+            if item._order is None:  # Parsed from an order items search
+                item._order = self
+        return items
 
     @cached_property
     def item_ids(self) -> List[int]:
@@ -69,15 +77,24 @@ class Order(Model):
 
     @cached_property
     def products(self) -> List[Product]:
-        """The ordered :attr:`~items`, returned as their corresponding :class:`~.Product` objects"""
-        return [item.product for item in self.items]
+        """The ordered :attr:`~items`, returned as their corresponding :class:`~.Product` objects
+
+        .. tip:: The products of every item are retrieved together, using a :class:`~.BatchLoader`
+        """
+        return self.client.batch().load(self.items, 'product')
 
     def get_invoice(self) -> Invoice:
         """Retrieve the :class:`~.Invoice` of the Order"""
         return self.client.invoices.by_order(self)
 
-    @property
+    @cached_property
+    def invoice(self) -> Invoice:
+        """The :class:`~.Invoice` of the Order, from :meth:`~.get_invoice`"""
+        return self.get_invoice()
+
+    @cached_property
     def customer(self) -> Customer:
+        """The :class:`~.Customer` that placed the Order, if they have an account"""
         return self.client.customers.by_order(self)
 
     @property
@@ -243,16 +260,27 @@ class OrderItem(Model):
            * Is a configurable product - the child simple product is returned
            * Has custom options - the base product is returned
         """
+        if key := self.get_product_key():
+            field, value = key
+            if field == 'sku':
+                return self.client.products.by_sku(value)
+            return self.client.products.by_id(value)
+
+    def get_product_key(self) -> Optional[Tuple[str, Union[int, str]]]:
+        """Returns the field and value to retrieve the item's corresponding :attr:`~.product` by
+
+        :returns: either ``("entity_id", product_id)`` or ``("sku", sku)``
+        """
         if self.product_type != 'configurable':
-            return self.client.products.by_id(self.product_id)
+            return 'entity_id', self.__product_id
 
         if not self.extension_attributes.get('custom_options'):
-            return self.client.products.by_sku(self.sku)
+            return 'sku', self.sku
 
         # Configurable + Custom Options -> configurable product id & unsearchable option sku
         for item in self.order.data['items']:  # Get simple product id from response data
             if item.get('parent_item_id') == self.item_id:
-                return self.client.products.by_id(item['product_id'])
+                return 'entity_id', item['product_id']
 
     @cached_property
     def product_id(self) -> int:
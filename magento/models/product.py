@@ -606,8 +606,8 @@ class MediaEntry(Model):
         if filename is None:
             filename = Path(self.file).name
 
-        try:
-            response = requests.get(self.link)
+        try:  # Uses the client's retry policy, rate limiter and current deadline
+            response = self.client.send('GET', self.link, headers={'User-Agent': self.client.user_agent})
             response.raise_for_status()
 
         except requests.RequestException as e:
@@ -1,14 +1,113 @@
 from __future__ import annotations
-import re
+import copy
+import math
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from itertools import islice
 from functools import cached_property
-from typing import Union, Type, Iterable, List, Optional, Dict, TYPE_CHECKING
-from .models import Model, APIResponse, Product, Category, ProductAttribute, Order, OrderItem, Invoice, Customer
+from typing import Union, Type, Iterable, Iterator, AsyncIterator, List, Optional, Dict, Tuple, Set, TYPE_CHECKING
+from .models import Model, APIResponse, Product, Category, CategoryTree, ProductAttribute, Order, OrderItem, Invoice, Customer
 from .exceptions import MagentoError
 from . import clients
 
 if TYPE_CHECKING:
     from typing_extensions import Self
-    from . import Client
+    from . import Client, AsyncClient
+
+
+class SearchCriteria:
+
+    """The ``searchCriteria`` of a :class:`SearchQuery`, along with any other query parameters of the request
+
+    Filter groups, sort orders, pagination settings and response fields are stored separately,
+    then rendered into URL query parameters once the search request is sent
+    """
+
+    def __init__(self):
+        """Initialize an empty SearchCriteria object"""
+        #: Filters mapped by their group number, then their filter number within the group
+        self.filter_groups: Dict[int, Dict[int, Dict[str, str]]] = {}
+        #: Sort orders, as ``(field, direction)`` tuples
+        self.sort_orders: List[Tuple[str, str]] = []
+        #: The number of items to request per page
+        self.page_size: Optional[int] = None
+        #: The page number to request
+        self.current_page: Optional[int] = None
+        #: Comma separated fields to restrict each item in the response to
+        self.fields: Optional[str] = None
+        #: Additional query parameters, which aren't part of the ``searchCriteria``
+        self.params: Dict[str, str] = {}
+        #: The filter group of the most recently added filter, or ``-1`` if none have been added
+        self.last_group: int = -1
+
+    def __repr__(self):
+        return f'<SearchCriteria: {self.render()}>'
+
+    def copy(self) -> SearchCriteria:
+        """Returns a copy of the criteria, which can be modified without affecting the original"""
+        criteria = copy.copy(self)
+        criteria.filter_groups = {
+            group: {index: dict(f) for index, f in filters.items()}
+            for group, filters in self.filter_groups.items()
+        }
+        criteria.sort_orders = list(self.sort_orders)
+        criteria.params = dict(self.params)
+        return criteria
+
+    def add_filter(self, field: str, value, condition: str = 'eq', group: Optional[int] = None, index: int = 0) -> None:
+        """Adds a filter to a filter group
+
+        :param field: the API response field to filter by
+        :param value: the value of the field to compare
+        :param condition: the comparison condition
+        :param group: the filter group number; uses a new group if not provided
+        :param index: the filter number within the group
+        """
+        if group is None:
+            group = self.last_group + 1
+
+        self.filter_groups.setdefault(group, {})[index] = {
+            'field': field,
+            'value': value,
+            'condition_type': condition
+        }
+        self.last_group = group
+
+    def add_sort_order(self, field: str, direction: str = 'ASC') -> None:
+        """Adds a sort order, which applies after any that were added previously
+
+        :param field: the API response field to sort by
+        :param direction: the sort direction; either ``ASC`` or ``DESC``
+        """
+        self.sort_orders.append((field, direction.upper()))
+
+    def render(self, page_size: Optional[int] = None, current_page: Optional[int] = None, total_count: bool = False) -> str:
+        """Renders the criteria as URL query parameters
+
+        :param page_size: the number of items per page, overriding the :attr:`~.page_size`
+        :param current_page: the page number to request, overriding the :attr:`~.current_page`
+        :param total_count: whether to add the ``total_count`` to restricted :attr:`~.fields`
+        """
+        params = [
+            f'searchCriteria[filter_groups][{group}][filters][{index}][{key}]={value}'
+            for group, filters in self.filter_groups.items()
+            for index, criteria in filters.items()
+            for key, value in criteria.items()
+        ]
+        for i, (field, direction) in enumerate(self.sort_orders):
+            params.append(f'searchCriteria[sortOrders][{i}][field]={field}')
+            params.append(f'searchCriteria[sortOrders][{i}][direction]={direction}')
+
+        if page_size := page_size or self.page_size:
+            params.append(f'searchCriteria[pageSize]={page_size}')
+        if current_page := current_page or self.current_page:
+            params.append(f'searchCriteria[currentPage]={current_page}')
+
+        params.extend(f'{key}={value}' for key, value in self.params.items())
+
+        if self.fields:
+            params.append(f'fields=items[{self.fields}]' + (',total_count' if total_count else ''))
+        return '&'.join(params)
 
 
 class SearchQuery:
@@ -16,8 +115,17 @@ class SearchQuery:
     """Queries any endpoint that invokes the searchCriteria interface. Parent of all endpoint-specific search classes
 
     .. tip:: See https://developer.adobe.com/commerce/webapi/rest/use-rest/performing-searches/ for official docs
+
+    :cvar MAX_URL_LENGTH: the maximum length of a search request URL; longer :meth:`~.by_list` searches are split into chunks
+    :cvar CHUNK_WORKERS: the maximum number of chunks of a :meth:`~.by_list` search to request concurrently
+    :cvar KEYSET_FIELD: a unique, sortable field of the endpoint, used as the default field to paginate by in :meth:`~.iter_keyset`
+        and to break ties between sorted results; ``None`` if the endpoint doesn't have a known one
     """
 
+    MAX_URL_LENGTH = 2048
+    CHUNK_WORKERS = 4
+    KEYSET_FIELD = None
+
     def __init__(self, endpoint: str, client: Client, model: Type[Model] = APIResponse):
         """Initialize a SearchQuery object
 
@@ -34,10 +142,16 @@ class SearchQuery:
         self.endpoint = endpoint
         #: :doc:`models` class to wrap the response with
         self.Model = model
-        #: The current url for the search request
-        self.query = self.client.url_for(endpoint) + '/?'
-        #: Restricted fields, from :meth:`~.restrict_fields`
-        self.fields = ''
+        #: The endpoint to send the search request to, which is usually the same as the :attr:`~.endpoint`
+        self.path = endpoint
+        #: The id of the item to retrieve, from :meth:`~.by_id`
+        self.item_id = None
+        #: The :class:`SearchCriteria` of the search request
+        self.criteria = SearchCriteria()
+        #: The last value of the ``field`` retrieved by :meth:`~.iter_keyset`, which can be used to resume it
+        self.cursor = None
+        #: The relationships to load for every item in the results, from :meth:`~.prefetch`
+        self.relations: List[str] = []
         #: The raw response data, if any
         self._result = {}
 
@@ -93,23 +207,82 @@ class SearchQuery:
                 Group 0 Filter 0 + Group 1 Filter 0     ->      Filter 0 AND Filter 0
         """
 
-        options = {
-            'condition': condition,
-            'group': self.last_group + 1,
-            'filter': 0,
-        }
-        options.update(kwargs)
-
-        criteria = (
-                f'searchCriteria[filter_groups][{options["group"]}][filters][{options["filter"]}][field]={field}' +
-                f'&searchCriteria[filter_groups][{options["group"]}][filters][{options["filter"]}][value]={value}' +
-                f'&searchCriteria[filter_groups][{options["group"]}][filters][{options["filter"]}][condition_type]={options["condition"]}'
+        self.criteria.add_filter(
+            field=field,
+            value=value,
+            condition=condition,
+            group=kwargs.get('group'),
+            index=kwargs.get('filter', 0)
         )
-        if not self.query.endswith('?'):
-            self.query += '&'
-        self.query += criteria
         return self
 
+    def sort_by(self, field: str, direction: str = 'ASC') -> Self:
+        """Sort the search results by a field
+
+        Calling multiple times sorts by each field in order, so later fields are only used to break ties
+
+        .. admonition:: Example
+           :class: example
+
+           ::
+
+            # Retrieve pending orders, newest first
+            >> orders = api.orders.add_criteria('status', 'pending').sort_by('created_at', 'DESC').execute()
+
+            # Sort by customer, then by date
+            >> orders = api.orders.sort_by('customer_email').sort_by('created_at').execute()
+
+        .. tip:: When paginating with :meth:`~.iter_pages`, the :attr:`~.KEYSET_FIELD` (if the endpoint has one)
+           is added as a final sort order to break any ties, so items can't be skipped or duplicated between pages
+
+        :param field: the API response field to sort by
+        :param direction: the sort direction; either ``ASC`` or ``DESC``
+        :returns: the calling SearchQuery object
+        """
+        if direction.upper() not in ('ASC', 'DESC'):
+            raise ValueError('`direction` must be either "ASC" or "DESC"')
+
+        self.criteria.add_sort_order(field, direction)
+        return self
+
+    def prefetch(self, *relations: str) -> Self:
+        """Loads relationships of every item in the results together, instead of one request per item
+
+        Each time a page of results is parsed, every relationship is loaded for the whole page
+        by a :class:`~.BatchLoader`, using one request per kind of lookup
+
+        .. admonition:: Example
+           :class: example
+
+           ::
+
+            # Retrieve orders along with their products, customers and invoices
+            >> orders = api.orders.since('2023-01-01').prefetch('items.product', 'customer', 'invoice').execute()
+            >> orders[0].customer  # No request is sent
+
+            # Works with paginated searches too
+            >> for page in api.invoices.prefetch('order', 'items.product').iter_pages():
+            ...     report(page)
+
+        .. note:: An :class:`AsyncSearchQuery` awaits the relationships with an :class:`~.AsyncBatchLoader` instead
+
+        :param relations: the names of the relationships to load; nested relationships
+            are separated by ``.``, like ``"items.product"``
+        :returns: the calling SearchQuery object
+        """
+        self.relations.extend(relations)
+        return self
+
+    def load_relations(self, models: List[Optional[Model]]) -> None:
+        """Loads the :attr:`~.relations` from :meth:`~.prefetch` for a list of parsed items
+
+        :param models: the parsed items
+        """
+        if self.relations and (models := [model for model in models if model]):
+            loader = self.client.batch()
+            for relation in self.relations:
+                loader.load_path(models, relation)
+
     def restrict_fields(self, fields: Iterable[str]) -> Self:
         """Constrain the API response data to only contain the specified fields
 
@@ -124,7 +297,7 @@ class SearchQuery:
         if (id_field := self.Model.IDENTIFIER) not in fields:
             fields += f',{id_field}'
 
-        self.fields = f'&fields=items[{fields}]'
+        self.criteria.fields = fields
         return self
 
     def execute(self) -> Optional[Model | List[Model]]:
@@ -135,11 +308,51 @@ class SearchQuery:
 
         :returns: the search query :attr:`~.result`
         """
-        response = self.client.get(self.query + self.fields)
+        response = self.client.get(self.query)
         self.__dict__.pop('result', None)
         self._result = response.json()
         return self.result
 
+    def count(self) -> int:
+        """Returns the number of items that match the search criteria, without retrieving them
+
+        Only the ``total_count`` is requested, so the cost doesn't depend on the number of matching items
+
+        .. admonition:: Example
+           :class: example
+
+           ::
+
+            # Count the orders that are still pending
+            >> api.orders.add_criteria('status', 'pending').count()
+            12
+
+        .. note:: Unlike :attr:`~.result_count`, the :attr:`~.result` is not affected
+
+        :raises: :class:`~.MagentoError` if the request fails
+        """
+        response = self.client.get(self.count_url())
+        if not response.ok:
+            raise MagentoError(self.client, 'Failed to retrieve the number of search results', response)
+        return self.parse_count(response.json())
+
+    def count_url(self) -> str:
+        """Returns the url to request only the ``total_count`` of the search results with"""
+        criteria = self.criteria.copy()
+        criteria.fields = None
+        criteria.params['fields'] = 'total_count'
+        return self.get_url(page_size=1, current_page=1, criteria=criteria)
+
+    @staticmethod
+    def parse_count(data: Dict | List[Dict]) -> int:
+        """Returns the ``total_count`` from the raw response data of a :meth:`~.count` request
+
+        :param data: the response data
+        """
+        if isinstance(data, list):  # Endpoint doesn't support pagination
+            return len(data)
+        return data.get('total_count', 0)
+
     def by_id(self, item_id: Union[int, str]) -> Optional[Model]:
         """Retrieve data for an individual item by its id
 
@@ -154,7 +367,7 @@ class SearchQuery:
 
         :param item_id: id of the item to retrieve
         """
-        self.query = self.query.strip('?') + str(item_id)
+        self.item_id = item_id
         return self.execute()
 
     def by_list(self, field: str, values: Iterable) -> Optional[Model, List[Model]]:
@@ -174,6 +387,9 @@ class SearchQuery:
             >> api.orders.by_list('status', 'processing,pending,completed')
 
 
+        .. note:: If the search request URL would be longer than the :attr:`~.MAX_URL_LENGTH`, the values
+           are split into chunks, which are requested concurrently and merged into a single :attr:`~.result`
+
         :param field: the API response field to search for matches in
         :param values: an iterable or comma separated string of values
         """
@@ -181,19 +397,329 @@ class SearchQuery:
             raise TypeError('`values` must be an iterable')
         if not isinstance(values, str):
             values = ','.join(f'{value}' for value in values)
-        return self.add_criteria(
+
+        self.add_criteria(
             field=field,
             value=values,
             condition='in'
-        ).execute()
+        )
+        if len(self.query) <= self.MAX_URL_LENGTH:
+            return self.execute()
+        return self.execute_chunks(self.chunk_urls(values.split(',')))
+
+    def chunk_urls(self, values: List[str]) -> List[str]:
+        """Splits the values of the most recent filter into chunks that keep the request URL within the :attr:`~.MAX_URL_LENGTH`
+
+        :param values: the values of the filter
+        :returns: the request URL for each chunk
+        """
+        criteria = self.criteria.filter_groups[self.last_group][0]
+        budget = self.MAX_URL_LENGTH - (len(self.query) - len(criteria['value']))
+        chunks, chunk, length = [], [], -1
+
+        for value in values:
+            if chunk and length + len(value) + 1 > budget:
+                chunks.append(chunk)
+                chunk, length = [], -1
+            chunk.append(value)
+            length += len(value) + 1
+        chunks.append(chunk)
+
+        urls = []
+        for chunk in chunks:
+            criteria['value'] = ','.join(chunk)
+            urls.append(self.query)
+
+        criteria['value'] = ','.join(values)
+        return urls
+
+    def execute_chunks(self, urls: List[str]) -> Optional[Model | List[Model]]:
+        """Sends the search request for each chunk of a :meth:`~.by_list` search concurrently, then merges the responses
+
+        :param urls: the request URLs from :meth:`~.chunk_urls`
+        :returns: the search query :attr:`~.result`
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        get_chunk = self.client.bind_deadline(self.get_chunk)  # Workers share the caller's deadline
+
+        with ThreadPoolExecutor(max_workers=min(len(urls), self.CHUNK_WORKERS)) as executor:
+            self.merge_chunks(list(executor.map(get_chunk, urls)))
+        return self.result
+
+    def get_chunk(self, url: str) -> Dict:
+        """Requests a single chunk of a :meth:`~.by_list` search and returns the raw response data
+
+        :param url: the request URL of the chunk
+        :raises: :class:`~.MagentoError` if the request fails
+        """
+        response = self.client.get(url)
+        if not response.ok:
+            raise MagentoError(self.client, 'Failed to retrieve a chunk of the search results', response)
+        return response.json()
+
+    def merge_chunks(self, responses: List[Dict]) -> None:
+        """Merges the responses of each chunk of a :meth:`~.by_list` search into the raw :attr:`~.result` data
+
+        Items are de-duplicated by the :attr:`~.Model.IDENTIFIER` of the :attr:`~.Model`
+
+        :param responses: the raw response data of each chunk
+        """
+        items, seen = [], set()
+
+        for response in responses:
+            for item in response.get('items') or []:
+                if (uid := item.get(self.Model.IDENTIFIER)) is not None:
+                    if uid in seen:
+                        continue
+                    seen.add(uid)
+                items.append(item)
+
+        self.__dict__.pop('result', None)
+        self._result = {'items': items, 'total_count': len(items)}
 
     def get_all(self) -> Optional[Model, List[Model]]:
         """Retrieve all items for the given search endpoint.
 
         .. warning:: Not guaranteed to work with all endpoints.
+
+        .. tip:: For large result sets, use :meth:`~.iter_items` or :meth:`~.iter_pages` instead
         """
         return self.since().execute()
 
+    def iter_pages(self, page_size: int = 100, workers: int = 1) -> Iterator[List[Model]]:
+        """Sends the search request one page at a time, yielding the parsed items of each page
+
+        The ``total_count`` of the first response is used to determine how many pages to request,
+        so only a single page of results is held in memory at a time
+
+        .. admonition:: Example
+           :class: example
+
+           ::
+
+            # Retrieve all orders from 2023, 250 at a time
+            >> for page in api.orders.since('2023-01-01').iter_pages(page_size=250):
+            ...     print(len(page))
+
+        .. tip:: Use ``workers`` to request the remaining pages concurrently once the ``total_count`` is known
+
+           * Pages are still yielded in order
+           * At most ``workers`` pages are requested or waiting to be consumed at any time
+
+        .. note:: Pages are requested separately from :meth:`~.execute`, so the :attr:`~.result` is not affected
+
+        :param page_size: the number of items to request per page
+        :param workers: the maximum number of pages to request concurrently
+        :returns: a generator that yields each page as a list of :class:`~.Model` objects
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        if page_size < 1:
+            raise ValueError('`page_size` must be a positive integer')
+        if workers < 1:
+            raise ValueError('`workers` must be a positive integer')
+
+        response = self.get_page(1, page_size)
+        if isinstance(response, list):  # Endpoint doesn't support pagination
+            yield self.parse_items(response)
+            return
+
+        yield self.parse_items(response.get('items') or [])
+        pages = range(2, math.ceil(response.get('total_count', 0) / page_size) + 1)
+
+        if workers == 1 or len(pages) < 2:
+            for page in pages:
+                items = self.get_page(page, page_size).get('items')
+                if not items:
+                    break
+                yield self.parse_items(items)
+            return
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        get_page = self.client.bind_deadline(self.get_page)  # Workers share the caller's deadline
+        pages = iter(pages)
+        pending = deque(
+            executor.submit(get_page, page, page_size)
+            for page in islice(pages, workers)
+        )
+        try:
+            while pending:
+                items = pending.popleft().result().get('items')
+                if not items:
+                    break
+                if (page := next(pages, None)) is not None:
+                    pending.append(executor.submit(get_page, page, page_size))
+                yield self.parse_items(items)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_items(self, page_size: int = 100, workers: int = 1) -> Iterator[Model]:
+        """Sends the search request one page at a time, yielding the parsed items individually
+
+        .. admonition:: Example
+           :class: example
+
+           ::
+
+            # Iterate over every product without loading the full catalog into memory
+            >> for product in api.products.iter_items():
+            ...     print(product.sku)
+
+        :param page_size: the number of items to request per page
+        :param workers: the maximum number of pages to request concurrently
+        :returns: a generator that yields each :class:`~.Model` from :meth:`~.iter_pages`
+        """
+        for page in self.iter_pages(page_size, workers):
+            yield from page
+
+    def iter_keyset(self, page_size: int = 100, field: Optional[str] = None, start_after=None) -> Iterator[List[Model]]:
+        """Sends the search request one page at a time using keyset pagination, yielding the parsed items of each page
+
+        Instead of requesting each page by number, which gets slower for every page on large tables,
+        each page is requested by filtering for items where ``field > cursor``, sorted by ``field`` in ascending order
+
+        * The :attr:`~.cursor` is updated before each page is yielded, so the scan can be resumed
+          from the last page that was processed by passing it as ``start_after``
+
+        .. admonition:: Example
+           :class: example
+
+           ::
+
+            # Export all orders, saving the cursor after each page
+            >> orders = api.orders
+            >> for page in orders.iter_keyset(page_size=500, start_after=load_cursor()):
+            ...     export(page)
+            ...     save_cursor(orders.cursor)
+
+        .. note:: Any sort orders of the query are replaced with the ``field``, since it determines the order of the pages
+
+        :param page_size: the number of items to request per page
+        :param field: a unique, sortable field to paginate by; uses the :attr:`~.KEYSET_FIELD` if not provided
+        :param start_after: the ``field`` value to start after, like a :attr:`~.cursor` from a previous scan
+        :returns: a generator that yields each page as a list of :class:`~.Model` objects
+        :raises: :class:`ValueError` if no ``field`` is provided and the endpoint has no :attr:`~.KEYSET_FIELD`
+        """
+        if page_size < 1:
+            raise ValueError('`page_size` must be a positive integer')
+
+        field = self.get_keyset_field(field)
+        self.cursor = start_after
+
+        while True:
+            items = self.get_keyset_page(field, self.cursor, page_size).get('items')
+            if not items:
+                return
+
+            if (cursor := self.keyset_value(items[-1], field)) is None:
+                raise ValueError(f'Unable to paginate by "{field}", since it\'s missing from the response data')
+            self.cursor = cursor
+            yield self.parse_items(items)
+
+            if len(items) < page_size:
+                return
+
+    def get_keyset_field(self, field: Optional[str] = None) -> str:
+        """Returns the ``field`` to paginate by, or the :attr:`~.KEYSET_FIELD` if one isn't provided
+
+        :param field: a unique, sortable field to paginate by
+        :raises: :class:`ValueError` if no ``field`` is provided and the endpoint has no :attr:`~.KEYSET_FIELD`
+        """
+        if field := field or self.KEYSET_FIELD:
+            return field
+        raise ValueError(f'A unique, sortable `field` must be provided for the "{self.endpoint}" endpoint')
+
+    def get_keyset_page(self, field: str, cursor, page_size: int) -> Dict:
+        """Requests the page of search results that comes after the ``cursor`` and returns the raw response data
+
+        :param field: the field to paginate by
+        :param cursor: the last ``field`` value of the previous page, or ``None`` to request the first page
+        :param page_size: the number of items per page
+        :raises: :class:`~.MagentoError` if the request fails
+        """
+        response = self.client.get(self.keyset_url(field, cursor, page_size))
+        if not response.ok:
+            raise MagentoError(self.client, f'Failed to retrieve the search results after {field}={cursor}', response)
+        return response.json()
+
+    def keyset_url(self, field: str, cursor, page_size: int) -> str:
+        """Returns the url to request the page of search results that comes after the ``cursor`` with
+
+        :param field: the field to paginate by
+        :param cursor: the last ``field`` value of the previous page, or ``None`` to request the first page
+        :param page_size: the number of items per page
+        """
+        criteria = self.criteria.copy()
+        criteria.sort_orders = [(field, 'ASC')]
+
+        if cursor is not None:
+            criteria.add_filter(field, cursor, 'gt')
+        return self.get_url(page_size=page_size, current_page=1, criteria=criteria)
+
+    def keyset_value(self, item: Dict, field: str):
+        """Returns the value of the field being paginated by in :meth:`~.iter_keyset` from raw item data
+
+        .. note:: Some endpoints, like ``products`` and ``customers``, are filtered by ``entity_id``
+           but return it in the response as ``id``
+
+        :param item: API response data of a single item
+        :param field: the field to paginate by
+        """
+        if field == 'entity_id' and field not in item:
+            return item.get('id')
+        return item.get(field)
+
+    def get_page(self, page: int, page_size: int) -> Dict | List[Dict]:
+        """Requests a single page of search results and returns the raw response data
+
+        :param page: the page number to request, starting from ``1``
+        :param page_size: the number of items per page
+        :raises: :class:`~.MagentoError` if the request fails
+        """
+        response = self.client.get(self.page_url(page, page_size))
+        if not response.ok:
+            raise MagentoError(self.client, f'Failed to retrieve page {page} of the search results', response)
+        return response.json()
+
+    def page_url(self, page: int, page_size: int) -> str:
+        """Returns the url to request a single page of search results with
+
+        If the query is sorted and the endpoint has a :attr:`~.KEYSET_FIELD`, it's used to break ties,
+        so that the order of the results is the same for every page
+
+        :param page: the page number to request, starting from ``1``
+        :param page_size: the number of items per page
+        """
+        criteria = self.criteria
+        if self.KEYSET_FIELD and criteria.sort_orders and self.KEYSET_FIELD not in (field for field, _ in criteria.sort_orders):
+            criteria = criteria.copy()
+            criteria.add_sort_order(self.KEYSET_FIELD)
+
+        # The total_count is needed to determine the number of pages
+        return self.get_url(page_size=page_size, current_page=page, total_count=True, criteria=criteria)
+
+    @property
+    def query(self) -> str:
+        """The current url for the search request"""
+        return self.get_url()
+
+    def get_url(self, page_size: Optional[int] = None, current_page: Optional[int] = None,
+                total_count: bool = False, criteria: Optional[SearchCriteria] = None) -> str:
+        """Renders the url for the search request, using the current :attr:`~.criteria`
+
+        :param page_size: the number of items per page, overriding the :attr:`~.criteria`
+        :param current_page: the page number to request, overriding the :attr:`~.criteria`
+        :param total_count: whether to include the ``total_count`` if the response fields are restricted
+        :param criteria: the :class:`SearchCriteria` to render instead of the current :attr:`~.criteria`
+        """
+        params = (criteria or self.criteria).render(page_size, current_page, total_count)
+        if self.item_id is None:
+            return self.client.url_for(self.path) + '/?' + params
+
+        url = self.client.url_for(f'{self.path}/{self.item_id}')
+        return url + '?' + params if params else url
+
     def since(self, sinceDate: str = None) -> Self:
         """Retrieve items for which ``created_at >= sinceDate``
 
@@ -233,6 +759,187 @@ class SearchQuery:
             group=self.last_group + 1,
         )
 
+    def partition(self, start: str | datetime, end: Optional[str | datetime] = None, max_items: int = 10000,
+                  field: str = 'created_at', workers: int = 4) -> List[Tuple[str, str]]:
+        """Splits a date range into windows that each contain at most ``max_items`` matching items
+
+        The range is split in half until each window is small enough, using :meth:`~.count`
+        to check the size of each window. Windows with no matching items are skipped
+
+        .. admonition:: Example
+           :class: example
+
+           ::
+
+            # Split every order since 2015 into windows of at most 5000 orders
+            >> api.orders.partition('2015-01-01', max_items=5000)
+            [('2015-01-01 00:00:00', '2017-08-08 12:00:00'), ('2017-08-08 12:00:00', '2018-11-23 06:00:00'), ...]
+
+        .. note:: A window that spans a single second can't be split, so it may contain more than ``max_items``
+
+        :param start: the date to start from (inclusive)
+        :param end: the date to end at (exclusive); uses the current time if not provided
+        :param max_items: the maximum number of items per window
+        :param field: the date field to partition by
+        :param workers: the maximum number of windows to :meth:`~.count` concurrently
+        :returns: the ``(start, end)`` dates of each window, in order
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        if max_items < 1:
+            raise ValueError('`max_items` must be a positive integer')
+        if workers < 1:
+            raise ValueError('`workers` must be a positive integer')
+
+        count_window = self.client.bind_deadline(self.count_window)  # Workers share the caller's deadline
+        windows, pending = [], [self.get_bounds(start, end)]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while pending:
+                counts = list(executor.map(lambda window: count_window(*window, field), pending))
+                done, pending = self.split_windows(pending, counts, max_items)
+                windows.extend(done)
+
+        return [tuple(map(self.format_date, window)) for window in sorted(windows)]
+
+    def iter_windows(self, start: str | datetime, end: Optional[str | datetime] = None, max_items: int = 10000,
+                     field: str = 'created_at', page_size: int = 100, workers: int = 4) -> Iterator[List[Model]]:
+        """Retrieves every item in a date range, requesting the windows from :meth:`~.partition` concurrently
+
+        Splitting the range into windows keeps the number of pages per window small, and lets
+        ``workers`` connections share the export instead of paging through the full range on one
+
+        .. admonition:: Example
+           :class: example
+
+           ::
+
+            # Export every order since 2015 over 4 connections
+            >> for items in api.orders.iter_windows('2015-01-01', max_items=5000, workers=4):
+            ...     export(items)
+
+        .. tip:: Windows are still yielded in order, and at most ``workers`` windows are requested
+           or waiting to be consumed at any time
+
+        .. note:: Windows are requested separately from :meth:`~.execute`, so the :attr:`~.result` is not affected
+
+        :param start: the date to start from (inclusive)
+        :param end: the date to end at (exclusive); uses the current time if not provided
+        :param max_items: the maximum number of items per window
+        :param field: the date field to partition by
+        :param page_size: the number of items to request per page of each window
+        :param workers: the maximum number of windows to request concurrently
+        :returns: a generator that yields the items of each window as a list of :class:`~.Model` objects
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        windows = iter(self.partition(start, end, max_items, field, workers))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        get_window = self.client.bind_deadline(self.get_window)  # Workers share the caller's deadline
+        pending = deque(
+            executor.submit(get_window, *window, field, page_size)
+            for window in islice(windows, workers)
+        )
+        try:
+            while pending:
+                items = pending.popleft().result()
+                if (window := next(windows, None)) is not None:
+                    pending.append(executor.submit(get_window, *window, field, page_size))
+                yield items
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def window(self, start: str | datetime, end: str | datetime, field: str = 'created_at') -> Self:
+        """Returns a copy of the search query, restricted to items for which ``start <= field < end``
+
+        :param start: the date to start from (inclusive)
+        :param end: the date to end at (exclusive)
+        :param field: the date field to filter by
+        """
+        query = copy.copy(self)
+        query.__dict__.pop('result', None)
+        query._result = {}
+        query.criteria = self.criteria.copy()
+        query.relations = list(self.relations)
+        query.add_criteria(field, self.format_date(start), 'gteq', group=query.last_group + 1)
+        return query.add_criteria(field, self.format_date(end), 'lt', group=query.last_group + 1)
+
+    def count_window(self, start: datetime, end: datetime, field: str) -> int:
+        """Returns the number of items in a window of :meth:`~.partition`
+
+        :param start: the date the window starts from (inclusive)
+        :param end: the date the window ends at (exclusive)
+        :param field: the date field to partition by
+        """
+        return self.window(start, end, field).count()
+
+    def get_window(self, start: str, end: str, field: str, page_size: int) -> List[Model]:
+        """Retrieves every item in a window of :meth:`~.partition`
+
+        :param start: the date the window starts from (inclusive)
+        :param end: the date the window ends at (exclusive)
+        :param field: the date field to partition by
+        :param page_size: the number of items to request per page
+        """
+        return [item for page in self.window(start, end, field).iter_pages(page_size) for item in page]
+
+    @classmethod
+    def get_bounds(cls, start: str | datetime, end: Optional[str | datetime] = None) -> Tuple[datetime, datetime]:
+        """Parses the ``start`` and ``end`` dates of a range to :meth:`~.partition`
+
+        :param start: the date to start from (inclusive)
+        :param end: the date to end at (exclusive); uses the current time if not provided
+        """
+        start = cls.parse_date(start)
+        # Dates are stored in UTC; round up, since the end is exclusive
+        end = cls.parse_date(end) if end else datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0) + timedelta(seconds=1)
+        if end <= start:
+            raise ValueError('`end` must be after `start`')
+        return start, end
+
+    @staticmethod
+    def split_windows(windows: List[Tuple[datetime, datetime]], counts: List[int],
+                      max_items: int) -> Tuple[List[Tuple[datetime, datetime]], List[Tuple[datetime, datetime]]]:
+        """Splits the windows of :meth:`~.partition` that contain more than ``max_items`` in half
+
+        :param windows: the ``(start, end)`` dates of each window
+        :param counts: the number of items in each window
+        :param max_items: the maximum number of items per window
+        :returns: the windows that are small enough, and the halves of the windows that need to be checked again
+        """
+        done, split = [], []
+
+        for (start, end), count in zip(windows, counts):
+            if count == 0:
+                continue
+            middle = (start + (end - start) / 2).replace(microsecond=0)
+            if count <= max_items or middle <= start:
+                done.append((start, end))
+            else:
+                split.extend([(start, middle), (middle, end)])
+
+        return done, split
+
+    @staticmethod
+    def parse_date(date: str | datetime) -> datetime:
+        """Parses a date string, like ``"2023-01-01"`` or ``"2023-01-01 12:30:00"``
+
+        :param date: the date to parse
+        """
+        if isinstance(date, datetime):
+            return date
+        return datetime.fromisoformat(str(date))
+
+    @staticmethod
+    def format_date(date: str | datetime) -> str:
+        """Formats a date in the same format as the API, like ``"2023-01-01 12:30:00"``
+
+        :param date: the date to format
+        """
+        if isinstance(date, datetime):
+            return date.strftime('%Y-%m-%d %H:%M:%S')
+        return date
+
     @cached_property
     def result(self) -> Optional[Model | List[Model]]:
         """The result of the search query, wrapped by the :class:`~.Model` corresponding to the endpoint
@@ -243,9 +950,15 @@ class SearchQuery:
         if result is None:
             return result
         if isinstance(result, list):
-            return [self.parse(item) for item in result]
+            self.resolve(result)
+            models = [self.parse(item) for item in result]
+            self.load_relations(models)
+            return models
         if isinstance(result, dict):
-            return self.parse(result)
+            self.resolve([result])
+            model = self.parse(result)
+            self.load_relations([model])
+            return model
 
     def validate_result(self) -> Optional[Dict | List[Dict]]:
         """Parses the response and returns the actual result data, regardless of search approach"""
@@ -282,19 +995,54 @@ class SearchQuery:
         :param data: API response data of a single item
         """
         if self.Model is not APIResponse:
-            return self.Model(data, self.client)
-        return self.Model(data, self.client, self.endpoint)
+            return self.canonical(self.Model(data, self.client))
+        return self.canonical(self.Model(data, self.client, self.endpoint))
+
+    def canonical(self, model: Model) -> Model:
+        """Returns the single instance of a parsed item from the :attr:`.Client.identity_map`, if the client has one
+
+        :param model: the newly parsed :class:`~.Model`
+        """
+        if self.client.identity_map is None:
+            return model
+        return self.client.identity_map.merge(model)
+
+    def parse_items(self, items: List[dict]) -> List[Model]:
+        """Parses a list of API response items with :meth:`~.parse`, excluding any that can't be parsed
+
+        :param items: API response data of multiple items
+        """
+        self.resolve(items)
+        models = [model for model in map(self.parse, items) if model]
+        self.load_relations(models)
+        return models
+
+    def resolve(self, items: List[dict]) -> None:
+        """Retrieves any additional data needed to :meth:`~.parse` the response items; called before they're parsed
+
+        Subclasses can override this to retrieve related data for every item with a single request,
+        instead of sending a request for each item in :meth:`~.parse`
+
+        :param items: API response data of multiple items
+        """
+        pass
 
     def reset(self) -> None:
         """Resets the query and result, allowing the object to be reused"""
         self._result = {}
-        self.fields = ''
-        self.query = self.client.url_for(self.endpoint) + '/?'
+        self.path = self.endpoint
+        self.item_id = None
+        self.criteria = SearchCriteria()
+        self.cursor = None
+        self.relations = []
         self.__dict__.pop('result', None)
 
     @property
     def result_count(self) -> int:
-        """Number of items that matched the search criteria"""
+        """Number of items that matched the search criteria
+
+        .. tip:: Use :meth:`~.count` to get the number of matching items without retrieving them
+        """
         if not self._result or not self.result:
             return 0
         if isinstance(self.result, Model):
@@ -312,18 +1060,15 @@ class SearchQuery:
         
         :returns: the most recent filter group, or ``-1`` if no criteria has been added
         """
-        if self.query.endswith('?'):
-            return -1
-        return int(re.match(
-            r'.*searchCriteria\[filter_groups]\[(\d)]',
-            self.query
-        ).groups()[-1])
+        return self.criteria.last_group
 
 
 class OrderSearch(SearchQuery):
 
     """:class:`SearchQuery` subclass for the ``orders`` endpoint"""
 
+    KEYSET_FIELD = 'entity_id'
+
     def __init__(self, client: Client):
         """Initialize an :class:`OrderSearch`
 
@@ -439,6 +1184,8 @@ class OrderItemSearch(SearchQuery):
 
     """:class:`SearchQuery` subclass for the ``orders/items`` endpoint"""
 
+    KEYSET_FIELD = 'item_id'
+
     def __init__(self, client: Client):
         """Initialize an :class:`OrderItemSearch`
 
@@ -449,6 +1196,8 @@ class OrderItemSearch(SearchQuery):
             client=client,
             model=OrderItem
         )
+        #: Parent items of any child items in the response being parsed, mapped by ``item_id``
+        self.parents = {}
 
     @cached_property
     def result(self) -> Optional[OrderItem | List[OrderItem]]:
@@ -463,14 +1212,55 @@ class OrderItemSearch(SearchQuery):
         Extra validation is required for OrderItems, as duplicated and/or incomplete data is returned
         when the child of a configurable product is searched :meth:`by_sku` or :meth:`by_product`
 
+        Child items are replaced by their parent item, which is retrieved beforehand by :meth:`~.resolve`
+
         :param data: API response data
         """
         if data.get('parent_item'):
             return None
         if parent_id := data.get('parent_item_id'):
-            return self.client.order_items.by_id(parent_id)
+            return self.parents.get(parent_id)
         else:
-            return OrderItem(data, self.client)
+            return self.canonical(OrderItem(data, self.client))
+
+    def resolve(self, items: List[dict]) -> None:
+        """Retrieves the parent items of any configurable child items with a single :meth:`~.by_list` search
+
+        The :attr:`~.parents` only hold the parents of the current ``items``, so memory use stays flat
+        when paginating with :meth:`~.iter_pages` or :meth:`~.iter_keyset`
+
+        :param items: API response data of multiple order items
+        """
+        self.parents = {}
+        if parent_ids := self.get_parent_ids(items):
+            self.add_parents(self.client.order_items.by_list('item_id', parent_ids))
+
+    def get_parent_ids(self, items: Optional[List[dict]]) -> Set[int]:
+        """Returns the ids of the parent items that need to be retrieved to :meth:`~.parse` the response items
+
+        Each parent is only included once, even if it has multiple child items
+
+        :param items: API response data of multiple order items
+        """
+        return set(
+            item['parent_item_id'] for item in items or []
+            if item.get('parent_item_id') and not item.get('parent_item')
+        )
+
+    def add_parents(self, parents: Optional[OrderItem | List[OrderItem]]) -> None:
+        """Adds retrieved parent items to the :attr:`~.parents`
+
+        :param parents: the result of the search for the parent items
+        """
+        if parents is None:
+            return
+        if not isinstance(parents, list):
+            parents = [parents]
+        self.parents.update({parent.item_id: parent for parent in parents})
+
+    def reset(self) -> None:
+        super().reset()
+        self.parents = {}
 
     def by_product(self, product: Product) -> Optional[OrderItem | List[OrderItem]]:
         """Search for :class:`~.OrderItem` entries by :class:`~.Product`
@@ -558,6 +1348,8 @@ class InvoiceSearch(SearchQuery):
 
     """:class:`SearchQuery` subclass for the ``invoices`` endpoint"""
 
+    KEYSET_FIELD = 'entity_id'
+
     def __init__(self, client: Client):
         """Initialize an :class:`InvoiceSearch`
 
@@ -707,6 +1499,8 @@ class ProductSearch(SearchQuery):
 
     """:class:`SearchQuery` subclass for the ``products`` endpoint"""
 
+    KEYSET_FIELD = 'entity_id'
+
     def __init__(self, client: Client):
         """Initialize a :class:`ProductSearch`
 
@@ -807,6 +1601,8 @@ class ProductAttributeSearch(SearchQuery):
 
     """:class:`SearchQuery` subclass for the ``products/attributes`` endpoint"""
 
+    KEYSET_FIELD = 'attribute_id'
+
     def __init__(self, client: Client):
         """Initialize a :class:`ProductAttributeSearch`
 
@@ -838,6 +1634,8 @@ class CategorySearch(SearchQuery):
 
     """:class:`SearchQuery` subclass for the ``categories`` endpoint"""
 
+    KEYSET_FIELD = 'entity_id'
+
     def __init__(self, client: Client):
         """Initialize a :class:`CategorySearch`
 
@@ -850,11 +1648,11 @@ class CategorySearch(SearchQuery):
         )
 
     def by_id(self, item_id: Union[int, str]) -> Optional[Category]:
-        self.query += f'rootCategoryId={item_id}'
+        self.criteria.params['rootCategoryId'] = item_id
         return self.execute()
 
     def by_list(self, field: str, values: Iterable) -> Optional[Category, List[Category]]:
-        self.query = self.query.replace('categories', 'categories/list')
+        self.path = 'categories/list'
         return super().by_list(field, values)
 
     def get_root(self) -> Category:
@@ -863,7 +1661,8 @@ class CategorySearch(SearchQuery):
 
     def get_all(self) -> List[Category]:
         """Retrieve a list of all categories"""
-        self.query = self.query.replace('categories', 'categories/list') + 'searchCriteria[currentPage]=1'
+        self.path = 'categories/list'
+        self.criteria.current_page = 1
         return self.execute()
 
     def by_name(self, name: str, exact: bool = True) -> Optional[Category | List[Category]]:
@@ -872,7 +1671,7 @@ class CategorySearch(SearchQuery):
         :param name: the category name to search for
         :param exact: whether the name should be an exact match
         """
-        self.query = self.query.replace('categories', 'categories/list')
+        self.path = 'categories/list'
         if exact:
             return self.add_criteria('name', name).execute()
         else:
@@ -882,6 +1681,8 @@ class CategorySearch(SearchQuery):
 class CustomerSearch(SearchQuery):
     """:class:`SearchQuery` subclass for the ``customers/search`` endpoint"""
 
+    KEYSET_FIELD = 'entity_id'
+
     def __init__(self, client: Client):
         """Initialize a :class:`CustomerSearch`
 
@@ -894,7 +1695,7 @@ class CustomerSearch(SearchQuery):
         )
 
     def by_id(self, item_id: Union[int, str]) -> Optional[Customer]:
-        self.query = self.query.replace('customers/search', 'customers')
+        self.path = 'customers'
         return super().by_id(item_id)
 
     def by_first_name(self, name):
@@ -925,3 +1726,679 @@ class CustomerSearch(SearchQuery):
                 customer_ids.add(customer_id)
 
         return self.by_list('entity_id', customer_ids)
+
+
+class AsyncSearchQuery(SearchQuery):
+
+    """Awaitable version of the :class:`SearchQuery`, used by an :class:`~.AsyncClient`
+
+    Every method that sends a search request returns a coroutine, which resolves to
+    the same :attr:`~.result` as the corresponding :class:`SearchQuery` method
+
+    .. admonition:: Example
+       :class: example
+
+       ::
+
+        >> orders = await api.search('orders').add_criteria('status', 'pending').execute()
+    """
+
+    def __init__(self, endpoint: str, client: AsyncClient, model: Type[Model] = APIResponse):
+        """Initialize an AsyncSearchQuery object
+
+        :param endpoint: the base search API endpoint (for example, ``orders``)
+        :param client: an initialized :class:`~.AsyncClient` object
+        :param model: the :class:`~.Model` to parse the response data with; uses :class:`~.APIResponse` if not specified
+        """
+        if not isinstance(client, clients.AsyncClient):
+            raise TypeError(f'`client` must be of type {clients.AsyncClient}')
+
+        # Models are initialized with the synchronous Client
+        SearchQuery.__init__(self, endpoint, client.client, model)
+        #: The :class:`~.AsyncClient` to send the search request with
+        self.async_client = client
+
+    def load_relations(self, models: List[Optional[Model]]) -> None:
+        """Overrides :meth:`.SearchQuery.load_relations`, since the :attr:`~.relations` are awaited by :meth:`~.fetch_relations` instead
+
+        :param models: the parsed items
+        """
+        pass
+
+    async def fetch_relations(self, result: Optional[Model | List[Model]]) -> Optional[Model | List[Model]]:
+        """Loads the :attr:`~.relations` from :meth:`~.prefetch` for the parsed items with an :class:`~.AsyncBatchLoader`
+
+        :param result: the parsed items, as either an individual or list of :class:`~.Model` objects
+        :returns: the same ``result``
+        """
+        models = [model for model in (result if isinstance(result, list) else [result]) if model]
+        if self.relations and models:
+            loader = self.async_client.batch()
+            for relation in self.relations:
+                await loader.load_path(models, relation)
+        return result
+
+    def resolve(self, items: List[dict]) -> None:
+        """Overrides :meth:`.SearchQuery.resolve`, since any additional data is awaited by :meth:`~.prepare` instead
+
+        :param items: API response data of multiple items
+        """
+        pass
+
+    async def execute(self) -> Optional[Model | List[Model]]:
+        """Sends the search request using the current :attr:`~.scope` of the :attr:`async_client`
+
+        :returns: the search query :attr:`~.result`
+        """
+        response = await self.async_client.get(self.query)
+        self.__dict__.pop('result', None)
+        self._result = response.json()
+        await self.prepare(self.validate_result())
+        return await self.fetch_relations(self.result)
+
+    async def prepare(self, items: Optional[Dict | List[Dict]]) -> None:
+        """Awaits any requests needed to :meth:`~.parse` the response items; called before they're parsed
+
+        :param items: API response data of one or more items
+        """
+        pass
+
+    async def iter_pages(self, page_size: int = 100, workers: int = 1) -> AsyncIterator[List[Model]]:
+        """Sends the search request one page at a time, yielding the parsed items of each page
+
+        See :meth:`.SearchQuery.iter_pages` for details
+
+        :param page_size: the number of items to request per page
+        :param workers: the maximum number of pages to request concurrently
+        :returns: an asynchronous generator that yields each page as a list of :class:`~.Model` objects
+        """
+        import asyncio
+
+        if page_size < 1:
+            raise ValueError('`page_size` must be a positive integer')
+        if workers < 1:
+            raise ValueError('`workers` must be a positive integer')
+
+        response = await self.get_page(1, page_size)
+        if isinstance(response, list):  # Endpoint doesn't support pagination
+            await self.prepare(response)
+            yield await self.fetch_relations(self.parse_items(response))
+            return
+
+        items = response.get('items') or []
+        await self.prepare(items)
+        yield await self.fetch_relations(self.parse_items(items))
+
+        pages = iter(range(2, math.ceil(response.get('total_count', 0) / page_size) + 1))
+        pending = deque(
+            asyncio.ensure_future(self.get_page(page, page_size))
+            for page in islice(pages, workers)
+        )
+        try:
+            while pending:
+                items = (await pending.popleft()).get('items')
+                if not items:
+                    break
+                if (page := next(pages, None)) is not None:
+                    pending.append(asyncio.ensure_future(self.get_page(page, page_size)))
+                await self.prepare(items)
+                yield await self.fetch_relations(self.parse_items(items))
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def iter_items(self, page_size: int = 100, workers: int = 1) -> AsyncIterator[Model]:
+        """Sends the search request one page at a time, yielding the parsed items individually
+
+        :param page_size: the number of items to request per page
+        :param workers: the maximum number of pages to request concurrently
+        :returns: an asynchronous generator that yields each :class:`~.Model` from :meth:`~.iter_pages`
+        """
+        async for page in self.iter_pages(page_size, workers):
+            for item in page:
+                yield item
+
+    async def get_page(self, page: int, page_size: int) -> Dict | List[Dict]:
+        """Requests a single page of search results and returns the raw response data
+
+        :param page: the page number to request, starting from ``1``
+        :param page_size: the number of items per page
+        :raises: :class:`~.MagentoError` if the request fails
+        """
+        response = await self.async_client.get(self.page_url(page, page_size))
+        if response.status_code != 200:
+            raise MagentoError(self.client, f'Failed to retrieve page {page} of the search results', response)
+        return response.json()
+
+    async def iter_keyset(self, page_size: int = 100, field: Optional[str] = None, start_after=None) -> AsyncIterator[List[Model]]:
+        """Sends the search request one page at a time using keyset pagination, yielding the parsed items of each page
+
+        See :meth:`.SearchQuery.iter_keyset` for details
+
+        :param page_size: the number of items to request per page
+        :param field: a unique, sortable field to paginate by; uses the :attr:`~.KEYSET_FIELD` if not provided
+        :param start_after: the ``field`` value to start after, like a :attr:`~.cursor` from a previous scan
+        :returns: an asynchronous generator that yields each page as a list of :class:`~.Model` objects
+        :raises: :class:`ValueError` if no ``field`` is provided and the endpoint has no :attr:`~.KEYSET_FIELD`
+        """
+        if page_size < 1:
+            raise ValueError('`page_size` must be a positive integer')
+
+        field = self.get_keyset_field(field)
+        self.cursor = start_after
+
+        while True:
+            items = (await self.get_keyset_page(field, self.cursor, page_size)).get('items')
+            if not items:
+                return
+
+            if (cursor := self.keyset_value(items[-1], field)) is None:
+                raise ValueError(f'Unable to paginate by "{field}", since it\'s missing from the response data')
+            self.cursor = cursor
+            await self.prepare(items)
+            yield await self.fetch_relations(self.parse_items(items))
+
+            if len(items) < page_size:
+                return
+
+    async def count(self) -> int:
+        """Returns the number of items that match the search criteria, without retrieving them
+
+        See :meth:`.SearchQuery.count` for details
+
+        :raises: :class:`~.MagentoError` if the request fails
+        """
+        response = await self.async_client.get(self.count_url())
+        if response.status_code != 200:
+            raise MagentoError(self.client, 'Failed to retrieve the number of search results', response)
+        return self.parse_count(response.json())
+
+    async def partition(self, start: str | datetime, end: Optional[str | datetime] = None, max_items: int = 10000,
+                        field: str = 'created_at', workers: int = 4) -> List[Tuple[str, str]]:
+        """Splits a date range into windows that each contain at most ``max_items`` matching items
+
+        See :meth:`.SearchQuery.partition` for details
+
+        :param start: the date to start from (inclusive)
+        :param end: the date to end at (exclusive); uses the current time if not provided
+        :param max_items: the maximum number of items per window
+        :param field: the date field to partition by
+        :param workers: the maximum number of windows to :meth:`~.count` concurrently
+        :returns: the ``(start, end)`` dates of each window, in order
+        """
+        import asyncio
+
+        if max_items < 1:
+            raise ValueError('`max_items` must be a positive integer')
+        if workers < 1:
+            raise ValueError('`workers` must be a positive integer')
+
+        semaphore = asyncio.Semaphore(workers)
+
+        async def count_window(window):
+            async with semaphore:
+                return await self.count_window(*window, field)
+
+        windows, pending = [], [self.get_bounds(start, end)]
+
+        while pending:
+            counts = await asyncio.gather(*map(count_window, pending))
+            done, pending = self.split_windows(pending, counts, max_items)
+            windows.extend(done)
+
+        return [tuple(map(self.format_date, window)) for window in sorted(windows)]
+
+    async def iter_windows(self, start: str | datetime, end: Optional[str | datetime] = None, max_items: int = 10000,
+                           field: str = 'created_at', page_size: int = 100, workers: int = 4) -> AsyncIterator[List[Model]]:
+        """Retrieves every item in a date range, requesting the windows from :meth:`~.partition` concurrently
+
+        See :meth:`.SearchQuery.iter_windows` for details
+
+        :param start: the date to start from (inclusive)
+        :param end: the date to end at (exclusive); uses the current time if not provided
+        :param max_items: the maximum number of items per window
+        :param field: the date field to partition by
+        :param page_size: the number of items to request per page of each window
+        :param workers: the maximum number of windows to request concurrently
+        :returns: an asynchronous generator that yields the items of each window as a list of :class:`~.Model` objects
+        """
+        import asyncio
+
+        windows = iter(await self.partition(start, end, max_items, field, workers))
+        pending = deque(
+            asyncio.ensure_future(self.get_window(*window, field, page_size))
+            for window in islice(windows, workers)
+        )
+        try:
+            while pending:
+                items = await pending.popleft()
+                if (window := next(windows, None)) is not None:
+                    pending.append(asyncio.ensure_future(self.get_window(*window, field, page_size)))
+                yield items
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def count_window(self, start: datetime, end: datetime, field: str) -> int:
+        """Returns the number of items in a window of :meth:`~.partition`
+
+        :param start: the date the window starts from (inclusive)
+        :param end: the date the window ends at (exclusive)
+        :param field: the date field to partition by
+        """
+        return await self.window(start, end, field).count()
+
+    async def get_window(self, start: str, end: str, field: str, page_size: int) -> List[Model]:
+        """Retrieves every item in a window of :meth:`~.partition`
+
+        :param start: the date the window starts from (inclusive)
+        :param end: the date the window ends at (exclusive)
+        :param field: the date field to partition by
+        :param page_size: the number of items to request per page
+        """
+        return [item async for page in self.window(start, end, field).iter_pages(page_size) for item in page]
+
+    async def get_keyset_page(self, field: str, cursor, page_size: int) -> Dict:
+        """Requests the page of search results that comes after the ``cursor`` and returns the raw response data
+
+        :param field: the field to paginate by
+        :param cursor: the last ``field`` value of the previous page, or ``None`` to request the first page
+        :param page_size: the number of items per page
+        :raises: :class:`~.MagentoError` if the request fails
+        """
+        response = await self.async_client.get(self.keyset_url(field, cursor, page_size))
+        if response.status_code != 200:
+            raise MagentoError(self.client, f'Failed to retrieve the search results after {field}={cursor}', response)
+        return response.json()
+
+    async def execute_chunks(self, urls: List[str]) -> Optional[Model | List[Model]]:
+        """Sends the search request for each chunk of a :meth:`~.by_list` search concurrently, then merges the responses
+
+        See :meth:`.SearchQuery.execute_chunks` for details
+
+        :param urls: the request URLs from :meth:`~.chunk_urls`
+        :returns: the search query :attr:`~.result`
+        """
+        import asyncio
+
+        semaphore = asyncio.Semaphore(self.CHUNK_WORKERS)
+
+        async def get_chunk(url):
+            async with semaphore:
+                return await self.get_chunk(url)
+
+        self.merge_chunks(await asyncio.gather(*map(get_chunk, urls)))
+        await self.prepare(self.validate_result())
+        return await self.fetch_relations(self.result)
+
+    async def get_chunk(self, url: str) -> Dict:
+        """Requests a single chunk of a :meth:`~.by_list` search and returns the raw response data
+
+        :param url: the request URL of the chunk
+        :raises: :class:`~.MagentoError` if the request fails
+        """
+        response = await self.async_client.get(url)
+        if response.status_code != 200:
+            raise MagentoError(self.client, 'Failed to retrieve a chunk of the search results', response)
+        return response.json()
+
+
+class AsyncOrderSearch(AsyncSearchQuery, OrderSearch):
+
+    """Awaitable version of the :class:`OrderSearch`"""
+
+    def __init__(self, client: AsyncClient):
+        """Initialize an :class:`AsyncOrderSearch`
+
+        :param client: an initialized :class:`~.AsyncClient` object
+        """
+        super().__init__(
+            endpoint='orders',
+            client=client,
+            model=Order
+        )
+
+    async def by_product(self, product: Product) -> Optional[Order | List[Order]]:
+        items = await self.async_client.order_items.by_product(product)
+        return await self.from_items(items)
+
+    async def by_sku(self, sku: str) -> Optional[Order | List[Order]]:
+        items = await self.async_client.order_items.by_sku(sku)
+        return await self.from_items(items)
+
+    async def by_product_id(self, product_id: Union[int, str]) -> Optional[Order | List[Order]]:
+        items = await self.async_client.order_items.by_product_id(product_id)
+        return await self.from_items(items)
+
+    async def by_category_id(self, category_id: Union[int, str], search_subcategories: bool = False) -> Optional[Order | List[Order]]:
+        items = await self.async_client.order_items.by_category_id(category_id, search_subcategories)
+        return await self.from_items(items)
+
+    async def by_category(self, category: Category, search_subcategories: bool = False) -> Optional[Order | List[Order]]:
+        items = await self.async_client.order_items.by_category(category, search_subcategories)
+        return await self.from_items(items)
+
+    async def by_skulist(self, skulist: Union[str, Iterable[str]]) -> Optional[Order | List[Order]]:
+        items = await self.async_client.order_items.by_skulist(skulist)
+        return await self.from_items(items)
+
+    async def from_items(self, items: Optional[OrderItem | List[OrderItem]]) -> Optional[Order, List[Order]]:
+        if items is None:
+            return
+        if isinstance(items, list):
+            order_ids = set(item.order_id for item in items)
+            return await self.by_list('entity_id', order_ids)
+        else:
+            return await self.by_id(items.order_id)  # Single OrderItem
+
+
+class AsyncOrderItemSearch(AsyncSearchQuery, OrderItemSearch):
+
+    """Awaitable version of the :class:`OrderItemSearch`"""
+
+    def __init__(self, client: AsyncClient):
+        """Initialize an :class:`AsyncOrderItemSearch`
+
+        :param client: an initialized :class:`~.AsyncClient` object
+        """
+        super().__init__(
+            endpoint='orders/items',
+            client=client,
+            model=OrderItem
+        )
+        #: Parent items of any child items in the response being parsed, mapped by ``item_id``
+        self.parents = {}
+
+    async def prepare(self, items: Optional[Dict | List[Dict]]) -> None:
+        """Retrieves the parent items of any configurable child items with a single request
+
+        See :meth:`.OrderItemSearch.resolve` for details
+
+        :param items: API response data of one or more order items
+        """
+        if isinstance(items, dict):
+            items = [items]
+
+        self.parents = {}
+        if parent_ids := self.get_parent_ids(items):
+            self.add_parents(await self.async_client.order_items.by_list('item_id', parent_ids))
+
+    async def by_product(self, product: Product) -> Optional[OrderItem | List[OrderItem]]:
+        if not isinstance(product, Product):
+            raise TypeError(f'`product` must be of type {Product}')
+
+        if items := await self.by_product_id(product.id):
+            return items
+
+        self.reset()
+        return await self.by_sku(product.encoded_sku)
+
+    async def by_category_id(self, category_id: Union[int, str], search_subcategories: bool = False) -> Optional[OrderItem | List[OrderItem]]:
+        if category := await self.async_client.categories.by_id(category_id):
+            return await self.by_category(category, search_subcategories)
+
+    async def by_category(self, category: Category, search_subcategories: bool = False) -> Optional[OrderItem | List[OrderItem]]:
+        if not isinstance(category, Category):
+            raise TypeError(f'`category` must be of type {Category}')
+
+        product_ids = await self.async_client.categories.get_product_ids(category, search_subcategories)
+        return await self.by_list('product_id', product_ids)
+
+
+class AsyncInvoiceSearch(AsyncSearchQuery, InvoiceSearch):
+
+    """Awaitable version of the :class:`InvoiceSearch`"""
+
+    def __init__(self, client: AsyncClient):
+        """Initialize an :class:`AsyncInvoiceSearch`
+
+        :param client: an initialized :class:`~.AsyncClient` object
+        """
+        super().__init__(
+            endpoint='invoices',
+            client=client,
+            model=Invoice
+        )
+
+    async def by_order_number(self, order_number: Union[int, str]) -> Optional[Invoice]:
+        if order := await self.async_client.orders.by_number(order_number):
+            return await self.by_order(order)
+
+    async def by_product(self, product: Product) -> Optional[Invoice | List[Invoice]]:
+        items = await self.async_client.order_items.by_product(product)
+        return await self.from_order_items(items)
+
+    async def by_sku(self, sku: str) -> Optional[Invoice | List[Invoice]]:
+        items = await self.async_client.order_items.by_sku(sku)
+        return await self.from_order_items(items)
+
+    async def by_product_id(self, product_id: Union[int, str]) -> Optional[Invoice | List[Invoice]]:
+        items = await self.async_client.order_items.by_product_id(product_id)
+        return await self.from_order_items(items)
+
+    async def by_category_id(self, category_id: Union[int, str], search_subcategories: bool = False) -> Optional[Invoice | List[Invoice]]:
+        items = await self.async_client.order_items.by_category_id(category_id, search_subcategories)
+        return await self.from_order_items(items)
+
+    async def by_category(self, category: Category, search_subcategories: bool = False) -> Optional[Invoice | List[Invoice]]:
+        items = await self.async_client.order_items.by_category(category, search_subcategories)
+        return await self.from_order_items(items)
+
+    async def by_skulist(self, skulist: Union[str, Iterable[str]]) -> Optional[Invoice | List[Invoice]]:
+        items = await self.async_client.order_items.by_skulist(skulist)
+        return await self.from_order_items(items)
+
+    async def by_customer_id(self, customer_id: Union[int, str]) -> Optional[Invoice | List[Invoice]]:
+        orders = await self.async_client.orders.by_customer_id(customer_id)
+
+        if orders is None:
+            return None
+        if isinstance(orders, list):
+            order_ids = set(order.id for order in orders)
+            return await self.by_list('order_id', order_ids)
+        else:
+            return await self.by_order_id(orders.id)
+
+    async def from_order_items(self, items: Optional[OrderItem | List[OrderItem]]) -> Optional[Invoice, List[Invoice]]:
+        if items is None:
+            return self.client.logger.info(
+                'No matching invoices for this search query'
+            )
+        if isinstance(items, list):
+            order_ids = set(item.order_id for item in items)
+            return await self.by_list('order_id', order_ids)
+        else:
+            return await self.by_order_id(items.order_id)  # Single OrderItem
+
+
+class AsyncProductSearch(AsyncSearchQuery, ProductSearch):
+
+    """Awaitable version of the :class:`ProductSearch`"""
+
+    def __init__(self, client: AsyncClient):
+        """Initialize an :class:`AsyncProductSearch`
+
+        :param client: an initialized :class:`~.AsyncClient` object
+        """
+        super().__init__(
+            endpoint='products',
+            client=client,
+            model=Product
+        )
+
+    @property
+    def attributes(self) -> AsyncProductAttributeSearch:
+        """Alternate way to access the AsyncSearchQuery for :class:`~.ProductAttribute` data"""
+        return AsyncProductAttributeSearch(self.async_client)
+
+    async def by_category_id(self, category_id: Union[int, str], search_subcategories: bool = False) -> Optional[Product | List[Product]]:
+        if search_subcategories:
+            if category := await self.async_client.categories.by_id(category_id):
+                return await self.by_category(category, search_subcategories)
+            return None
+        else:
+            return await self.add_criteria('category_id', category_id).execute()
+
+    async def by_category(self, category: Category, search_subcategories: bool = False) -> Optional[Product | List[Product]]:
+        if not isinstance(category, Category):
+            raise TypeError(f'`category` must be of type {Category}')
+
+        if search_subcategories:
+            category_ids = [category.id] + await self.async_client.categories.get_subcategory_ids(category)
+            return await self.by_list('category_id', category_ids)
+        else:
+            return await self.add_criteria('category_id', category.id).execute()
+
+    async def by_customer_id(self, customer_id: Union[int, str], exclude_cancelled: bool = True):
+        if not await self.async_client.customers.by_id(customer_id):
+            return None
+
+        orders = await self.async_client.orders.by_customer_id(customer_id) or []
+        if not isinstance(orders, list):
+            orders = [orders]
+
+        items = [
+            item for order in orders for item in order.items
+            if item.net_qty_ordered > 0 or not exclude_cancelled
+        ]
+        return await self.from_order_items(items)
+
+    async def from_order_items(self, items: List[OrderItem]) -> List[Product]:
+        """Retrieves the unique :class:`~.Product` s of a list of order items, with one search per kind of lookup
+
+        The products are found by the :meth:`.OrderItem.get_product_key` of each item,
+        instead of awaiting the synchronous :attr:`.OrderItem.product` of each item
+
+        :param items: the order items to retrieve the products of
+        """
+        keys = {}
+        for item in items:
+            if key := item.get_product_key():
+                field, value = key
+                keys.setdefault(field, set()).add(value)
+
+        products = {}
+        for field, values in keys.items():
+            if field == 'sku':
+                result = await self.async_client.products.by_skulist(values)
+            else:
+                result = await self.async_client.products.by_list(field, values)
+            if result is not None:
+                products.update((product.id, product) for product in (result if isinstance(result, list) else [result]))
+        return list(products.values())
+
+    async def get_stock(self, sku) -> Optional[int]:
+        if product := await self.by_sku(sku):
+            return product.stock
+
+
+class AsyncProductAttributeSearch(AsyncSearchQuery, ProductAttributeSearch):
+
+    """Awaitable version of the :class:`ProductAttributeSearch`"""
+
+    def __init__(self, client: AsyncClient):
+        """Initialize an :class:`AsyncProductAttributeSearch`
+
+        :param client: an initialized :class:`~.AsyncClient` object
+        """
+        super().__init__(
+            endpoint='products/attributes',
+            client=client,
+            model=ProductAttribute
+        )
+
+    async def get_types(self) -> Optional[List[APIResponse]]:
+        return await self.async_client.search(f'{self.endpoint}/types').execute()
+
+
+class AsyncCategorySearch(AsyncSearchQuery, CategorySearch):
+
+    """Awaitable version of the :class:`CategorySearch`"""
+
+    def __init__(self, client: AsyncClient):
+        """Initialize an :class:`AsyncCategorySearch`
+
+        :param client: an initialized :class:`~.AsyncClient` object
+        """
+        super().__init__(
+            endpoint='categories',
+            client=client,
+            model=Category
+        )
+
+    async def get_category_tree(self) -> CategoryTree:
+        """Returns the :attr:`.Store.category_tree`, awaiting the request to retrieve it if it isn't cached yet"""
+        store = self.async_client.store
+        if 'category_tree' not in store.__dict__:
+            root = await self.async_client.categories.get_root()
+            store.__dict__['category_tree'] = CategoryTree(root.data if root else {})
+        return store.category_tree
+
+    async def get_subcategory_ids(self, category: Category) -> List[int]:
+        """Returns the :attr:`.Category.all_subcategory_ids` of a category, without blocking the event loop
+
+        :param category: the :class:`~.Category` to retrieve the descendants of
+        """
+        if 'all_subcategory_ids' not in category.__dict__:
+            tree = await self.get_category_tree()
+            if category.id not in tree:  # Not in the tree of the current scope; retrieve its own tree instead
+                root = await self.async_client.categories.by_id(category.id)
+                tree = CategoryTree(root.data if root else {})
+            category.__dict__['all_subcategory_ids'] = tree.descendant_ids(category.id) if category.id in tree else []
+        return category.all_subcategory_ids
+
+    async def get_product_ids(self, category: Category, search_subcategories: bool = False) -> List[int] | Set[int]:
+        """Returns the :attr:`.Category.product_ids` or :attr:`.Category.all_product_ids` of a category,
+        without blocking the event loop
+
+        :param category: the :class:`~.Category` to retrieve the product ids of
+        :param search_subcategories: if ``True``, also includes the products of :attr:`~.Category.all_subcategories`
+        """
+        attr = 'all_product_ids' if search_subcategories else 'product_ids'
+        if attr not in category.__dict__:
+            products = await self.async_client.products.by_category(category, search_subcategories) or []
+            if not isinstance(products, list):
+                products = [products]
+            ids = [product.id for product in products]
+            category.__dict__[attr] = set(ids) if search_subcategories else ids
+        return category.__dict__[attr]
+
+
+class AsyncCustomerSearch(AsyncSearchQuery, CustomerSearch):
+
+    """Awaitable version of the :class:`CustomerSearch`"""
+
+    def __init__(self, client: AsyncClient):
+        """Initialize an :class:`AsyncCustomerSearch`
+
+        :param client: an initialized :class:`~.AsyncClient` object
+        """
+        super().__init__(
+            endpoint='customers/search',
+            client=client,
+            model=Customer
+        )
+
+    async def by_invoice(self, invoice: Invoice):
+        if order := await self.async_client.orders.by_id(invoice.order_id):
+            return await self.by_order(order)
+
+    async def by_order(self, order: Order):
+        if customer_id := order.data.get("customer_id"):
+            return await self.by_id(customer_id)
+        else:
+            return self.client.logger.info(
+                f"No customer account exists for {order}")
+
+    async def by_product(self, product: Product) -> Optional[Customer | List[Customer]]:
+        orders = await self.async_client.orders.by_product(product) or []
+        customer_ids = set()
+
+        if not isinstance(orders, list):
+            return await self.by_order(orders)
+
+        for order in orders:
+            if customer_id := order.data.get('customer_id'):
+                customer_ids.add(customer_id)
+
+        return await self.by_list('entity_id', customer_ids)
@@ -0,0 +1,266 @@
+from __future__ import annotations
+import json
+import time
+import sqlite3
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Optional, Dict, Union, Iterator, List, TYPE_CHECKING
+from .cache import lock_file, write_atomic
+from .exceptions import MagentoError
+from .models import Model
+
+if TYPE_CHECKING:
+    from . import Client
+    from .search import SearchQuery
+
+
+class CheckpointStore:
+
+    """Persists the checkpoints of an :class:`IncrementalSync` to a JSON file
+
+    Each checkpoint is saved by atomically replacing the file while it's locked,
+    so a crash can't leave it partially written, and multiple processes can share it
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """Initialize a CheckpointStore
+
+        :param path: the path of the JSON file
+        """
+        self.path = Path(path)
+
+    def __repr__(self):
+        return f'<CheckpointStore: {self.path}>'
+
+    def load(self, key: str) -> Optional[Dict]:
+        """Returns the checkpoint saved under a key, if there is one
+
+        :param key: the name of the sync
+        """
+        with lock_file(self.path):
+            return self.read().get(key)
+
+    def save(self, key: str, checkpoint: Dict) -> None:
+        """Saves a checkpoint under a key, replacing the previous one
+
+        :param key: the name of the sync
+        :param checkpoint: the checkpoint data
+        """
+        with lock_file(self.path):
+            checkpoints = self.read()
+            checkpoints[key] = checkpoint
+            write_atomic(self.path, checkpoints)
+
+    def delete(self, key: str) -> None:
+        """Deletes the checkpoint saved under a key
+
+        :param key: the name of the sync
+        """
+        with lock_file(self.path):
+            checkpoints = self.read()
+            if checkpoints.pop(key, None) is not None:
+                write_atomic(self.path, checkpoints)
+
+    def read(self) -> Dict[str, Dict]:
+        """Reads all checkpoints from the file"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+
+class SQLiteCheckpointStore:
+
+    """Persists the checkpoints of an :class:`IncrementalSync` to a SQLite database
+
+    Each checkpoint is saved in its own transaction, so the database can be shared by many syncs and processes
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """Initialize a SQLiteCheckpointStore
+
+        :param path: the path of the database file
+        """
+        self.path = Path(path)
+
+        with self.connect() as db:
+            db.execute('CREATE TABLE IF NOT EXISTS checkpoints (key TEXT PRIMARY KEY, checkpoint TEXT, saved_at REAL)')
+
+    def __repr__(self):
+        return f'<SQLiteCheckpointStore: {self.path}>'
+
+    @contextmanager
+    def connect(self):
+        """Context manager that opens a connection to the database, and commits any changes made with it"""
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def load(self, key: str) -> Optional[Dict]:
+        """Returns the checkpoint saved under a key, if there is one
+
+        :param key: the name of the sync
+        """
+        with self.connect() as db:
+            row = db.execute('SELECT checkpoint FROM checkpoints WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, key: str, checkpoint: Dict) -> None:
+        """Saves a checkpoint under a key, replacing the previous one
+
+        :param key: the name of the sync
+        :param checkpoint: the checkpoint data
+        """
+        with self.connect() as db:
+            db.execute(
+                'INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?)',
+                (key, json.dumps(checkpoint), time.time())
+            )
+
+    def delete(self, key: str) -> None:
+        """Deletes the checkpoint saved under a key
+
+        :param key: the name of the sync
+        """
+        with self.connect() as db:
+            db.execute('DELETE FROM checkpoints WHERE key = ?', (key,))
+
+
+class IncrementalSync:
+
+    """Retrieves the items of an endpoint that were created or updated since the last sync
+
+    The last ``updated_at`` value and id that were synced are saved as a checkpoint (or watermark),
+    which is used as the starting point of the next sync
+
+    * Items are requested in pages sorted by ``updated_at``, then by id, so that items updated
+      at the same time can't be skipped or synced twice, even if the sync is interrupted
+    * Each page is requested by filtering for items that come after the checkpoint, so every page
+      is equally fast to retrieve, regardless of how many items are being synced
+    * The checkpoint is saved once every item of a page has been consumed, so any items that were
+      being processed if the sync is interrupted will be synced again the next time
+
+    .. admonition:: Example
+       :class: example
+
+       ::
+
+        # Sync the products that changed since the last run
+        >> sync = IncrementalSync(api, 'products', CheckpointStore('checkpoints.json'))
+        >> for product in sync.run():
+        ...     update_listing(product)
+
+        # Additional criteria can be added to the query
+        >> sync = IncrementalSync(api, 'orders', SQLiteCheckpointStore('checkpoints.db'))
+        >> sync.query.add_criteria('status', 'complete')
+    """
+
+    def __init__(
+            self,
+            client: Client,
+            endpoint: str,
+            store: Union[CheckpointStore, SQLiteCheckpointStore],
+            name: Optional[str] = None,
+            page_size: int = 100,
+            field: str = 'updated_at',
+            start: Optional[str] = None,
+            id_field: Optional[str] = None,
+    ):
+        """Initialize an IncrementalSync
+
+        :param client: an initialized :class:`~.Client` object
+        :param endpoint: the search endpoint to sync (for example, ``orders``)
+        :param store: the :class:`CheckpointStore` or :class:`SQLiteCheckpointStore` to save checkpoints to
+        :param name: the key to save the checkpoint under; uses the ``endpoint`` if not provided
+        :param page_size: the number of items to request per page
+        :param field: the timestamp field to sync by
+        :param start: the timestamp to start from if there's no checkpoint; syncs every item if not provided
+        :param id_field: the unique id field to break ties by; uses the :attr:`~.SearchQuery.KEYSET_FIELD` if not provided
+        :raises: :class:`ValueError` if no ``id_field`` is provided and the endpoint has no :attr:`~.SearchQuery.KEYSET_FIELD`
+        """
+        if page_size < 1:
+            raise ValueError('`page_size` must be a positive integer')
+
+        self.client = client
+        self.endpoint = endpoint
+        self.store = store
+        self.name = name or endpoint
+        self.page_size = page_size
+        self.field = field
+        self.start = start
+        #: The :class:`~.SearchQuery` to sync, which can have additional criteria added to it
+        self.query: SearchQuery = client.search(endpoint)
+        #: The unique id field used to break ties between items with the same ``field`` value
+        self.id_field = self.query.get_keyset_field(id_field)
+
+    def __repr__(self):
+        return f'<IncrementalSync: {self.name}>'
+
+    @property
+    def checkpoint(self) -> Optional[Dict]:
+        """The last checkpoint that was saved to the :attr:`~.store`"""
+        return self.store.load(self.name)
+
+    def reset(self) -> None:
+        """Deletes the checkpoint, so the next sync starts from the beginning"""
+        self.store.delete(self.name)
+
+    def run(self) -> Iterator[Model]:
+        """Retrieves every item that was created or updated since the last :attr:`~.checkpoint`
+
+        :returns: a generator that yields each item as a :class:`~.Model`
+        :raises: :class:`~.MagentoError` if a request fails
+        """
+        checkpoint = self.checkpoint or {self.field: self.start, 'id': None}
+
+        while True:
+            items = self.get_page(checkpoint)
+            if not items:
+                return
+
+            yield from self.query.parse_items(items)
+
+            last = items[-1]
+            checkpoint = {self.field: last.get(self.field), 'id': self.query.keyset_value(last, self.id_field)}
+            self.store.save(self.name, checkpoint)
+
+            if len(items) < self.page_size:
+                return
+
+    def get_page(self, checkpoint: Dict) -> List[Dict]:
+        """Requests the page of items that comes after a checkpoint and returns the raw response data
+
+        :param checkpoint: the ``field`` value and id of the last item that was synced
+        """
+        response = self.client.get(self.page_url(checkpoint))
+        if not response.ok:
+            raise MagentoError(self.client, f'Failed to retrieve the items to sync after {checkpoint}', response)
+        return response.json().get('items') or []
+
+    def page_url(self, checkpoint: Dict) -> str:
+        """Returns the url to request the page of items that comes after a checkpoint with
+
+        Items come after the checkpoint if ``field > watermark OR (field = watermark AND id > last_id)``,
+        which is expressed as ``(field >= watermark) AND (field > watermark OR id > last_id)``,
+        since filter groups are combined with ``AND`` and filters within a group are combined with ``OR``
+
+        :param checkpoint: the ``field`` value and id of the last item that was synced
+        """
+        id_field = self.id_field
+        watermark, last_id = checkpoint.get(self.field), checkpoint.get('id')
+
+        criteria = self.query.criteria.copy()
+        criteria.sort_orders = [(self.field, 'ASC'), (id_field, 'ASC')]
+
+        if watermark is not None:
+            criteria.add_filter(self.field, watermark, 'gteq')
+            if last_id is not None:
+                group = criteria.last_group + 1
+                criteria.add_filter(self.field, watermark, 'gt', group=group)
+                criteria.add_filter(id_field, last_id, 'gt', group=group, index=1)
+
+        return self.query.get_url(page_size=self.page_size, current_page=1, criteria=criteria)
@@ -1,14 +1,21 @@
+from __future__ import annotations
 import os
 import re
 import sys
+import time
+import random
 import logging
+import threading
 import requests
 import functools
 
-from typing import Union, List, Type
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Union, List, Type, Optional, Iterable
 from logging import Logger, FileHandler, StreamHandler, Handler
 
 
+#: The user agent to use if :func:`get_agents` fails, or if a :class:`~.Client` is initialized with ``fast_start=True``
 DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36'
 
 
@@ -39,7 +46,7 @@ def parse_domain(domain: str):
 def get_agents() -> list:
     """Scrapes a list of user agents. Returns a default list if the scrape fails."""
     try:
-        response = requests.get('https://www.whatismybrowser.com/guides/the-latest-user-agent/chrome')
+        response = requests.get('https://www.whatismybrowser.com/guides/the-latest-user-agent/chrome', timeout=5)
         if response.ok:
             section = response.text.split('<h2>Latest Chrome on Windows 10 User Agents</h2>')[1]
             return [agent.split('<')[0] for agent in section.split('code\">')[1:]]
@@ -55,6 +62,272 @@ def get_agent(index=0) -> str:
     return get_agents()[index]  # Specify index only if you hardcode more than 1
 
 
+class RetryPolicy:
+
+    """Determines whether a failed request should be retried, and how long to wait before retrying it
+
+    Requests are retried when they fail due to a connection error or with one of the :attr:`~.statuses`,
+    which are typically returned when the server is temporarily overloaded or unavailable
+
+    * The delay before each retry grows exponentially, from ``backoff_base`` up to ``backoff_cap`` seconds
+    * If ``jitter=True``, a random delay between ``0`` and the exponential backoff is used instead,
+      so that clients which failed at the same time don't all retry at the same time
+    * If the response has a ``Retry-After`` header, it's used as the delay instead, up to ``max_retry_after`` seconds
+
+    .. admonition:: Example
+       :class: example
+
+       ::
+
+        # Retry up to 5 times, including POST and PUT requests
+        >> api = Client("domain.com", "username", "password", retry=RetryPolicy(max_attempts=6, retry_unsafe=True))
+
+    :cvar RETRY_STATUSES: the default status codes to retry requests for
+    :cvar IDEMPOTENT_METHODS: the request methods that are always safe to retry
+    """
+
+    RETRY_STATUSES = (429, 502, 503, 504)
+    IDEMPOTENT_METHODS = ('GET', 'DELETE')
+
+    def __init__(
+            self,
+            max_attempts: int = 3,
+            backoff_base: float = 0.5,
+            backoff_cap: float = 30.0,
+            jitter: bool = True,
+            retry_unsafe: bool = False,
+            statuses: Optional[Iterable[int]] = None,
+            respect_retry_after: bool = True,
+            max_retry_after: float = 60.0
+    ):
+        """Initialize a RetryPolicy
+
+        :param max_attempts: the maximum number of times to send a request, including the first attempt
+        :param backoff_base: the delay before the first retry, in seconds; doubles with each subsequent retry
+        :param backoff_cap: the maximum delay between retries, in seconds
+        :param jitter: whether to randomize the delay between retries
+        :param retry_unsafe: whether ``POST`` and ``PUT`` requests should also be retried
+        :param statuses: the response status codes to retry; uses the :attr:`~.RETRY_STATUSES` if not provided
+        :param respect_retry_after: whether to wait for the duration of the ``Retry-After`` header, if present
+        :param max_retry_after: the maximum delay to wait for a ``Retry-After`` header, in seconds
+        """
+        if max_attempts < 1:
+            raise ValueError('`max_attempts` must be a positive integer')
+
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.jitter = jitter
+        self.retry_unsafe = retry_unsafe
+        self.statuses = set(statuses if statuses is not None else self.RETRY_STATUSES)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+
+    def __repr__(self):
+        return f'<RetryPolicy: {self.max_attempts} attempts>'
+
+    def allows(self, method: str) -> bool:
+        """Whether requests with the given method can be retried
+
+        :param method: the request method
+        """
+        return method.upper() in self.IDEMPOTENT_METHODS or self.retry_unsafe
+
+    def should_retry(self, method: str, attempt: int, status_code: Optional[int] = None) -> bool:
+        """Whether a failed request should be retried
+
+        :param method: the request method
+        :param attempt: the number of times the request has been sent
+        :param status_code: the status code of the response, or ``None`` if the request raised a connection error
+        """
+        if attempt >= self.max_attempts or not self.allows(method):
+            return False
+        return status_code is None or status_code in self.statuses
+
+    def get_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Returns the number of seconds to wait before sending the next attempt of a request
+
+        :param attempt: the number of times the request has been sent
+        :param retry_after: the value of the ``Retry-After`` response header, if any
+        """
+        if retry_after and self.respect_retry_after:
+            if (delay := self.parse_retry_after(retry_after)) is not None:
+                return min(self.max_retry_after, delay)
+
+        delay = min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    @staticmethod
+    def parse_retry_after(retry_after: str) -> Optional[float]:
+        """Parses the number of seconds to wait from a ``Retry-After`` header
+
+        :param retry_after: the header value, as either a number of seconds or an HTTP date
+        """
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+
+    """Thread-safe limiter for the rate and concurrency of requests sent by a :class:`~.Client`
+
+    * The request rate is limited with a token bucket, which holds up to ``burst`` tokens
+      and refills at ``rate`` tokens per second; each request consumes a single token
+    * The number of requests in flight at once is limited to ``max_concurrency``
+
+    A request blocks until both a token and an in-flight slot are available
+
+    .. admonition:: Example
+       :class: example
+
+       ::
+
+        # At most 10 requests per second, in bursts of up to 20, with no more than 4 at a time
+        >> api = Client("domain.com", "username", "password", rate_limit=10, burst=20, max_concurrency=4)
+
+        # Or share the same limits between multiple clients
+        >> limiter = RateLimiter(rate=10, burst=20, max_concurrency=4)
+        >> api = Client("domain.com", "username", "password", rate_limiter=limiter)
+    """
+
+    #: The number of seconds between checks for a free in-flight slot in :meth:`~.acquire_async`
+    POLL_INTERVAL = 0.01
+
+    def __init__(self, rate: Optional[float] = None, burst: int = 1, max_concurrency: Optional[int] = None):
+        """Initialize a RateLimiter
+
+        :param rate: the maximum number of requests per second, or ``None`` for no rate limit
+        :param burst: the maximum number of requests that can be sent at once without waiting for the rate limit
+        :param max_concurrency: the maximum number of requests in flight at once, or ``None`` for no limit
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError('`rate` must be a positive number')
+        if burst < 1:
+            raise ValueError('`burst` must be a positive integer')
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError('`max_concurrency` must be a positive integer')
+
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self._setup()
+
+    def _setup(self) -> None:
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrency) if self.max_concurrency else None
+
+    def __getstate__(self) -> dict:
+        return {'rate': self.rate, 'burst': self.burst, 'max_concurrency': self.max_concurrency}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._setup()
+
+    def __repr__(self):
+        return f'<RateLimiter: {self.rate} requests/s, burst {self.burst}, max concurrency {self.max_concurrency}>'
+
+    def __enter__(self) -> RateLimiter:
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+    async def __aenter__(self) -> RateLimiter:
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until a request can be sent without exceeding the rate or concurrency limit
+
+        :param timeout: the maximum number of seconds to wait, or ``None`` to wait indefinitely
+        :returns: ``True`` if the request can be sent, or ``False`` if it can't be before the ``timeout``
+        """
+        until = None if timeout is None else time.monotonic() + timeout
+        if self._semaphore and not self._semaphore.acquire(timeout=None if timeout is None else max(0, timeout)):
+            return False
+        if self.rate:
+            try:
+                if not self._consume_token(until):
+                    self.release()
+                    return False
+            except BaseException:
+                self.release()
+                raise
+        return True
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> bool:
+        """Awaitable version of :meth:`acquire`, which waits without blocking the event loop
+
+        The same limits are shared with any threads that use the limiter
+
+        :param timeout: the maximum number of seconds to wait, or ``None`` to wait indefinitely
+        :returns: ``True`` if the request can be sent, or ``False`` if it can't be before the ``timeout``
+        """
+        import asyncio
+
+        until = None if timeout is None else time.monotonic() + timeout
+        if self._semaphore:
+            while not self._semaphore.acquire(blocking=False):
+                if until is not None and time.monotonic() >= until:
+                    return False
+                await asyncio.sleep(self.POLL_INTERVAL)
+        if self.rate:
+            try:
+                while (wait := self._take_token()) > 0:
+                    if until is not None and time.monotonic() + wait > until:
+                        self.release()
+                        return False
+                    await asyncio.sleep(wait)
+            except BaseException:
+                self.release()
+                raise
+        return True
+
+    def release(self) -> None:
+        """Releases the in-flight slot held by a request; must be called once per :meth:`acquire`"""
+        if self._semaphore:
+            self._semaphore.release()
+
+    def _consume_token(self, until: Optional[float] = None) -> bool:
+        """Blocks until a token is available in the bucket, then consumes it
+
+        :param until: the :func:`time.monotonic` timestamp to stop waiting at, if any
+        :returns: ``True`` if a token was consumed, or ``False`` if one won't be available before ``until``
+        """
+        while (wait := self._take_token()) > 0:
+            if until is not None and time.monotonic() + wait > until:
+                return False
+            time.sleep(wait)
+        return True
+
+    def _take_token(self) -> float:
+        """Consumes a token if one is available, otherwise returns the number of seconds until one will be"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+
 class LoggerUtils:
     """Utility class that simplifies access to logger handler info"""
 
@@ -83,7 +356,7 @@ class LoggerUtils:
         """Returns the FileHandler logging to the specified file, given it exists"""
         handlers = [
             handler for handler in LoggerUtils.get_file_handlers(logger)
-            if os.path.basename(handler.baseFilename) == log_file
+            if handler.baseFilename == os.path.abspath(log_file) or os.path.basename(handler.baseFilename) == log_file
         ]
         if handlers:
             if len(handlers) == 1:
@@ -213,7 +486,7 @@ class MagentoLogger:
         if self.handler_name not in handler_map['file'] or self.log_path not in log_files:
             if len(handler_map['file']) > 0:
                 self.clear_magento_file_handlers(logger)
-            f_handler = FileHandler(self.log_file)
+            f_handler = FileHandler(self.log_file, delay=True)  # Opened on first write
             f_handler.setFormatter(MagentoLogger.FORMATTER)
             f_handler.name = self.handler_name
             f_handler.setLevel("DEBUG")
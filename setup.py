@@ -31,5 +31,6 @@ setup(
     url='https://www.github.com/TDKorn/my-magento',
     download_url="https://github.com/TDKorn/my-magento/tarball/master",
     keywords=["magento", "magento-api", "python-magento", "python", "python3", "magento-python", "pymagento", "py-magento", "magento2", "magento-2", "magento2-api"],
-    install_requires=["requests"]
+    install_requires=["requests"],
+    extras_require={"async": ["httpx"]}
 )
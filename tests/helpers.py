@@ -0,0 +1,12 @@
+import json
+import requests
+
+
+def make_response(data=None, status_code=200, headers=None):
+    """Builds a :class:`requests.Response` with a JSON body, for patching out the network in tests"""
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = json.dumps(data if data is not None else {}).encode()
+    response._content_consumed = True
+    return response
@@ -0,0 +1,298 @@
+import time
+import asyncio
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from urllib.parse import unquote
+from magento import AsyncClient
+from magento.cache import TokenCache
+from magento.exceptions import MagentoError, DeadlineExceeded
+from magento.models import Order, OrderItem, Product
+from magento.utils import RateLimiter, DEFAULT_USER_AGENT
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+@unittest.skipIf(httpx is None, 'The AsyncClient requires httpx')
+class TestAsyncClient(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        self.requests = []
+        self.api = AsyncClient('website.com', 'username', 'password', user_agent='test')
+        await self.api.session.aclose()
+        self.api.session = httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+
+    async def asyncTearDown(self) -> None:
+        await self.api.close()
+
+    def handle(self, request):
+        url = unquote(str(request.url))
+        self.requests.append((request.method, url))
+
+        if url.endswith('integration/admin/token'):
+            return httpx.Response(200, json='new-token')
+        if request.headers['Authorization'] != 'Bearer new-token':
+            return httpx.Response(401, json={'message': 'The consumer isn\'t authorized to access %resources.'})
+        if url.endswith('store/websites'):
+            return httpx.Response(200, json=[])
+        if 'orders/items' in url:
+            items = [
+                {'item_id': 2, 'order_id': 1, 'sku': 'child', 'parent_item_id': 1},
+                {'item_id': 3, 'order_id': 1, 'sku': 'simple'},
+            ]
+            if '[value]=1' in url:  # Parent item lookup
+                items = [{'item_id': 1, 'order_id': 1, 'sku': 'parent', 'product_type': 'configurable'}]
+            return httpx.Response(200, json={'items': items, 'total_count': len(items)})
+        if 'orders' in url:
+            return httpx.Response(200, json={'items': [{'entity_id': 1, 'increment_id': '000000001'}], 'total_count': 1})
+        return httpx.Response(404, json={'message': 'Not found'})
+
+    async def test_authenticates_on_first_request(self):
+        order = await self.api.orders.by_number('000000001')
+
+        self.assertIsInstance(order, Order)
+        self.assertEqual(self.api.ACCESS_TOKEN, 'new-token')
+        self.assertEqual(self.api.client.ACCESS_TOKEN, 'new-token')
+        self.assertEqual(len([r for r in self.requests if r[1].endswith('integration/admin/token')]), 1)
+
+    async def test_reauthenticates_once_after_401(self):
+        self.api.ACCESS_TOKEN = 'expired-token'
+        response = await self.api.get(self.api.url_for('orders/1'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.api.ACCESS_TOKEN, 'new-token')
+
+    async def test_init_does_not_scrape_user_agent(self):
+        with mock.patch('magento.clients.get_agent', side_effect=AssertionError('Blocking request')) as get_agent:
+            api = AsyncClient('website.com', 'username', 'password')
+        await api.close()
+
+        get_agent.assert_not_called()
+        self.assertEqual(api.user_agent, DEFAULT_USER_AGENT)
+
+    async def test_parse_error_response(self):
+        response = await self.api.get(self.api.url_for('unknown'))
+        self.assertEqual(MagentoError.parse(response), 'Message: "Not found"')
+
+        with self.assertRaises(TypeError):  # Any other object named Response isn't parsed
+            MagentoError.parse(type('Response', (), {'json': lambda self: {}})())
+
+    async def test_order_items_resolve_parents(self):
+        items = await self.api.order_items.by_sku('child')
+
+        self.assertTrue(all(isinstance(item, OrderItem) for item in items))
+        self.assertEqual(sorted(item.sku for item in items), ['parent', 'simple'])
+
+    async def test_order_items_parents_not_kept(self):
+        query = self.api.order_items
+        await query.by_sku('child')
+        self.assertEqual(list(query.parents), [1])
+
+        await query.prepare([{'item_id': 3, 'order_id': 1, 'sku': 'simple'}])  # The next page has no child items
+        self.assertEqual(query.parents, {})
+
+    async def test_iter_items(self):
+        orders = [order async for order in self.api.orders.iter_items(page_size=10, workers=2)]
+        self.assertEqual([order.id for order in orders], [1])
+
+    async def test_by_list_chunked(self):
+        query = self.api.orders
+        query.MAX_URL_LENGTH = 400
+        orders = await query.by_list('entity_id', range(1, 200))
+
+        chunks = [r for r in self.requests if '[condition_type]=in' in r[1]]
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(url) <= 400 for method, url in chunks))
+        self.assertEqual(orders.id, 1)  # Merged and de-duplicated
+
+    async def test_iter_windows(self):
+        windows = [items async for items in self.api.orders.iter_windows('2024-01-01', '2024-02-01', max_items=1)]
+        self.assertEqual([[order.id for order in items] for items in windows], [[1]])
+
+
+@unittest.skipIf(httpx is None, 'The AsyncClient requires httpx')
+class TestAsyncNoBlockingRequests(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        self.requests = []
+        self.api = AsyncClient('website.com', 'username', 'password', user_agent='test', token='token')
+        await self.api.session.aclose()
+        self.api.session = httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+        # The synchronous client must never send a request from within the event loop
+        self.sync_request = mock.patch.object(self.api.client.session, 'request', side_effect=AssertionError).start()
+
+    async def asyncTearDown(self) -> None:
+        mock.patch.stopall()
+        await self.api.close()
+
+    def handle(self, request):
+        url = unquote(str(request.url))
+        self.requests.append(url)
+
+        if 'categories' in url:
+            return httpx.Response(200, json={
+                'id': 1, 'parent_id': 0, 'name': 'Root', 'is_active': True, 'children_data': [
+                    {'id': 2, 'parent_id': 1, 'name': 'Shoes', 'is_active': True, 'children_data': [
+                        {'id': 3, 'parent_id': 2, 'name': 'Boots', 'is_active': True, 'children_data': []}
+                    ]}
+                ]
+            })
+        if 'customers' in url:
+            return httpx.Response(200, json={'id': 7, 'firstname': 'First', 'lastname': 'Last', 'email': 'a@b.com'})
+        if 'orders/items' in url:
+            items = [{'item_id': 1, 'order_id': 1, 'product_id': 10, 'sku': 'boot'}]
+            return httpx.Response(200, json={'items': items, 'total_count': 1})
+        if 'orders' in url:
+            items = [{
+                'entity_id': 1, 'increment_id': '000000001', 'created_at': '2024-01-01', 'customer_id': 7, 'items': [
+                    {'item_id': 1, 'product_id': 10, 'sku': 'boot', 'product_type': 'simple',
+                     'qty_ordered': 1, 'qty_refunded': 0, 'qty_canceled': 0},
+                    {'item_id': 2, 'product_id': 11, 'sku': 'shoe', 'product_type': 'simple',
+                     'qty_ordered': 1, 'qty_refunded': 0, 'qty_canceled': 1},
+                ]
+            }]
+            return httpx.Response(200, json={'items': items, 'total_count': 1})
+        if 'products' in url:
+            items = [{'id': 10, 'sku': 'boot', 'name': 'Boot'}, {'id': 11, 'sku': 'shoe', 'name': 'Shoe'}]
+            return httpx.Response(200, json={'items': items, 'total_count': len(items)})
+        return httpx.Response(404, json={'message': 'Not found'})
+
+    async def test_products_by_category(self):
+        category = await self.api.categories.get_root()
+        products = await self.api.products.by_category(category, search_subcategories=True)
+
+        self.assertEqual([product.sku for product in products], ['boot', 'shoe'])
+        self.assertIn('[value]=1,2,3', self.requests[-1])
+        self.assertIn('category_tree', self.api.store.__dict__)
+        self.sync_request.assert_not_called()
+
+    async def test_order_items_by_category(self):
+        category = await self.api.categories.get_root()
+        item = await self.api.order_items.by_category(category, search_subcategories=True)
+
+        self.assertIsInstance(item, OrderItem)
+        self.assertEqual(category.all_product_ids, {10, 11})
+        self.sync_request.assert_not_called()
+
+    async def test_products_by_customer_id(self):
+        products = await self.api.products.by_customer_id(7)
+
+        self.assertTrue(all(isinstance(product, Product) for product in products))
+        self.assertIn('[field]=entity_id', self.requests[-1])
+        self.assertIn('[value]=10&', self.requests[-1])  # The cancelled item is excluded
+        self.sync_request.assert_not_called()
+
+    async def test_prefetch(self):
+        orders = await self.api.orders.prefetch('items.product', 'customer').execute()
+        order = orders if isinstance(orders, Order) else orders[0]
+
+        self.assertEqual([item.product.sku for item in order.items], ['boot', 'shoe'])
+        self.assertEqual(order.customer.id, 7)
+        self.sync_request.assert_not_called()
+
+    async def test_batch_loader(self):
+        order = await self.api.orders.by_id(1)
+        async with self.api.batch() as loader:
+            loader.queue(order, 'products')
+
+        self.assertEqual([product.id for product in order.products], [10, 11])
+        self.assertEqual(len([url for url in self.requests if '/products' in url]), 1)
+        self.sync_request.assert_not_called()
+
+    async def test_token_cache_io_in_thread(self):
+        threads = []
+
+        def load_token(*args):
+            threads.append(threading.current_thread())
+            return 'token'
+
+        self.api.client.token_cache = TokenCache(tempfile.gettempdir() + '/tokens.json')
+        self.api.ACCESS_TOKEN = None
+        with mock.patch.object(TokenCache, 'get', side_effect=load_token):
+            await self.api.get(self.api.url_for('orders/1'))
+
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+
+
+@unittest.skipIf(httpx is None, 'The AsyncClient requires httpx')
+class TestAsyncTransport(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        self.timeouts = []
+        self.in_flight = self.peak = 0
+        self.api = AsyncClient('website.com', 'username', 'password', user_agent='test', token='token',
+                               max_concurrency=2, timeout=(5, 30))
+        await self.api.session.aclose()
+        self.api.session = httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+
+    async def asyncTearDown(self) -> None:
+        await self.api.close()
+
+    async def handle(self, request):
+        self.timeouts.append(request.extensions['timeout'])
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.02)
+        self.in_flight -= 1
+        return httpx.Response(200, json={})
+
+    async def test_max_concurrency(self):
+        await asyncio.gather(*(self.api.get(self.api.url_for(f'orders/{i}')) for i in range(6)))
+        self.assertEqual(self.peak, 2)
+
+    async def test_timeout_reduced_to_fit_deadline(self):
+        await self.api.get(self.api.url_for('orders/1'))
+        with self.api.deadline(2):
+            await self.api.get(self.api.url_for('orders/1'))
+
+        self.assertEqual(self.timeouts[0], self.api.session.timeout.as_dict())  # The session's default timeout
+        self.assertLessEqual(self.timeouts[1]['read'], 2)
+        self.assertIsNone(self.api.time_remaining())
+
+    async def test_deadline_exceeded(self):
+        with self.assertRaises(DeadlineExceeded):
+            with self.api.deadline(0.03):
+                for _ in range(5):
+                    await self.api.get(self.api.url_for('orders/1'))
+        self.assertLess(len(self.timeouts), 5)
+
+    async def test_deadline_bounds_limiter_wait(self):
+        self.api.client.limiter = RateLimiter(max_concurrency=1)
+        done = asyncio.Event()
+
+        async def handle(request):
+            self.timeouts.append(request.extensions['timeout'])
+            await done.wait()  # Hold the only in-flight slot open
+            return httpx.Response(200, json={})
+
+        self.api.session = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+        task = asyncio.ensure_future(self.api.get(self.api.url_for('orders/1')))
+        await asyncio.sleep(0.01)
+
+        start = time.monotonic()
+        with self.assertRaises(DeadlineExceeded):
+            with self.api.deadline(0.1):
+                await self.api.get(self.api.url_for('orders/2'))
+
+        self.assertLess(time.monotonic() - start, 1)
+        done.set()
+        await task
+        self.assertEqual(len(self.timeouts), 1)
+
+    async def test_deadline_shared_with_tasks(self):
+        async def time_remaining():
+            return self.api.time_remaining()
+
+        with self.api.deadline(10):
+            task = asyncio.ensure_future(time_remaining())
+        self.assertLessEqual(await task, 10)
+        self.assertIsNone(await asyncio.ensure_future(time_remaining()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from unittest import mock
+from magento import Client
+from magento.models import Category, CategoryTree
+from helpers import make_response
+
+
+def node(category_id, name, *children):
+    return {'id': category_id, 'name': name, 'parent_id': 0, 'children_data': list(children)}
+
+
+ROOT = node(
+    1, 'Root Catalog',
+    node(2, 'Default Category',
+         node(3, 'Shoes', node(4, 'Boots'), node(5, 'Sneakers', node(6, 'Running'))),
+         node(7, 'Hats'))
+)
+
+
+class TestCategoryTree(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False)
+        self.tree = CategoryTree(ROOT)
+
+    def test_lookups(self):
+        self.assertEqual(len(self.tree), 7)
+        self.assertEqual(self.tree.children(3), [4, 5])
+        self.assertEqual(self.tree.descendant_ids(2), [3, 4, 5, 6, 7])
+        self.assertEqual(self.tree.ancestor_ids(6), [1, 2, 3, 5])
+        self.assertEqual(self.tree.path(6), ['Root Catalog', 'Default Category', 'Shoes', 'Sneakers', 'Running'])
+        self.assertEqual(self.tree.id_set(5), {5, 6})
+        self.assertEqual(self.tree.descendant_ids(99), [])
+
+    def test_store_category_tree(self):
+        with mock.patch.object(self.api, 'get', return_value=make_response(ROOT)) as request:
+            category = Category({'id': 3, 'name': 'Shoes', 'children': '4,5'}, self.api)
+            self.assertEqual(category.all_subcategory_ids, [4, 5, 6])
+            self.assertEqual([child.name for child in category.all_subcategories], ['Boots', 'Sneakers', 'Running'])
+            self.assertEqual(category.breadcrumbs, ['Root Catalog', 'Default Category', 'Shoes'])
+            self.assertEqual(self.api.store.category_tree.id_set(3), {3, 4, 5, 6})
+
+        request.assert_called_once()  # The tree is retrieved once, then cached
+
+        self.api.store.refresh()
+        self.assertNotIn('category_tree', self.api.store.__dict__)
+
+    def test_products_by_category(self):
+        responses = [make_response(ROOT), make_response({'items': [], 'total_count': 0})]
+        with mock.patch.object(self.api, 'get', side_effect=responses) as request:
+            category = Category({'id': 5, 'name': 'Sneakers'}, self.api)
+            self.api.products.by_category(category, search_subcategories=True)
+
+        self.assertIn('[value]=5,6&', request.call_args.args[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
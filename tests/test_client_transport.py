@@ -0,0 +1,390 @@
+import os
+import time
+import pickle
+import tempfile
+import threading
+import unittest
+from unittest import mock
+import requests
+from magento import Client
+from magento.models import Product, MediaEntry
+from magento.utils import RetryPolicy, RateLimiter
+from magento.exceptions import DeadlineExceeded
+from helpers import make_response
+
+
+class TestClientSession(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False, pool_size=4)
+
+    def tearDown(self) -> None:
+        self.api.close()
+
+    def test_pool_size(self):
+        adapter = self.api.session.get_adapter('https://website.com/rest/V1/orders')
+        self.assertEqual(adapter._pool_maxsize, 4)
+
+    def test_requests_use_session(self):
+        with mock.patch.object(self.api.session, 'request', return_value=make_response()) as request:
+            self.api.get(self.api.url_for('orders/1'))
+        request.assert_called_once()
+
+    def test_context_manager_closes_session(self):
+        with mock.patch.object(self.api.session, 'close') as close:
+            with self.api as api:
+                self.assertIs(api, self.api)
+        close.assert_called_once()
+
+
+@mock.patch('magento.clients.time.sleep')
+class TestClientRetry(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False,
+                          retry=RetryPolicy(max_attempts=3, jitter=False))
+        self.url = self.api.url_for('orders/1')
+
+    def test_retries_idempotent_request(self, sleep):
+        responses = [make_response(status_code=503, headers={'Retry-After': '7'}), make_response(status_code=429), make_response(status_code=200)]
+
+        with mock.patch.object(self.api.session, 'request', side_effect=responses) as request:
+            response = self.api.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(request.call_count, 3)
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [7.0, 1.0])
+
+    def test_retries_connection_errors(self, sleep):
+        responses = [requests.ConnectionError('Connection reset by peer'), make_response(status_code=200)]
+
+        with mock.patch.object(self.api.session, 'request', side_effect=responses) as request:
+            self.assertEqual(self.api.get(self.url).status_code, 200)
+        self.assertEqual(request.call_count, 2)
+
+    def test_stops_after_max_attempts(self, sleep):
+        with mock.patch.object(self.api.session, 'request', return_value=make_response(status_code=502)) as request:
+            self.assertEqual(self.api.delete(self.url).status_code, 502)
+        self.assertEqual(request.call_count, 3)
+
+    def test_unsafe_methods_require_opt_in(self, sleep):
+        with mock.patch.object(self.api.session, 'request', return_value=make_response(status_code=503)) as request:
+            self.api.post(self.url, {'entity': {}})
+        self.assertEqual(request.call_count, 1)
+
+        self.api.retry.retry_unsafe = True
+        with mock.patch.object(self.api.session, 'request', return_value=make_response(status_code=503)) as request:
+            self.api.put(self.url, {'entity': {}})
+        self.assertEqual(request.call_count, 3)
+
+    def test_retry_after_is_capped(self, sleep):
+        retry = RetryPolicy(max_retry_after=20)
+        self.assertEqual(retry.get_delay(1, '3600'), 20)
+        self.assertEqual(retry.get_delay(1, 'Fri, 01 Jan 2100 00:00:00 GMT'), 20)
+        self.assertEqual(retry.get_delay(1, '7'), 7)
+
+    def test_parse_retry_after_date(self, sleep):
+        self.assertEqual(RetryPolicy.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+        self.assertIsNone(RetryPolicy.parse_retry_after('soon'))
+
+
+class TestReauthentication(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.api = Client('website.com', 'username', 'password', user_agent='test', token='expired', login=False)
+        self.token_requests = 0
+
+    def request(self, method, url, json=None, headers=None, timeout=None):
+        if url.endswith('integration/admin/token'):
+            self.token_requests += 1
+            time.sleep(0.02)
+            return make_response(data='new-token')
+        if headers['Authorization'] != 'Bearer new-token':
+            return make_response({'message': 'Unauthorized'}, status_code=401)
+        return make_response(data={'items': []})
+
+    def test_single_flight(self):
+        with mock.patch.object(self.api.session, 'request', side_effect=self.request):
+            threads = [threading.Thread(target=self.api.get, args=(self.api.url_for(f'orders/{i}'),)) for i in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(self.token_requests, 1)
+        self.assertEqual(self.api.ACCESS_TOKEN, 'new-token')
+
+    def test_retry_is_bounded(self):
+        with mock.patch.object(self.api.session, 'request', return_value=make_response({'message': 'Unauthorized'}, status_code=401)) as request:
+            with mock.patch.object(self.api, 'authenticate', return_value=True) as authenticate:
+                response = self.api.get(self.api.url_for('orders/1'))
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(request.call_count, 2)
+        authenticate.assert_called_once()
+
+    def test_pickle(self):
+        api = pickle.loads(self.api.to_pickle())
+        self.assertEqual(api.ACCESS_TOKEN, 'expired')
+        with api._auth_lock:
+            pass
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_rate_limit(self):
+        limiter = RateLimiter(rate=50, burst=2)
+        start = time.monotonic()
+        for _ in range(6):
+            with limiter:
+                pass
+        # 2 burst tokens, then 4 more at 50 per second
+        self.assertGreaterEqual(time.monotonic() - start, 0.07)
+
+    def test_max_concurrency_shared_between_threads(self):
+        api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False, max_concurrency=2)
+        lock = threading.Lock()
+        in_flight, peak = 0, 0
+
+        def request(*args, **kwargs):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            return make_response()
+
+        with mock.patch.object(api.session, 'request', side_effect=request):
+            threads = [threading.Thread(target=api.get, args=(api.url_for(f'orders/{i}'),)) for i in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(peak, 2)
+
+    def test_pickle(self):
+        limiter = pickle.loads(pickle.dumps(RateLimiter(rate=5, burst=3, max_concurrency=2)))
+        self.assertEqual((limiter.rate, limiter.burst, limiter.max_concurrency), (5, 3, 2))
+        with limiter:
+            pass
+
+
+class TestDeadline(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False,
+                          timeout=(5, 30), retry=RetryPolicy(max_attempts=5, jitter=False, backoff_base=0.05))
+        self.url = self.api.url_for('orders/1')
+
+    def test_default_timeout(self):
+        with mock.patch.object(self.api.session, 'request', return_value=make_response()) as request:
+            self.api.get(self.url)
+        self.assertEqual(request.call_args.kwargs['timeout'], (5, 30))
+
+    def test_timeout_reduced_to_fit_deadline(self):
+        with mock.patch.object(self.api.session, 'request', return_value=make_response()) as request:
+            with self.api.deadline(2):
+                with self.api.deadline(60):  # Earliest deadline applies
+                    self.api.get(self.url)
+
+        connect, read = request.call_args.kwargs['timeout']
+        self.assertLessEqual(read, 2)
+        self.assertIsNone(self.api.time_remaining())
+
+    def test_deadline_spans_requests(self):
+        def request(*args, **kwargs):
+            time.sleep(0.03)
+            return make_response()
+
+        with mock.patch.object(self.api.session, 'request', side_effect=request) as session_request:
+            with self.assertRaises(DeadlineExceeded):
+                with self.api.deadline(0.1):
+                    for _ in range(10):
+                        self.api.get(self.url)
+
+        self.assertLess(session_request.call_count, 10)
+
+    def test_no_retry_past_deadline(self):
+        with mock.patch.object(self.api.session, 'request', return_value=make_response(status_code=503)) as request:
+            with self.api.deadline(0.08):
+                response = self.api.get(self.url)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertLess(request.call_count, 5)
+
+    def test_download_uses_deadline(self):
+        product = Product({'sku': 'sku', 'id': 1, 'name': 'Product', 'media_gallery_entries': []}, self.api)
+        entry = MediaEntry(product, {'id': 1, 'file': '/s/k/sku.jpg', 'label': 'Image', 'types': [], 'disabled': False})
+        response = make_response()
+        response._content = b'image'
+
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(MediaEntry, 'link', new_callable=mock.PropertyMock, return_value='https://website.com/sku.jpg'), \
+                mock.patch.object(self.api.session, 'request', return_value=response) as request:
+            with self.api.deadline(2):
+                path = entry.download(os.path.join(directory, 'sku.jpg'))
+
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), b'image')
+
+        connect, read = request.call_args.kwargs['timeout']
+        self.assertLessEqual(read, 2)
+
+    def test_deadline_bounds_limiter_wait(self):
+        api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False, max_concurrency=1)
+        sent, done = threading.Event(), threading.Event()
+
+        def request(*args, **kwargs):
+            sent.set()
+            done.wait(5)  # Hold the only in-flight slot open
+            return make_response()
+
+        with mock.patch.object(api.session, 'request', side_effect=request) as session_request:
+            thread = threading.Thread(target=api.get, args=(api.url_for('orders/1'),))
+            thread.start()
+            sent.wait(5)
+
+            start = time.monotonic()
+            with self.assertRaises(DeadlineExceeded):
+                with api.deadline(0.1):
+                    api.get(api.url_for('orders/2'))
+
+            self.assertLess(time.monotonic() - start, 1)
+            done.set()
+            thread.join()
+
+        self.assertEqual(session_request.call_count, 1)
+        self.assertTrue(api.limiter.acquire(timeout=0))  # The slot was released
+
+    def test_bind_deadline(self):
+        with self.api.deadline(10):
+            remaining = self.api.bind_deadline(self.api.time_remaining)
+
+        result = []
+        thread = threading.Thread(target=lambda: result.append(remaining()))
+        thread.start()
+        thread.join()
+        self.assertLessEqual(result[0], 10)
+
+
+class TestRequestCoalescing(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False)
+        self.url = self.api.url_for('products/sku')
+        self.release = threading.Event()
+
+    def request(self, *args, **kwargs):
+        self.release.wait(1)
+        return make_response(data={'sku': 'sku'})
+
+    def get_concurrently(self, urls):
+        results = []
+        threads = [threading.Thread(target=lambda url=url: results.append(self.api.get(url))) for url in urls]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)  # Let every thread send or join a request
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_identical_requests_share_response(self):
+        with mock.patch.object(self.api.session, 'request', side_effect=self.request) as request:
+            responses = self.get_concurrently([self.url] * 8)
+
+        request.assert_called_once()
+        self.assertEqual(len({id(response) for response in responses}), 1)
+        self.assertIs(responses[0].json(), responses[1].json())
+
+    def test_different_requests_not_shared(self):
+        with mock.patch.object(self.api.session, 'request', side_effect=self.request) as request:
+            self.get_concurrently([self.url, self.api.url_for('products/other')])
+        self.assertEqual(request.call_count, 2)
+
+    def test_completed_requests_not_reused(self):
+        with mock.patch.object(self.api.session, 'request', return_value=make_response(data={})) as request:
+            self.api.get(self.url)
+            self.api.get(self.url)
+        self.assertEqual(request.call_count, 2)
+
+    def test_errors_are_shared(self):
+        def request(*args, **kwargs):
+            self.release.wait(1)
+            raise requests.ConnectionError('Connection refused')
+
+        self.api.retry = RetryPolicy(max_attempts=1)
+        errors = []
+
+        def get():
+            try:
+                self.api.get(self.url)
+            except requests.ConnectionError as e:
+                errors.append(e)
+
+        with mock.patch.object(self.api.session, 'request', side_effect=request) as session_request:
+            threads = [threading.Thread(target=get) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            time.sleep(0.05)
+            self.release.set()
+            for thread in threads:
+                thread.join()
+
+        session_request.assert_called_once()
+        self.assertEqual(len(errors), 4)
+
+    def test_deadline_not_shared(self):
+        def request(*args, **kwargs):
+            time.sleep(0.3)
+            return make_response(data={'sku': 'sku'})
+
+        results = {}
+
+        def get(name, seconds):
+            with self.api.deadline(seconds):
+                results[name] = self.api.get(self.url).json()
+
+        with mock.patch.object(self.api.session, 'request', side_effect=request) as session_request:
+            bounded = threading.Thread(target=get, args=('bounded', 0.1))
+            unbounded = threading.Thread(target=get, args=('unbounded', None))
+            bounded.start()
+            time.sleep(0.02)  # The deadline-bound thread sends its request first
+            unbounded.start()
+            bounded.join()
+            unbounded.join()
+
+        self.assertEqual(session_request.call_count, 2)
+        self.assertEqual(results['unbounded'], {'sku': 'sku'})
+        bounded_timeout, unbounded_timeout = (call.kwargs['timeout'] for call in session_request.call_args_list)
+        self.assertLessEqual(max(bounded_timeout), 0.1)  # Only the deadline-bound request has a reduced timeout
+        self.assertEqual(unbounded_timeout, self.api.timeout)
+
+    def test_bounded_thread_waits_on_shared_request(self):
+        with mock.patch.object(self.api.session, 'request', side_effect=self.request) as request:
+            threads = [threading.Thread(target=self.api.get, args=(self.url,))]
+            threads[0].start()
+            time.sleep(0.02)
+
+            results = []
+
+            def get():
+                with self.api.deadline(5):
+                    results.append(self.api.get(self.url))
+
+            threads.append(threading.Thread(target=get))
+            threads[1].start()
+            time.sleep(0.02)
+            self.release.set()
+            for thread in threads:
+                thread.join()
+
+        request.assert_called_once()
+        self.assertEqual(results[0].json(), {'sku': 'sku'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import json
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+from urllib.parse import unquote
+from concurrent.futures import ThreadPoolExecutor
+from magento import Client
+from magento.cache import TokenCache
+from magento.export import ExportPipeline
+from magento.utils import RetryPolicy
+from helpers import make_response
+
+
+def get_number(order):
+    return order.number
+
+
+@mock.patch('magento.export.ProcessPoolExecutor', ThreadPoolExecutor)  # Workers can't share the mocked requests
+class TestExportPipeline(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False)
+        self.orders = [{'entity_id': i, 'increment_id': f'{i:09d}', 'status': 'complete'} for i in range(1, 26)]
+
+    def get(self, url):
+        params = dict(param.split('=', 1) for param in unquote(url).split('?', 1)[1].split('&'))
+        self.assertEqual(params['searchCriteria[filter_groups][0][filters][0][value]'], 'complete')
+        start = int(params['searchCriteria[filter_groups][1][filters][0][value]'])
+        end = int(params['searchCriteria[filter_groups][2][filters][0][value]'])
+
+        items = [order for order in self.orders if start <= order['entity_id'] < end]
+        page, page_size = int(params['searchCriteria[currentPage]']), int(params['searchCriteria[pageSize]'])
+        return make_response({'items': items[(page - 1) * page_size:page * page_size], 'total_count': len(items)})
+
+    def pipeline(self, **kwargs):
+        return ExportPipeline(self.api.orders.add_criteria('status', 'complete'), workers=2, page_size=4, **kwargs)
+
+    def test_shard_by_id(self):
+        shards = self.pipeline().shard_by_id(1, 26, size=10)
+        self.assertEqual(shards, [('entity_id', 1, 11), ('entity_id', 11, 21), ('entity_id', 21, 26)])
+
+    def test_run(self):
+        pipeline = self.pipeline(transform=get_number)
+
+        with mock.patch.object(Client, 'get', side_effect=self.get):
+            results = list(pipeline.run(pipeline.shard_by_id(1, 26, size=10)))
+
+        self.assertEqual([len(result) for result in results], [10, 10, 5])
+        self.assertEqual(results[0][0], '000000001')
+
+    def test_write(self):
+        pipeline = self.pipeline()
+
+        with tempfile.TemporaryDirectory() as directory, mock.patch.object(Client, 'get', side_effect=self.get):
+            paths = pipeline.write(pipeline.shard_by_id(1, 26, size=10), directory)
+            self.assertEqual([path.name for path in paths], ['orders-00000.jsonl', 'orders-00001.jsonl', 'orders-00002.jsonl'])
+
+            with open(paths[2]) as f:
+                self.assertEqual([json.loads(line)['entity_id'] for line in f], [21, 22, 23, 24, 25])
+
+    def test_client_config(self):
+        config = self.pipeline().client_config()
+        client = Client.from_dict(config)
+
+        self.assertEqual(client.BASE_URL, self.api.BASE_URL)
+        self.assertEqual(client.ACCESS_TOKEN, 'token')
+
+    def test_client_config_settings(self):
+        self.api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False,
+                          timeout=(3, 15), retry=RetryPolicy(max_attempts=5), rate_limit=10, burst=6,
+                          max_concurrency=4, token_cache=TokenCache(tempfile.gettempdir() + '/tokens.json'))
+        client = Client.from_dict(pickle.loads(pickle.dumps(self.pipeline().client_config())))
+
+        self.assertEqual(client.timeout, (3, 15))
+        self.assertEqual(client.retry.max_attempts, 5)
+        self.assertEqual(client.token_cache.path, self.api.token_cache.path)
+        # The limits are split between the 2 workers
+        self.assertEqual(client.limiter.rate, 5)
+        self.assertEqual(client.limiter.burst, 3)
+        self.assertEqual(client.limiter.max_concurrency, 2)
+
+    def test_client_config_more_workers_than_limits(self):
+        self.api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False,
+                          rate_limit=10, burst=3, max_concurrency=2)
+        with self.assertLogs(self.api.logger.logger, 'WARNING'):
+            pipeline = ExportPipeline(self.api.orders, workers=8)
+        config = pipeline.client_config()
+
+        self.assertEqual(pipeline.workers, 2)
+        self.assertLessEqual(config['max_concurrency'] * pipeline.workers, 2)
+        self.assertLessEqual(config['burst'] * pipeline.workers, 3)
+        self.assertLessEqual(config['rate_limit'] * pipeline.workers, 10)
+
+    def test_client_config_rate_limited(self):
+        self.api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False,
+                          rate_limit=20)
+        pipeline = ExportPipeline(self.api.orders, workers=8)
+        config = pipeline.client_config()
+
+        self.assertEqual(pipeline.workers, 8)
+        self.assertEqual(config['rate_limit'] * pipeline.workers, 20)
+        self.assertIsNone(config['max_concurrency'])
+
+    def test_client_config_unlimited(self):
+        client = Client.from_dict(self.pipeline().client_config())
+        self.assertIsNone(client.limiter.rate)
+        self.assertIsNone(client.limiter.max_concurrency)
+
+    def test_prefetch(self):
+        pipeline = self.pipeline(transform=get_number)
+        pipeline.query.prefetch('customer')
+
+        with mock.patch.object(Client, 'get', side_effect=self.get), \
+                mock.patch('magento.loaders.BatchLoader.load_path') as load_path:
+            list(pipeline.run(pipeline.shard_by_id(1, 26, size=10)))
+
+        self.assertEqual(load_path.call_count, 8)  # Once per page of 4 items
+        self.assertEqual({call.args[1] for call in load_path.call_args_list}, {'customer'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import socket
+import tempfile
+import unittest
+from unittest import mock
+from magento import Client
+from magento.utils import DEFAULT_USER_AGENT
+from helpers import make_response
+
+
+class TestFastStart(unittest.TestCase):
+
+    def test_no_network_on_init(self):
+        with mock.patch.object(socket.socket, 'connect', side_effect=AssertionError('Network access')) as connect:
+            api = Client('website.com', 'username', 'password', fast_start=True)
+
+        connect.assert_not_called()
+        self.assertEqual(api.user_agent, DEFAULT_USER_AGENT)
+        self.assertIsNone(api.ACCESS_TOKEN)
+        self.assertFalse(api.validate_token)
+
+    def test_authenticates_on_first_request(self):
+        api = Client('website.com', 'username', 'password', fast_start=True)
+        responses = [make_response(data='token'), make_response(data={'entity_id': 1})]
+
+        with mock.patch.object(api.session, 'request', side_effect=responses) as request:
+            api.get(api.url_for('orders/1'))
+
+        urls = [call.args[1] for call in request.call_args_list]
+        self.assertEqual(urls, [api.url_for('integration/admin/token'), api.url_for('orders/1')])
+
+    def test_log_file_created_on_first_write(self):
+        with tempfile.TemporaryDirectory() as directory:
+            log_file = os.path.join(directory, 'fast_start_test.log')
+            api = Client('website.com', 'fast_start', 'password', fast_start=True, log_file=log_file)
+            self.assertFalse(os.path.exists(log_file))
+
+            api.logger.info('Created')
+            self.assertTrue(os.path.exists(log_file))
+
+            api.logger.clear_magento_file_handlers(api.logger.logger)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import gc
+import pickle
+import unittest
+from unittest import mock
+from magento import Client
+from magento.cache import IdentityMap
+from helpers import make_response
+
+
+class TestIdentityMap(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False, identity_map=True)
+
+    def search(self, *items):
+        with mock.patch.object(self.api, 'get', return_value=make_response({'items': list(items), 'total_count': len(items)})):
+            return self.api.orders.add_criteria('status', 'complete').execute()
+
+    def test_same_item_is_same_instance(self):
+        first = self.search({'entity_id': 1, 'increment_id': '000000001', 'status': 'complete'})
+        second, other = self.search(
+            {'entity_id': 1, 'increment_id': '000000001', 'status': 'complete'},
+            {'entity_id': 2, 'increment_id': '000000002', 'status': 'complete'}
+        )
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(len(self.api.identity_map), 2)
+
+    def test_new_data_is_merged(self):
+        order = self.search({'entity_id': 1, 'increment_id': '000000001', 'created_at': '2024-01-01', 'status': 'pending', 'items': []})
+        self.assertEqual(order.items, [])
+
+        items = [{'item_id': 1, 'order_id': 1, 'sku': 'sku'}]
+        self.assertIs(self.search({'entity_id': 1, 'status': 'complete', 'items': items}), order)
+        self.assertEqual(order.status, 'complete')
+        self.assertEqual(order.number, '000000001')  # Kept from the previous data
+        self.assertEqual([item.sku for item in order.items], ['sku'])  # Cached properties are cleared
+
+    def test_scopes_are_separate(self):
+        default = self.search({'entity_id': 1, 'increment_id': '000000001', 'status': 'complete'})
+        self.api.scope = 'french'
+        french = self.search({'entity_id': 1, 'increment_id': '000000001', 'status': 'complète'})
+
+        self.assertIsNot(default, french)
+        self.assertEqual(default.status, 'complete')
+        self.assertIs(self.api.identity_map.get('orders', 1, 'french'), french)
+        self.assertIs(self.api.identity_map.get('orders', 1), default)
+
+    def test_merged_under_lock(self):
+        order = self.search({'entity_id': 1, 'increment_id': '000000001', 'created_at': '2024-01-01', 'status': 'pending'})
+        locked = []
+
+        def set_attrs(model, data, *args, **kwargs):
+            if model is order:  # Not the newly parsed instance
+                locked.append(self.api.identity_map._lock.locked())
+            return original(model, data, *args, **kwargs)
+
+        original = type(order).set_attrs
+        with mock.patch.object(type(order), 'set_attrs', set_attrs):
+            self.search({'entity_id': 1, 'increment_id': '000000001', 'created_at': '2024-01-01', 'status': 'complete'})
+
+        self.assertEqual(locked, [True])
+        self.assertEqual(order.status, 'complete')
+
+    def test_order_items_are_merged(self):
+        items = [{'item_id': 5, 'order_id': 1, 'sku': 'sku', 'product_type': 'simple'}]
+        with mock.patch.object(self.api, 'get', return_value=make_response({'items': items, 'total_count': 1})):
+            item = self.api.order_items.add_criteria('sku', 'sku').execute()
+
+        order = self.search({'entity_id': 1, 'increment_id': '000000001', 'status': 'complete', 'items': items})
+        self.assertIs(order.items[0], item)
+        self.assertIs(item.order, order)
+
+    def test_unused_instances_are_removed(self):
+        self.search({'entity_id': 1, 'increment_id': '000000001', 'status': 'complete'})
+        gc.collect()
+        self.assertEqual(len(self.api.identity_map), 0)
+
+    def test_disabled_by_default(self):
+        api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False)
+        self.assertIsNone(api.identity_map)
+
+    def test_pickle(self):
+        self.search({'entity_id': 1, 'increment_id': '000000001', 'status': 'complete'})
+        identity_map = pickle.loads(pickle.dumps(self.api.identity_map))
+        self.assertIsInstance(identity_map, IdentityMap)
+        self.assertEqual(len(identity_map), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
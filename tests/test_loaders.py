@@ -0,0 +1,90 @@
+import unittest
+from unittest import mock
+from urllib.parse import unquote
+from magento import Client
+from magento.models import Order, Invoice
+from helpers import make_response
+
+
+class TestBatchLoader(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False)
+        self.orders = [
+            Order({
+                'entity_id': i, 'increment_id': f'{i:09d}', 'customer_id': 10 + i if i % 2 else None,
+                'items': [
+                    {'item_id': 100 * i + j, 'order_id': i, 'product_id': j, 'sku': f'sku-{j}', 'product_type': 'simple'}
+                    for j in range(1, 4)
+                ]
+            }, self.api) for i in range(1, 6)
+        ]
+
+    def get(self, url):
+        url = unquote(url)
+        ids = url.split('[value]=')[1].split('&')[0].split(',')
+        if '/products/' in url:
+            items = [{'id': int(i), 'sku': f'sku-{i}'} for i in ids]
+        elif '/customers/' in url:
+            items = [{'id': int(i), 'firstname': 'First', 'lastname': 'Last'} for i in ids]
+        else:
+            items = [order.data for order in self.orders if str(order.id) in ids]
+        return make_response({'items': items, 'total_count': len(items)})
+
+    def test_order_products(self):
+        with mock.patch.object(self.api, 'get', side_effect=self.get) as request:
+            products = self.api.batch().load(self.orders, 'products')
+            self.assertEqual([product.sku for product in self.orders[4].products], ['sku-1', 'sku-2', 'sku-3'])
+
+        request.assert_called_once()  # 15 items, 3 distinct products
+        self.assertIs(products[0][0], products[1][0])
+        self.assertIs(self.orders[0].items[0].product, products[0][0])
+
+    def test_queued_lookups_share_requests(self):
+        invoices = [Invoice({'entity_id': i, 'order_id': i, 'items': []}, self.api) for i in range(1, 6)]
+        items = [item for order in self.orders for item in order.items]
+        for item in items:
+            item._order = None
+
+        with mock.patch.object(self.api, 'get', side_effect=self.get) as request:
+            with self.api.batch() as loader:
+                loader.queue(invoices, 'order').queue(items, 'order')
+
+        request.assert_called_once()
+        self.assertEqual([invoice.order.id for invoice in invoices], [1, 2, 3, 4, 5])
+        self.assertEqual(items[-1].order.id, 5)
+
+    def test_invoice_customers(self):
+        invoices = [Invoice({'entity_id': i, 'order_id': i, 'items': []}, self.api) for i in range(1, 6)]
+
+        with mock.patch.object(self.api, 'get', side_effect=self.get) as request:
+            customers = self.api.batch().load(invoices, 'customer')
+
+        self.assertEqual(request.call_count, 2)  # Orders, then customers
+        self.assertEqual([customer.id if customer else None for customer in customers], [11, None, 13, None, 15])
+
+    def test_prefetch(self):
+        def get(url):
+            if '/orders/' in url:
+                return make_response({'items': [order.data for order in self.orders], 'total_count': 5})
+            if '/invoices/' in url:
+                items = [{'entity_id': 50 + i, 'order_id': i, 'items': []} for i in range(1, 6)]
+                return make_response({'items': items, 'total_count': 5})
+            return self.get(url)
+
+        with mock.patch.object(self.api, 'get', side_effect=get) as request:
+            orders = self.api.orders.prefetch('items.product', 'customer', 'invoice').execute()
+            self.assertEqual(request.call_count, 4)  # Orders, products, customers and invoices
+
+            self.assertEqual(orders[0].items[2].product.sku, 'sku-3')
+            self.assertEqual([order.customer.id if order.customer else None for order in orders], [11, None, 13, None, 15])
+            self.assertEqual(orders[4].invoice.id, 55)
+        self.assertEqual(request.call_count, 4)
+
+    def test_unsupported_relation(self):
+        with self.assertRaises(ValueError):
+            self.api.batch().load(self.orders, 'payment')
+
+
+if __name__ == '__main__':
+    unittest.main()
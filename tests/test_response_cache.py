@@ -0,0 +1,93 @@
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+from magento import Client
+from magento.cache import ResponseCache
+from helpers import make_response
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.caches = [
+            ResponseCache(ttl=60, max_entries=2),
+            ResponseCache(ttl=60, max_entries=2, path=os.path.join(self.tmp.name, 'responses.db'))
+        ]
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def client(self, cache):
+        api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False, cache=cache)
+        api.session.request = mock.Mock(side_effect=lambda method, url, **kwargs: make_response(data={'url': url}))
+        return api
+
+    def test_get_is_cached(self):
+        for cache in self.caches:
+            with self.subTest(cache=cache):
+                api = self.client(cache)
+                url = api.url_for('products/sku') + '?fields=sku,price'
+
+                first = api.get(url)
+                second = api.get(url.replace('sku,price', 'sku%2Cprice'))  # Same normalized URL
+
+                self.assertEqual(second.json(), first.json())
+                self.assertTrue(second.from_cache)
+                self.assertEqual(api.session.request.call_count, 1)
+                self.assertEqual(cache.stats, {'hits': 1, 'misses': 1, 'invalidations': 0, 'hit_rate': 0.5})
+
+    def test_scope_in_key(self):
+        api = self.client(self.caches[0])
+        api.get(api.url_for('products/sku'))
+        api.get(api.url_for('products/sku', scope='default'))
+        self.assertEqual(api.session.request.call_count, 2)
+
+    def test_ttl_and_lru(self):
+        for cache in self.caches:
+            with self.subTest(cache=cache):
+                api = self.client(cache)
+                for sku in ('a', 'b', 'a', 'c'):  # Evicts 'b'
+                    api.get(api.url_for(f'products/{sku}'))
+
+                self.assertEqual(len(cache), 2)
+                self.assertIsNone(cache.get(api.url_for('products/b')))
+                self.assertIsNotNone(cache.get(api.url_for('products/a')))
+
+                with mock.patch('magento.cache.time.time', return_value=cache.ttl * 10 ** 9):
+                    self.assertIsNone(cache.get(api.url_for('products/a')))
+
+    def test_write_invalidates_related_resources(self):
+        for cache in self.caches:
+            with self.subTest(cache=cache):
+                api = self.client(cache)
+                urls = [
+                    api.url_for('products') + '?searchCriteria[pageSize]=1',
+                    api.url_for('products/sku', scope='default'),
+                    api.url_for('products/sku/media'),
+                    api.url_for('products/sku2'),
+                ]
+                for url in urls:
+                    api.get(url)
+
+                api.put(api.url_for('products/sku', scope='all'), {'product': {'price': 10}})
+
+                self.assertEqual([cache.get(url) is not None for url in urls], [False, False, False, True])
+
+    def test_errors_not_cached(self):
+        api = self.client(self.caches[0])
+        api.session.request.side_effect = None
+        api.session.request.return_value = make_response({'message': 'Not found'}, status_code=404)
+
+        api.get(api.url_for('products/missing'))
+        self.assertEqual(len(self.caches[0]), 0)
+
+    def test_pickle(self):
+        cache = pickle.loads(pickle.dumps(self.caches[0]))
+        self.assertEqual(cache.stats['hits'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,320 @@
+import time
+import unittest
+from unittest import mock
+from urllib.parse import unquote
+from magento import Client
+from magento.models import Order
+from helpers import make_response
+
+
+def make_orders(*ids):
+    return [{'entity_id': i, 'increment_id': f'00000000{i}'} for i in ids]
+
+
+class TestSearchQueryPagination(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False)
+
+    def test_iter_pages(self):
+        pages = {
+            1: {'items': make_orders(1, 2), 'total_count': 5},
+            2: {'items': make_orders(3, 4), 'total_count': 5},
+            3: {'items': make_orders(5), 'total_count': 5},
+        }
+
+        def get(url):
+            page = int(unquote(url).split('searchCriteria[currentPage]=')[1].split('&')[0])
+            self.assertIn('searchCriteria[pageSize]=2', unquote(url))
+            return make_response(pages[page])
+
+        with mock.patch.object(self.api, 'get', side_effect=get) as request:
+            results = list(self.api.orders.iter_pages(page_size=2))
+
+        self.assertEqual(request.call_count, 3)
+        self.assertEqual([[order.id for order in page] for page in results], [[1, 2], [3, 4], [5]])
+        self.assertTrue(all(isinstance(order, Order) for page in results for order in page))
+
+    def test_iter_pages_concurrently(self):
+        requested = []
+
+        def get(url):
+            page = int(unquote(url).split('searchCriteria[currentPage]=')[1].split('&')[0])
+            requested.append(page)
+            time.sleep(0.01 * (10 - page))  # Later pages finish first
+            return make_response({'items': make_orders(page), 'total_count': 9})
+
+        with mock.patch.object(self.api, 'get', side_effect=get):
+            results = list(self.api.orders.iter_pages(page_size=1, workers=4))
+
+        self.assertEqual(sorted(requested), list(range(1, 10)))
+        self.assertEqual([page[0].id for page in results], list(range(1, 10)))
+
+    def test_iter_items(self):
+        response = make_response({'items': make_orders(1, 2, 3), 'total_count': 3})
+
+        with mock.patch.object(self.api, 'get', return_value=response) as request:
+            ids = [order.id for order in self.api.orders.iter_items(page_size=10)]
+
+        request.assert_called_once()
+        self.assertEqual(ids, [1, 2, 3])
+
+    def test_iter_keyset(self):
+        orders = make_orders(*range(1, 8))
+
+        def get(url):
+            url = unquote(url)
+            self.assertIn('searchCriteria[sortOrders][0][field]=entity_id', url)
+            self.assertIn('searchCriteria[currentPage]=1', url)
+            after = int(url.split('[value]=')[-1].split('&')[0]) if '[condition_type]=gt' in url else 0
+            return make_response({'items': [o for o in orders if o['entity_id'] > after][:3]})
+
+        query = self.api.orders.add_criteria('status', 'complete')
+        pages, cursors = [], []
+
+        with mock.patch.object(self.api, 'get', side_effect=get) as request:
+            for page in query.iter_keyset(page_size=3):
+                pages.append([order.id for order in page])
+                cursors.append(query.cursor)
+
+        self.assertEqual(pages, [[1, 2, 3], [4, 5, 6], [7]])
+        self.assertEqual(cursors, [3, 6, 7])
+        self.assertEqual(request.call_count, 3)
+        self.assertEqual(query.criteria.sort_orders, [])  # Query isn't modified
+
+        with mock.patch.object(self.api, 'get', side_effect=get):
+            resumed = [order.id for page in query.iter_keyset(page_size=3, start_after=5) for order in page]
+        self.assertEqual(resumed, [6, 7])
+
+
+class TestSearchCriteria(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False)
+
+    def test_more_than_nine_groups(self):
+        query = self.api.orders
+        for i in range(12):
+            query.add_criteria('status', f'status_{i}')
+
+        self.assertEqual(query.last_group, 11)
+        self.assertIn('searchCriteria[filter_groups][11][filters][0][value]=status_11', query.query)
+
+    def test_filters_in_same_group(self):
+        query = self.api.orders.add_criteria('status', 'pending').add_criteria('status', 'processing', group=0, filter=1)
+
+        self.assertEqual(list(query.criteria.filter_groups), [0])
+        self.assertEqual(query.criteria.filter_groups[0][1]['value'], 'processing')
+
+    def test_page_url(self):
+        url = self.api.orders.restrict_fields('increment_id').page_url(2, 50)
+
+        self.assertIn('searchCriteria[pageSize]=50&searchCriteria[currentPage]=2', url)
+        self.assertTrue(url.endswith('fields=items[increment_id,entity_id],total_count'))
+
+    def test_endpoint_paths(self):
+        with mock.patch.object(self.api, 'get', return_value=make_response({})) as request:
+            self.api.customers.by_id(3)
+            self.api.categories.by_id(5)
+            self.api.categories.get_all()
+
+        self.assertEqual([call.args[0] for call in request.call_args_list], [
+            self.api.url_for('customers/3'),
+            self.api.url_for('categories') + '/?rootCategoryId=5',
+            self.api.url_for('categories/list') + '/?searchCriteria[currentPage]=1',
+        ])
+
+    def test_sort_by(self):
+        query = self.api.orders.sort_by('created_at', 'desc').sort_by('customer_email')
+
+        self.assertIn(
+            'searchCriteria[sortOrders][0][field]=created_at&searchCriteria[sortOrders][0][direction]=DESC'
+            '&searchCriteria[sortOrders][1][field]=customer_email&searchCriteria[sortOrders][1][direction]=ASC',
+            query.query
+        )
+        with self.assertRaises(ValueError):
+            query.sort_by('created_at', 'up')
+
+    def test_page_url_breaks_ties(self):
+        query = self.api.orders
+        self.assertNotIn('sortOrders', query.page_url(1, 10))
+
+        url = query.sort_by('created_at').page_url(1, 10)
+        self.assertIn('searchCriteria[sortOrders][1][field]=entity_id', url)
+        self.assertEqual(len(query.criteria.sort_orders), 1)
+
+        url = self.api.order_items.sort_by('item_id', 'DESC').page_url(1, 10)
+        self.assertNotIn('searchCriteria[sortOrders][1]', url)
+
+    def test_page_url_breaks_ties_by_endpoint_field(self):
+        url = self.api.product_attributes.sort_by('attribute_code').page_url(1, 10)
+        self.assertIn('searchCriteria[sortOrders][1][field]=attribute_id', url)
+        self.assertNotIn('entity_id', url)
+
+        query = self.api.search('cmsPage/search').sort_by('title')
+        self.assertNotIn('searchCriteria[sortOrders][1]', query.page_url(1, 10))
+        with self.assertRaises(ValueError):
+            next(query.iter_keyset())
+
+    def test_count(self):
+        query = self.api.orders.add_criteria('status', 'pending').restrict_fields('increment_id')
+
+        with mock.patch.object(self.api, 'get', return_value=make_response({'total_count': 42})) as request:
+            self.assertEqual(query.count(), 42)
+
+        url = unquote(request.call_args.args[0])
+        self.assertIn('[value]=pending', url)
+        self.assertIn('searchCriteria[pageSize]=1', url)
+        self.assertTrue(url.endswith('&fields=total_count'))
+        self.assertEqual(query.criteria.fields, 'increment_id,entity_id')
+
+    def test_reset(self):
+        query = self.api.customers
+        with mock.patch.object(self.api, 'get', return_value=make_response({})):
+            query.by_id(3)
+
+        query.reset()
+        self.assertEqual(query.query, self.api.url_for('customers/search') + '/?')
+        self.assertEqual(query.last_group, -1)
+
+
+class TestChunkedSearch(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False)
+
+    def get(self, url):
+        self.assertLessEqual(len(url), self.api.orders.MAX_URL_LENGTH)
+        ids = unquote(url).split('[value]=')[1].split('&')[0].split(',')
+        ids.append(ids[0])  # Duplicate across chunks
+        return make_response({'items': make_orders(*map(int, ids)), 'total_count': len(ids)})
+
+    def test_short_list_single_request(self):
+        response = make_response({'items': make_orders(*range(1, 11)), 'total_count': 10})
+        with mock.patch.object(self.api, 'get', return_value=response) as request:
+            orders = self.api.orders.by_list('entity_id', range(1, 11))
+
+        request.assert_called_once()
+        self.assertEqual(sorted(order.id for order in orders), list(range(1, 11)))
+
+    def test_long_list_chunked(self):
+        with mock.patch.object(self.api, 'get', side_effect=self.get) as request:
+            orders = self.api.orders.by_list('entity_id', range(1, 2001))
+
+        self.assertGreater(request.call_count, 1)
+        self.assertEqual(sorted(order.id for order in orders), list(range(1, 2001)))
+
+    def test_chunk_urls(self):
+        query = self.api.products.add_criteria('sku', 'x' * 400, 'in')
+        query.MAX_URL_LENGTH = len(query.query) - 400 + 100  # Fits 2 values per chunk
+        urls = query.chunk_urls(['x' * 40] * 10)
+
+        self.assertEqual(len(urls), 5)
+        self.assertTrue(all(len(url) <= query.MAX_URL_LENGTH for url in urls))
+        self.assertEqual(query.criteria.filter_groups[0][0]['value'], ','.join(['x' * 40] * 10))
+
+
+class TestPartitionedSearch(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False)
+        # 1 order per day in January, and 10 orders on January 20th
+        self.orders = [
+            {'entity_id': i, 'created_at': f'2024-01-{i:02d} 12:00:00'} for i in range(1, 32)
+        ] + [
+            {'entity_id': 100 + i, 'created_at': '2024-01-20 12:00:00'} for i in range(10)
+        ]
+
+    def get(self, url):
+        params = dict(param.split('=', 1) for param in unquote(url).split('?', 1)[1].split('&'))
+        start, end = params['searchCriteria[filter_groups][0][filters][0][value]'], params['searchCriteria[filter_groups][1][filters][0][value]']
+        items = [order for order in self.orders if start <= order['created_at'] < end]
+
+        if params.get('fields') == 'total_count':
+            return make_response({'total_count': len(items)})
+        page, page_size = int(params['searchCriteria[currentPage]']), int(params['searchCriteria[pageSize]'])
+        return make_response({'items': items[(page - 1) * page_size:page * page_size], 'total_count': len(items)})
+
+    def test_partition(self):
+        with mock.patch.object(self.api, 'get', side_effect=self.get):
+            windows = self.api.orders.partition('2024-01-01', '2024-02-01', max_items=8)
+
+        self.assertEqual(windows[0][0], '2024-01-01 00:00:00')
+        self.assertEqual(windows[-1][1], '2024-02-01 00:00:00')
+        for (_, end), (start, _) in zip(windows, windows[1:]):
+            self.assertLessEqual(end, start)  # Windows don't overlap
+
+        counts = [len([o for o in self.orders if start <= o['created_at'] < end]) for start, end in windows]
+        self.assertEqual(sum(counts), len(self.orders))
+        self.assertTrue(all(0 < count <= 11 for count in counts))  # 11 orders on January 20th can't be split
+
+    def test_iter_windows(self):
+        with mock.patch.object(self.api, 'get', side_effect=self.get):
+            windows = list(self.api.orders.iter_windows('2024-01-01', '2024-02-01', max_items=8, page_size=3, workers=3))
+
+        self.assertGreater(len(windows), 1)
+        self.assertEqual(sorted(order.id for window in windows for order in window), sorted(o['entity_id'] for o in self.orders))
+
+    def test_invalid_range(self):
+        with self.assertRaises(ValueError):
+            self.api.orders.partition('2024-02-01', '2024-01-01')
+
+
+class TestOrderItemSearch(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False)
+
+    def get(self, url):
+        url = unquote(url)
+        if '[field]=item_id' in url:  # Parent item lookup
+            ids = url.split('[value]=')[1].split('&')[0].split(',')
+            items = [{'item_id': int(i), 'order_id': int(i), 'sku': f'parent-{i}'} for i in ids]
+        else:
+            items = [
+                {'item_id': 11, 'order_id': 1, 'sku': 'child', 'parent_item_id': 1},
+                {'item_id': 12, 'order_id': 1, 'sku': 'child', 'parent_item_id': 1},
+                {'item_id': 21, 'order_id': 2, 'sku': 'child', 'parent_item_id': 2},
+                {'item_id': 1, 'order_id': 1, 'sku': 'child', 'parent_item': {'item_id': 1}},
+                {'item_id': 3, 'order_id': 3, 'sku': 'child'},
+            ]
+        return make_response({'items': items, 'total_count': len(items)})
+
+    def test_parents_retrieved_with_one_request(self):
+        with mock.patch.object(self.api, 'get', side_effect=self.get) as request:
+            items = self.api.order_items.by_sku('child')
+
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual([item.sku for item in items], ['parent-1', 'parent-1', 'parent-2', 'child'])
+        self.assertIn('[value]=1,2&', unquote(request.call_args_list[1].args[0]))
+
+    def test_iter_pages_resolves_parents(self):
+        with mock.patch.object(self.api, 'get', side_effect=self.get) as request:
+            pages = list(self.api.order_items.add_criteria('sku', 'child').iter_pages())
+
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual(len(pages[0]), 4)
+
+
+    def test_parents_not_kept_between_pages(self):
+        def get(url):
+            url = unquote(url)
+            if '[field]=item_id' in url:
+                ids = url.split('[value]=')[1].split('&')[0].split(',')
+                return make_response({'items': [{'item_id': int(i), 'order_id': int(i), 'sku': f'parent-{i}'} for i in ids]})
+            page = int(url.split('searchCriteria[currentPage]=')[1].split('&')[0])
+            items = [{'item_id': page * 10, 'order_id': page, 'sku': 'child', 'parent_item_id': page}]
+            return make_response({'items': items, 'total_count': 2})
+
+        query = self.api.order_items.add_criteria('sku', 'child')
+        with mock.patch.object(self.api, 'get', side_effect=get):
+            pages = query.iter_pages(page_size=1)
+            self.assertEqual([item.sku for item in next(pages)], ['parent-1'])
+            self.assertEqual([item.sku for item in next(pages)], ['parent-2'])
+
+        self.assertEqual(list(query.parents), [2])
+        query.reset()
+        self.assertEqual(query.parents, {})
+
+if __name__ == '__main__':
+    unittest.main()
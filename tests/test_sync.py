@@ -0,0 +1,88 @@
+import os
+import re
+import tempfile
+import unittest
+from unittest import mock
+from urllib.parse import unquote
+from magento import Client
+from magento.sync import IncrementalSync, CheckpointStore, SQLiteCheckpointStore
+from helpers import make_response
+
+
+class TestIncrementalSync(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.api = Client('website.com', 'username', 'password', user_agent='test', token='token', login=False)
+        self.products = [  # Sorted by updated_at, then id
+            {'id': 1, 'sku': 'a', 'updated_at': '2024-01-01 00:00:00'},
+            {'id': 4, 'sku': 'b', 'updated_at': '2024-01-01 00:00:00'},
+            {'id': 5, 'sku': 'c', 'updated_at': '2024-01-01 00:00:00'},
+            {'id': 2, 'sku': 'd', 'updated_at': '2024-01-02 00:00:00'},
+            {'id': 3, 'sku': 'e', 'updated_at': '2024-01-03 00:00:00'},
+        ]
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def get(self, url):
+        """Applies the keyset filters of the sync to the products"""
+        params = dict(param.split('=', 1) for param in unquote(url).split('?', 1)[1].split('&'))
+        filters = {}
+        for key, value in params.items():
+            if key.startswith('searchCriteria[filter_groups]'):
+                group, index, name = re.match(r'.+\[(\d+)]\[filters]\[(\d+)]\[(\w+)]', key).groups()
+                filters.setdefault((group, index), {})[name] = value
+
+        def matches(product, f):
+            value = product['id' if f['field'] == 'entity_id' else f['field']]
+            other = type(value)(f['value'])
+            return {'gt': value > other, 'gteq': value >= other}[f['condition_type']]
+
+        items = [
+            product for product in self.products
+            if all(
+                any(matches(product, f) for (g, i), f in filters.items() if g == group)
+                for group in {g for g, i in filters}
+            )
+        ]
+        return make_response({'items': items[:int(params['searchCriteria[pageSize]'])]})
+
+    def sync(self, store):
+        return IncrementalSync(self.api, 'products', store, page_size=2)
+
+    def test_sync(self):
+        for store in (CheckpointStore(os.path.join(self.tmp.name, 'checkpoints.json')),
+                      SQLiteCheckpointStore(os.path.join(self.tmp.name, 'checkpoints.db'))):
+            with self.subTest(store=store), mock.patch.object(self.api, 'get', side_effect=self.get):
+                sync = self.sync(store)
+                self.assertEqual([product.sku for product in sync.run()], ['a', 'b', 'c', 'd', 'e'])
+                self.assertEqual(sync.checkpoint, {'updated_at': '2024-01-03 00:00:00', 'id': 3})
+
+                self.products.append({'id': 6, 'sku': 'f', 'updated_at': '2024-01-04 00:00:00'})
+                self.assertEqual([product.sku for product in self.sync(store).run()], ['f'])
+                self.products.pop()
+
+    def test_resumes_after_interruption(self):
+        store = CheckpointStore(os.path.join(self.tmp.name, 'checkpoints.json'))
+
+        with mock.patch.object(self.api, 'get', side_effect=self.get):
+            run = self.sync(store).run()
+            synced = [next(run).sku for _ in range(3)]  # Interrupted during the second page
+            run.close()
+
+            self.assertEqual(store.load('products'), {'updated_at': '2024-01-01 00:00:00', 'id': 4})
+            synced += [product.sku for product in self.sync(store).run()]
+
+        self.assertEqual(synced, ['a', 'b', 'c', 'c', 'd', 'e'])  # Items on the interrupted page are synced again
+
+    def test_page_url(self):
+        url = unquote(self.sync(None).page_url({'updated_at': '2024-01-01', 'id': 4}))
+
+        self.assertIn('searchCriteria[filter_groups][0][filters][0][condition_type]=gteq', url)
+        self.assertIn('searchCriteria[filter_groups][1][filters][1][field]=entity_id', url)
+        self.assertIn('searchCriteria[sortOrders][1][field]=entity_id', url)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import time
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from magento import Client
+from magento.cache import TokenCache
+from helpers import make_response
+
+
+class TestTokenCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = TokenCache(Path(self.tmp.name, 'tokens.json'))
+        self.token_requests = 0
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def request(self, method, url, json=None, headers=None, timeout=None):
+        if url.endswith('integration/admin/token'):
+            self.token_requests += 1
+            return make_response(data=f'token-{self.token_requests}')
+        if headers['Authorization'] == 'Bearer stale':
+            return make_response({'message': 'Unauthorized'}, status_code=401)
+        return make_response(data=[])
+
+    def client(self, **kwargs):
+        api = Client('website.com', 'username', 'password', user_agent='test', login=False,
+                     token_cache=self.cache, validate_token=False, **kwargs)
+        api.session.request = mock.Mock(side_effect=self.request)
+        return api
+
+    def test_expiry(self):
+        self.cache.set('website.com', 'username', 'token')
+        self.assertEqual(self.cache.get('https://website.com/', 'username'), 'token')
+        self.assertIsNone(self.cache.get('website.com', 'other'))
+
+        with mock.patch('magento.cache.time.time', return_value=time.time() + self.cache.lifetime):
+            self.assertIsNone(self.cache.get('website.com', 'username'))
+
+    def test_delete_only_matching_token(self):
+        self.cache.set('website.com', 'username', 'new')
+        self.cache.delete('website.com', 'username', 'old')
+        self.assertEqual(self.cache.get('website.com', 'username'), 'new')
+
+        self.cache.delete('website.com', 'username', 'new')
+        self.assertIsNone(self.cache.get('website.com', 'username'))
+
+    def test_clients_share_token(self):
+        self.client().get('https://website.com/rest/V1/store/websites')
+        api = self.client()
+
+        self.assertEqual(api.ACCESS_TOKEN, 'token-1')
+        self.assertEqual(self.token_requests, 1)
+
+    def test_login_skipped_with_cached_token(self):
+        self.cache.set('website.com', 'username', 'cached')
+        with mock.patch.object(Client, 'authenticate') as authenticate:
+            api = Client('website.com', 'username', 'password', user_agent='test', token_cache=self.cache)
+
+        authenticate.assert_not_called()
+        self.assertEqual(api.ACCESS_TOKEN, 'cached')
+
+    def test_expired_cached_token_replaced(self):
+        self.cache.set('website.com', 'username', 'stale')
+        api = self.client()
+        response = api.get(api.url_for('store/websites'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.cache.get('website.com', 'username'), 'token-1')
+
+
+if __name__ == '__main__':
+    unittest.main()